@@ -0,0 +1,138 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from accounts.models import User
+
+logger = logging.getLogger(__name__)
+
+# Columns kept in the cache - enough for role/permission checks and the
+# current-user payload. Any other field is loaded lazily if a view touches it.
+# Kept in model field order, as Model.from_db expects.
+CACHED_USER_FIELDS = tuple(
+    field.attname
+    for field in User._meta.concrete_fields
+    if field.attname in {"id", "username", "role", "is_active", "is_staff", "is_superuser"}
+)
+
+
+class UserCache:
+    """
+    Two-level TTL cache of CACHED_USER_FIELDS values keyed by user id.
+
+    Level 1 is a small per-process LRU (USER_CACHE_LOCAL_SIZE entries, for
+    USER_CACHE_LOCAL_TTL seconds); level 2 is the shared Django cache (Redis)
+    for USER_CACHE_TTL seconds. accounts.signals invalidates both when a
+    User is saved or deleted; other processes' level-1 copies live at most
+    USER_CACHE_LOCAL_TTL seconds, so keep that short.
+    """
+
+    def __init__(self):
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(user_id):
+        return f"auth-user:{user_id}"
+
+    def get(self, user_id):
+        # Tokens carry the id as a string, signals as an int
+        user_id = str(user_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(user_id)
+            if entry is not None:
+                expires, values = entry
+                if expires > now:
+                    self._local.move_to_end(user_id)
+                    return values
+                del self._local[user_id]
+
+        try:
+            values = cache.get(self.key(user_id))
+        except Exception as exc:
+            logger.warning("User cache unavailable: %s", exc)
+            return None
+        if values is not None:
+            self._remember(user_id, values)
+        return values
+
+    def set(self, user_id, values):
+        user_id = str(user_id)
+        try:
+            cache.set(self.key(user_id), values, settings.USER_CACHE_TTL)
+        except Exception as exc:
+            logger.warning("User cache unavailable: %s", exc)
+        self._remember(user_id, values)
+
+    def invalidate(self, user_id):
+        user_id = str(user_id)
+        with self._lock:
+            self._local.pop(user_id, None)
+        try:
+            cache.delete(self.key(user_id))
+        except Exception as exc:
+            logger.warning("User cache unavailable, could not invalidate %s: %s", user_id, exc)
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+
+    def _remember(self, user_id, values):
+        with self._lock:
+            self._local[user_id] = (time.monotonic() + settings.USER_CACHE_LOCAL_TTL, values)
+            self._local.move_to_end(user_id)
+            while len(self._local) > settings.USER_CACHE_LOCAL_SIZE:
+                self._local.popitem(last=False)
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that hydrates request.user from user_cache instead of
+    querying the User table on every request.
+
+    The user is rebuilt with User.from_db from the cached columns, so it is
+    a normal (partially deferred) model instance: role checks cost no query,
+    and touching an uncached field loads it on demand.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN or api_settings.USER_ID_FIELD != "id":
+            # These need columns we do not cache
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        values = user_cache.get(user_id)
+        if values is None:
+            values = (
+                User.objects
+                .filter(id=user_id)
+                .values_list(*CACHED_USER_FIELDS)
+                .first()
+            )
+            if values is None:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            user_cache.set(user_id, values)
+
+        user = User.from_db(router.db_for_read(User), CACHED_USER_FIELDS, values)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+from django.utils.timezone import now
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from accounts.tokens import blacklist_jti
+from config.redis_client import get_redis
+
+
+class Command(BaseCommand):
+    help = (
+        "One-off: copy still-valid blacklisted refresh tokens from the token_blacklist "
+        "tables into the Redis blacklist, optionally deleting the table rows afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Rows read and written to Redis per round trip.",
+        )
+        parser.add_argument(
+            "--purge",
+            action="store_true",
+            help="Delete all OutstandingToken/BlacklistedToken rows once copied.",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        current = now()
+
+        # Expired tokens are rejected on exp alone; only live ones need a Redis entry
+        rows = (
+            BlacklistedToken.objects
+            .filter(token__expires_at__gt=current)
+            .values_list("token__jti", "token__expires_at")
+            .iterator(chunk_size=chunk_size)
+        )
+
+        copied = 0
+        pipe = get_redis().pipeline(transaction=False)
+        for jti, expires_at in rows:
+            if blacklist_jti(jti, expires_at.timestamp(), client=pipe):
+                copied += 1
+            if len(pipe) >= chunk_size:
+                pipe.execute()
+        pipe.execute()
+        self.stdout.write(self.style.SUCCESS(f"Copied {copied} blacklisted tokens to Redis."))
+
+        if options["purge"]:
+            blacklisted, _ = BlacklistedToken.objects.all().delete()
+            outstanding, _ = OutstandingToken.objects.all().delete()
+            self.stdout.write(self.style.SUCCESS(
+                f"Deleted {blacklisted} blacklisted and {outstanding} outstanding token rows."
+            ))
@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from django.utils.html import strip_tags
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from config.projections import Projection
 from .models import User
+from .tokens import RefreshToken
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -21,3 +24,12 @@ class UserSerializer(serializers.ModelSerializer):
         user.set_password(password)
         user.save()
         return user
+
+
+# UserSerializer's output (password is write-only) as values() rows
+USER_LIST_PROJECTION = Projection("id", "username", "role")
+
+
+class RefreshTokenSerializer(TokenRefreshSerializer):
+    """Token refresh using the Redis-blacklisted RefreshToken."""
+    token_class = RefreshToken
@@ -1,3 +1,133 @@
+from unittest import mock, skipUnless
+
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from redis.exceptions import ConnectionError as RedisConnectionError
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.authentication import user_cache
+from accounts.models import User
+from accounts.tokens import blacklist_key
+
+try:
+    import fakeredis
+except ImportError:  # optional: only the Redis blacklist tests need it
+    fakeredis = None
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    """request.user comes from user_cache; saving a User drops its entry."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="root", password="pass", role="SUPER_ADMIN")
+
+    def setUp(self):
+        cache.clear()
+        user_cache.clear_local()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+
+    def user_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        table = User._meta.db_table
+        return response, [q["sql"] for q in queries if f'FROM "{table}"' in q["sql"]]
+
+    def test_user_is_loaded_once(self):
+        url = reverse("current_user")
+        response, first = self.user_queries(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["username"], "root")
+        self.assertEqual(len(first), 1)
+
+        response, second = self.user_queries(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(second, [])
+
+    def test_shared_cache_is_used_after_local_entry_expires(self):
+        self.client.get(reverse("current_user"))
+        user_cache.clear_local()
+
+        response, queries = self.user_queries(reverse("current_user"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, [])
+
+    def test_role_change_takes_effect_immediately(self):
+        url = reverse("user_list")
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        self.user.role = "ADMIN"
+        self.user.save()
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get(reverse("current_user"))
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(reverse("current_user")).status_code, 401)
+
+
+class RefreshTokenBlacklistTests(TestCase):
+    """Logout blacklists the refresh token in Redis, or in the database while Redis is down."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="owner", password="pass", role="ADMIN")
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def login(self):
+        response = self.client.post(reverse("login"), {"username": "owner", "password": "pass"}, format="json")
+        return response.json()["data"]["tokens"]["refresh_token"]
+
+    def refresh(self, token):
+        return self.client.post(reverse("jwt_refresh"), {"refresh": token}, format="json")
+
+    @skipUnless(fakeredis, "fakeredis is not installed")
+    def test_logout_blacklists_until_expiry(self):
+        redis = fakeredis.FakeRedis()
+        with mock.patch("accounts.tokens.get_redis", return_value=redis):
+            token = self.login()
+            self.assertFalse(OutstandingToken.objects.exists())
+            self.assertEqual(self.refresh(token).status_code, 200)
+
+            self.assertEqual(self.client.post(reverse("logout"), {"refresh": token}, format="json").status_code, 200)
+            self.assertEqual(self.refresh(token).status_code, 401)
+
+        key, = redis.keys()
+        self.assertTrue(key.decode().startswith(blacklist_key("")))
+        self.assertGreater(redis.ttl(key), 6 * 24 * 3600)
+        self.assertFalse(BlacklistedToken.objects.exists())
+
+    def test_database_fallback_without_redis(self):
+        redis = mock.Mock()
+        redis.exists.side_effect = RedisConnectionError("down")
+        redis.set.side_effect = RedisConnectionError("down")
+        with mock.patch("accounts.tokens.get_redis", return_value=redis):
+            token = self.login()
+            self.assertEqual(self.refresh(token).status_code, 200)
+
+            self.assertEqual(self.client.post(reverse("logout"), {"refresh": token}, format="json").status_code, 200)
+            self.assertEqual(BlacklistedToken.objects.count(), 1)
+            self.assertEqual(self.refresh(token).status_code, 401)
+
+    @skipUnless(fakeredis, "fakeredis is not installed")
+    def test_token_revoked_during_outage_stays_revoked(self):
+        down = mock.Mock()
+        down.exists.side_effect = RedisConnectionError("down")
+        down.set.side_effect = RedisConnectionError("down")
+        with mock.patch("accounts.tokens.get_redis", return_value=down):
+            token = self.login()
+            self.client.post(reverse("logout"), {"refresh": token}, format="json")
 
-# Create your tests here.
+        with mock.patch("accounts.tokens.get_redis", return_value=fakeredis.FakeRedis()):
+            self.assertEqual(self.refresh(token).status_code, 401)
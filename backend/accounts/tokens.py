@@ -0,0 +1,90 @@
+import logging
+import time
+
+from django.utils.timezone import now
+from django.utils.translation import gettext_lazy as _
+from redis.exceptions import RedisError
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken, Token
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from config.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+BLACKLIST_KEY_PREFIX = "jwt-blacklist"
+
+
+def blacklist_key(jti):
+    return f"{BLACKLIST_KEY_PREFIX}:{jti}"
+
+
+def blacklist_jti(jti, exp, client=None):
+    """
+    Blacklist a token id until the token's own expiry (`exp`, epoch seconds).
+    Returns False if the token has already expired, as there is nothing to block.
+    """
+    ttl = int(exp - time.time()) + 1
+    if ttl <= 0:
+        return False
+    (client or get_redis()).set(blacklist_key(jti), 1, ex=ttl)
+    return True
+
+
+def is_jti_blacklisted(jti):
+    """
+    Checks Redis, then the token_blacklist tables: blacklist_in_db() writes
+    there while Redis is unreachable, and those tokens must stay revoked
+    once it is back (`migrate_token_blacklist --purge` moves them to Redis).
+    """
+    try:
+        if get_redis().exists(blacklist_key(jti)):
+            return True
+    except RedisError as exc:
+        logger.warning("Token blacklist unavailable in Redis, checking the database: %s", exc)
+    return BlacklistedToken.objects.filter(token__jti=jti, token__expires_at__gt=now()).exists()
+
+
+def blacklist_in_db(token):
+    """Blacklist a token in simplejwt's tables, for when Redis is unreachable."""
+    outstanding, _ = OutstandingToken.objects.get_or_create(
+        jti=token.payload[api_settings.JTI_CLAIM],
+        defaults={"token": str(token), "expires_at": datetime_from_epoch(token.payload["exp"])},
+    )
+    BlacklistedToken.objects.get_or_create(token=outstanding)
+    return True
+
+
+class RedisBlacklistMixin:
+    """
+    Keeps the blacklist in Redis instead of the token_blacklist tables:
+    one key per blacklisted jti, expiring with the token, so nothing
+    accumulates. The tables only hold tokens revoked during a Redis outage,
+    so the check's second lookup is an indexed probe of a near-empty table.
+    Tokens are no longer recorded as outstanding.
+    """
+
+    def check_blacklist(self):
+        if is_jti_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        try:
+            return blacklist_jti(self.payload[api_settings.JTI_CLAIM], self.payload["exp"])
+        except RedisError as exc:
+            logger.warning("Token blacklist unavailable in Redis, writing to the database: %s", exc)
+            return blacklist_in_db(self)
+
+    def outstand(self):
+        return None
+
+    @classmethod
+    def for_user(cls, user):
+        # Skip simplejwt's BlacklistMixin.for_user, which inserts an OutstandingToken row
+        return Token.for_user.__func__(cls, user)
+
+
+class RefreshToken(RedisBlacklistMixin, BaseRefreshToken):
+    pass
@@ -2,12 +2,13 @@ from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework import generics, status
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
 from django.contrib.auth import authenticate
 from .permissions import SuperAdminOnly
-from .serializers import UserSerializer
+from config.pagination import InvalidCursor, KeysetPagination
+from .serializers import USER_LIST_PROJECTION, UserSerializer
 from .models import User
+from .tokens import RefreshToken
 
 
 class LoginView(APIView):
@@ -112,16 +113,18 @@ class UserListView(generics.ListAPIView):
     queryset = User.objects.all().order_by("-id")
     serializer_class = UserSerializer
     permission_classes = [SuperAdminOnly]
+    pagination_class = KeysetPagination
+    ordering = ("-id",)
 
     def list(self, request, *args, **kwargs):
         try:
-            queryset = self.get_queryset()
-            serializer = self.get_serializer(queryset, many=True)
+            page = self.paginate_queryset(USER_LIST_PROJECTION.project(self.get_queryset()))
+            return self.get_paginated_response(USER_LIST_PROJECTION.serialize(page))
+        except InvalidCursor as e:
             return Response({
-                "success": True,
-                "count": queryset.count(),
-                "data": serializer.data
-            }, status=status.HTTP_200_OK)
+                "success": False,
+                "error": "Invalid cursor"
+            }, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             return Response({
                 "success": False,
@@ -0,0 +1,110 @@
+import logging
+import re
+import threading
+import time
+from pathlib import Path
+
+from django.template import engines
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / "templates" / "reminders"
+TEMPLATE_NAME_RE = re.compile(r"^(?P<channel>[a-z]+)_(?P<day>\d+)\.(txt|html)$")
+
+# Used when a (channel, reminder_day) variant has no template file or fails to render.
+# Same text as the old inline f-strings; autoescape off to keep them byte-for-byte.
+FALLBACK_SOURCES = {
+    "whatsapp": (
+        "{% autoescape off %}"
+        "🚗 *Service Reminder - {{ garage.garage_name }}*\n\n"
+        "Hello {{ customer.name }},\n"
+        "Your *{{ vehicle.vehicle_model }}* ({{ vehicle.vehicle_number }}) is due for service.\n\n"
+        "📅 {{ urgency_text }}\n\n"
+        "📍 Address: {{ garage_address|default:\"Contact us for location\" }}\n"
+        "📞 Call: {{ garage_phone }}\n"
+        "💬 WhatsApp: {{ garage_whatsapp }}\n"
+        "{% endautoescape %}"
+    ),
+    "email": (
+        "{% autoescape off %}"
+        "Dear {{ customer.name }},\n\n"
+        "Your vehicle {{ vehicle.vehicle_model }} ({{ vehicle.vehicle_number }}) is due for service on "
+        "{{ service.next_service_date|date:\"d M Y\" }}.\n\n"
+        "{{ urgency_text }}\n\n"
+        "Regards,\n{{ garage.garage_name }}"
+        "{% endautoescape %}"
+    ),
+}
+
+
+class ReminderTemplateCache:
+    """
+    Compiled reminder templates, keyed by (channel, reminder_day).
+
+    Every file in celery_app/templates/reminders/ is loaded and compiled once
+    per worker process (see worker_process_init in config.celery_app); after
+    that a render is a dict lookup plus Template.render. Render time is
+    accumulated in `stats()`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._templates = None
+        self._fallbacks = {}
+        self.render_count = 0
+        self.render_seconds = 0.0
+
+    def load(self):
+        engine = engines["django"]
+        templates = {}
+        for path in sorted(TEMPLATE_DIR.iterdir()):
+            match = TEMPLATE_NAME_RE.match(path.name)
+            if not match:
+                continue
+            key = (match["channel"], int(match["day"]))
+            templates[key] = engine.get_template(f"reminders/{path.name}")
+        fallbacks = {
+            channel: engine.from_string(source)
+            for channel, source in FALLBACK_SOURCES.items()
+        }
+        with self._lock:
+            self._templates = templates
+            self._fallbacks = fallbacks
+        logger.info("Loaded %s reminder templates: %s", len(templates), sorted(templates))
+
+    def reload(self):
+        """Reload hook: re-read the template files on a running worker."""
+        for loader in engines["django"].engine.template_loaders:
+            # drop Django's cached-loader entries so edited files are recompiled
+            if hasattr(loader, "reset"):
+                loader.reset()
+        self.load()
+
+    def get(self, channel, reminder_day):
+        if self._templates is None:
+            self.load()
+        return self._templates.get((channel, reminder_day)) or self._fallbacks[channel]
+
+    def render(self, channel, reminder_day, context):
+        started = time.perf_counter()
+        try:
+            text = self.get(channel, reminder_day).render(context)
+        except Exception:
+            logger.exception("Reminder template %s/%s failed; using fallback", channel, reminder_day)
+            text = self._fallbacks[channel].render(context)
+        elapsed = time.perf_counter() - started
+        self.render_count += 1
+        self.render_seconds += elapsed
+        logger.debug("Rendered %s/%s reminder in %.3f ms", channel, reminder_day, elapsed * 1000)
+        return text
+
+    def stats(self):
+        return {
+            "templates": sorted(self._templates or {}),
+            "renders": self.render_count,
+            "total_ms": round(self.render_seconds * 1000, 3),
+            "avg_ms": round(self.render_seconds * 1000 / self.render_count, 3) if self.render_count else 0.0,
+        }
+
+
+reminder_templates = ReminderTemplateCache()
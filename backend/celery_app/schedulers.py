@@ -1,35 +1,175 @@
 from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from datetime import timedelta
 from django.utils.timezone import now
 from services.models import ServiceReminder
-from celery_app.service_reminder import send_service_reminder
+from services.reminder_events import reminders_transitioned
+from celery_app.service_reminder import (
+    lease_expiry,
+    new_claim_token,
+    send_service_reminder,
+    send_service_reminder_batch,
+)
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Columns the rollup needs for claimed / reaped rows (see reminder_events.transition)
+TRANSITION_FIELDS = ("garage_id", "scheduled_for", "channel", "reminder_day")
+
+
+def expire_stale_reminders(today):
+    """
+    Mark PENDING reminders EXPIRED instead of sending them late: those
+    scheduled more than SERVICE_REMINDER_MAX_LATENESS_DAYS before `today`,
+    and any whose service date has already passed. Returns how many.
+    """
+    earliest = today - timedelta(days=settings.SERVICE_REMINDER_MAX_LATENESS_DAYS)
+    with transaction.atomic():
+        rows = list(
+            ServiceReminder.objects
+            .select_for_update(skip_locked=True, of=("self",))
+            .filter(
+                Q(scheduled_for__lt=earliest) | Q(service_record__next_service_date__lt=today),
+                status="PENDING",
+            )
+            .values_list("id", *TRANSITION_FIELDS)
+        )
+        if not rows:
+            return 0
+        expired = ServiceReminder.objects.filter(id__in=[row[0] for row in rows]).update(
+            status="EXPIRED", not_before=None, claim_token=None, updated_at=now(),
+        )
+        reminders_transitioned(row[1:] + ("PENDING", "EXPIRED") for row in rows)
+
+    logger.info("Expired %s reminders that are too late to send", expired)
+    return expired
+
+
+def claim_due_reminders(today, batch_size):
+    """
+    Claim up to `batch_size` PENDING reminders due today or earlier (within
+    SERVICE_REMINDER_MAX_LATENESS_DAYS, and not past their service date).
+
+    Reminders released to a delayed retry or rate-limit task (not_before in
+    the future) are left to that task, so a sweep never re-claims what it
+    just released and always ends.
+
+    Rows are locked with FOR UPDATE SKIP LOCKED and moved to PROCESSING
+    (with a lease, see reap_expired_reminder_leases) in the same transaction,
+    so concurrent dispatchers each get a disjoint batch instead of blocking
+    on (or double-sending) each other's rows.
+    Returns (claim token, claimed ids); the tasks sending them carry the token.
+    """
+    earliest = today - timedelta(days=settings.SERVICE_REMINDER_MAX_LATENESS_DAYS)
+    with transaction.atomic():
+        claimed = list(
+            ServiceReminder.objects
+            .select_for_update(skip_locked=True, of=("self",))
+            .filter(
+                Q(not_before__isnull=True) | Q(not_before__lte=now()),
+                status="PENDING",
+                scheduled_for__lte=today,
+                scheduled_for__gte=earliest,
+                service_record__next_service_date__gte=today,
+            )
+            .order_by("scheduled_for", "id")
+            .values_list("id", *TRANSITION_FIELDS)[:batch_size]
+        )
+        reminder_ids = [row[0] for row in claimed]
+        claim = new_claim_token()
+        if reminder_ids:
+            ServiceReminder.objects.filter(id__in=reminder_ids).update(
+                status="PROCESSING",
+                lease_expires_at=lease_expiry(),
+                claim_token=claim,
+                updated_at=now(),
+            )
+            reminders_transitioned(row[1:] + ("PENDING", "PROCESSING") for row in claimed)
+    return claim, reminder_ids
+
+
 @shared_task
-def trigger_due_service_reminders():
+def trigger_due_service_reminders(batch_size=None):
     """
     Runs once per day.
-    Finds all PENDING reminders due today or earlier
-    and triggers send_service_reminder for each.
+    Sweeps all PENDING reminders due today or earlier (so days missed by
+    beat are caught up) and triggers sending them. Reminders too late to be
+    useful are expired first (see expire_stale_reminders).
+
+    Reminders are claimed in bounded SKIP LOCKED batches until none are
+    left; several dispatchers can run at once and drain the backlog in
+    parallel. In batch mode (SERVICE_REMINDER_BATCH_DISPATCH, default) each
+    claimed batch becomes one send_service_reminder_batch task; otherwise
+    one send_service_reminder task is enqueued per reminder.
     """
     today = now().date()
+    batch_size = batch_size or settings.SERVICE_REMINDER_BATCH_SIZE
     logger.info("Scheduler triggered: today=%s", today)
     print(f"[Scheduler] trigger_due_service_reminders running for {today}")
 
-    reminder_ids = list(
+    expire_stale_reminders(today)
+
+    dispatched = 0
+    while True:
+        claim, reminder_ids = claim_due_reminders(today, batch_size)
+        if not reminder_ids:
+            break
+
+        if settings.SERVICE_REMINDER_BATCH_DISPATCH:
+            logger.info("Triggering reminder batch of %s (first id %s)", len(reminder_ids), reminder_ids[0])
+            send_service_reminder_batch.delay(reminder_ids, claim=claim)
+        else:
+            for reminder_id in reminder_ids:
+                logger.info("Triggering reminder %s", reminder_id)
+                send_service_reminder.delay(reminder_id, claim=claim)
+        dispatched += len(reminder_ids)
+
+    if not dispatched:
+        logger.info("No reminders due today")
+        return
+
+    logger.info("Dispatched %s reminders", dispatched)
+
+
+@shared_task
+def reap_expired_reminder_leases():
+    """
+    Runs every few minutes.
+    Re-queues PROCESSING reminders whose lease has expired - the worker that
+    claimed them died (OOM kill, max-tasks-per-child recycle, ...) before
+    writing an outcome, or their task sat in the queue past the lease.
+    Reaping drops the claim token, so a task still queued for the old claim
+    does nothing when it finally runs. Claims made before leases existed
+    have no expiry and are reaped once untouched for a full lease period.
+    """
+    current = now()
+    stale_before = current - timedelta(seconds=settings.SERVICE_REMINDER_LEASE_SECONDS)
+
+    expired = (
         ServiceReminder.objects
+        .filter(status="PROCESSING")
         .filter(
-            status="PENDING",
-            scheduled_for=today,
+            Q(lease_expires_at__lt=current)
+            | Q(lease_expires_at__isnull=True, updated_at__lt=stale_before)
         )
-        .values_list("id", flat=True)
     )
+    with transaction.atomic():
+        rows = list(
+            expired
+            .select_for_update(skip_locked=True)
+            .values_list("id", *TRANSITION_FIELDS)
+        )
+        if not rows:
+            return 0
+        reaped = ServiceReminder.objects.filter(id__in=[row[0] for row in rows]).update(
+            status="PENDING", lease_expires_at=None, claim_token=None, updated_at=current,
+        )
+        reminders_transitioned(row[1:] + ("PROCESSING", "PENDING") for row in rows)
 
-    if not reminder_ids:
-        logger.info("No reminders due today")
-        return
-
-    for reminder_id in reminder_ids:
-        logger.info("Triggering reminder %s", reminder_id)
-        send_service_reminder.delay(reminder_id)
+    logger.warning("Re-queued %s reminders with expired leases", reaped)
+    # Send the re-queued reminders now rather than at the next daily run
+    trigger_due_service_reminders.delay()
+    return reaped
@@ -1,162 +1,195 @@
+import math
+import uuid
 from datetime import timedelta
 from celery import shared_task
+from celery.utils.time import get_exponential_backoff_interval
+from django.conf import settings
 from django.db import transaction
 from django.utils.timezone import now
-from requests import HTTPError, RequestException
+from requests import HTTPError, RequestException, Timeout
+from requests import ConnectionError as RequestsConnectionError
 
+from config.reference_cache import reference_cache
 from services.models import ServiceReminder
+from services.rate_limiter import rate_limiter
+from services.reminder_events import reminders_transitioned, transition
+from celery_app.reminder_templates import reminder_templates
+# Reminder generation lives with the models; re-exported for existing imports
+from services.service_reminder import REMINDER_DAYS, create_service_reminders  # noqa: F401
 
-REMINDER_DAYS = [7, 3, 1]
+# Fields written back after a delivery attempt (single and batch paths)
+OUTCOME_FIELDS = [
+    "status",
+    "lease_expires_at",
+    "not_before",
+    "sent_at",
+    "sent_via",
+    "provider_message_id",
+    "failure_reason",
+    "updated_at",
+]
 
-@shared_task(
-    bind=True,
-    autoretry_for=(ConnectionError, TimeoutError,),
-    retry_backoff=60,
-    retry_kwargs={"max_retries": 3},
-)
-def send_service_reminder(self, reminder_id):
+
+def lease_expiry():
+    """Expiry for a new PROCESSING claim; the reaper re-queues claims past it."""
+    return now() + timedelta(seconds=settings.SERVICE_REMINDER_LEASE_SECONDS)
+
+
+def new_claim_token():
     """
-    Send WhatsApp + Email reminder for a ServiceReminder
+    Token for a new claim on reminders. Tasks carry it and only take rows
+    still holding it, so once a claim is reaped (or re-claimed) a task still
+    sitting in the queue for it does nothing.
     """
+    return uuid.uuid4().hex
 
-    # Lazy imports (correct)
-    from services.whatsapp_service import send_whatsapp_reminder
-    from services.email_service import send_email_reminder
 
-    print(f"[Celery] Starting reminder task: {reminder_id}")
+def retry_after(seconds):
+    """
+    not_before for a reminder released to a delayed task: the dispatcher
+    leaves it to that task instead of re-claiming it straight away.
+    """
+    return now() + timedelta(seconds=math.ceil(seconds))
 
-    reminder = None
 
-    # 🔒 Lock row to prevent duplicate sending
-    with transaction.atomic():
-        reminder = (
-            ServiceReminder.objects
-            .select_for_update()
-            .get(id=reminder_id)
-        )
+def _service_date_passed(reminder):
+    """A reminder for a service that is already due is never sent (see _deliver_reminder)."""
+    return reminder.service_record.next_service_date < now().date()
 
-        if reminder.status in ["SENT", "PROCESSING"]:
-            print(f"[Celery] Skipped reminder {reminder_id} (status={reminder.status})")
-            return
 
-        reminder.status = "PROCESSING"
-        reminder.save(update_fields=["status"])
+def _build_context(reminder):
+    """Template context for a reminder (shared by WhatsApp and email)."""
+    service = reminder.service_record
+    # Process-local copy; falls back to the relation if the garage is gone from the cache
+    garage = reference_cache.garage(service.garage_id) or service.garage
+    garage_phone = garage.mobile or ""
+
+    days_left = reminder.reminder_day
+    urgency_text = (
+        f"Only {days_left} days left! Your service is due on "
+        f"{service.next_service_date.strftime('%d %b %Y')}."
+        if days_left <= 3
+        else f"Service due on {service.next_service_date.strftime('%d %b %Y')}."
+    )
+
+    return {
+        "garage": garage,
+        "customer": reminder.customer,
+        "vehicle": reminder.vehicle,
+        "service": service,
+        "days_left": days_left,
+        "urgency_text": urgency_text,
+        "garage_phone": garage_phone,
+        "garage_whatsapp": garage.whatsapp_number or garage_phone,
+        "garage_address": garage.address or "",
+    }
+
+
+def _render_whatsapp_message(context):
+    # precompiled WhatsApp text template per reminder day (1,3,7), fallback built in
+    return reminder_templates.render("whatsapp", context["days_left"], context).strip()
+
+
+def _render_email_message(context):
+    return reminder_templates.render("email", context["days_left"], context)
+
+
+def _deliver_reminder(reminder, whatsapp_results=None, email_results=None):
+    """
+    Send WhatsApp + Email for an already-claimed reminder.
+
+    The outcome (status, sent_via, failure_reason, ...) is recorded on the
+    instance but NOT saved - callers persist it, either per row or in bulk.
+    Transient errors (ConnectionError / TimeoutError) are raised so the
+    caller can release the claim and retry.
+
+    `whatsapp_results` / `email_results` map reminder id -> send result when
+    the batch task already sent that channel for the whole chunk.
+    """
+
+    # Lazy imports (correct)
+    from services.whatsapp_service import send_whatsapp_reminder
+    from services.email_service import send_email_reminder
+
+    reminder_id = reminder.id
 
     try:
-        service = reminder.service_record
-        customer = reminder.customer
-        vehicle = reminder.vehicle
-
-        garage = service.garage
-        garage_phone = garage.mobile or ""
-        garage_whatsapp = garage.whatsapp_number or garage_phone
-        garage_address = garage.address or ""
-
-        days_left = reminder.reminder_day
-        urgency_text = (
-            f"Only {days_left} days left! Your service is due on "
-            f"{service.next_service_date.strftime('%d %b %Y')}."
-            if days_left <= 3
-            else f"Service due on {service.next_service_date.strftime('%d %b %Y')}."
-        )
+        if _service_date_passed(reminder):
+            reminder.status = "EXPIRED"
+            reminder.failure_reason = "Service date has passed"
+            print(f"[Celery] Reminder {reminder_id} EXPIRED: service date has passed")
+            return
+
+        context = _build_context(reminder)
+        customer = context["customer"]
+        garage = context["garage"]
 
         # Track which channels succeeded
         sent_channels = []
 
         # WhatsApp
         if reminder.channel in ["WHATSAPP", "BOTH"]:
-            # render a WhatsApp text template per reminder day (1,3,7)
-            from django.template.loader import render_to_string
-            template_name = f"reminders/whatsapp_{days_left}.txt"
-            context = {
-                "garage": garage,
-                "customer": customer,
-                "vehicle": vehicle,
-                "service": service,
-                "days_left": days_left,
-                "urgency_text": urgency_text,
-                "garage_phone": garage_phone,
-                "garage_whatsapp": garage_whatsapp,
-                "garage_address": garage_address,
-            }
             try:
-                message = render_to_string(template_name, context).strip()
-            except Exception:
-                # fallback to inline text if template missing or errors
-                message = (
-                    f"🚗 *Service Reminder - {garage.garage_name}*\n\n"
-                    f"Hello {customer.name},\n"
-                    f"Your *{vehicle.vehicle_model}* ({vehicle.vehicle_number}) "
-                    f"is due for service.\n\n"
-                    f"📅 {urgency_text}\n\n"
-                    f"📍 Address: {garage_address or 'Contact us for location'}\n"
-                    f"📞 Call: {garage_phone}\n"
-                    f"💬 WhatsApp: {garage_whatsapp}\n"
-                )
-
-            try:
-                resp = send_whatsapp_reminder(
-                    phone_number=customer.mobile,
-                    message=message,
-                )
+                if whatsapp_results is None:
+                    resp = send_whatsapp_reminder(
+                        phone_number=customer.mobile,
+                        message=_render_whatsapp_message(context),
+                    )
+                else:
+                    result = whatsapp_results.get(reminder_id)
+                    if result is None:
+                        raise RuntimeError("WhatsApp message was not sent")
+                    if result.error is not None:
+                        raise result.error
+                    resp = result.response
                 reminder.provider_message_id = resp.get("message", {}).get("id")
                 sent_channels.append("WHATSAPP")
             except HTTPError as he:
                 status_code = getattr(he.response, "status_code", None)
                 reminder.failure_reason = f"WhatsApp HTTP {status_code}: {he}"
-                reminder.save(update_fields=["failure_reason"])
                 # 402: payment/trial limit -> mark FAILED and do NOT retry
                 if status_code == 402:
                     reminder.status = "FAILED"
-                    reminder.save(update_fields=["status", "failure_reason"])
                     print(f"[Celery] WhatsApp 402 for reminder {reminder_id}; marked FAILED")
                     return
-                # 5xx: server error -> treat as transient and raise ConnectionError to trigger retry
-                if status_code and 500 <= status_code < 600:
+                # 5xx / 429: server error or provider throttling -> treat as transient and raise ConnectionError to trigger retry
+                if status_code and (500 <= status_code < 600 or status_code == 429):
                     print(f"[Celery] WhatsApp server error {status_code} for reminder {reminder_id}; will retry")
                     raise ConnectionError(str(he))
                 # other 4xx: treat as permanent failure
                 reminder.status = "FAILED"
-                reminder.save(update_fields=["status", "failure_reason"])
                 return
             except RequestException as rexc:
-                # If this is a transient network error, re-raise to allow retry
-                if isinstance(rexc, (ConnectionError, TimeoutError)):
+                # If this is a transient network error (incl. per-request timeout), re-raise to allow retry
+                if isinstance(rexc, (RequestsConnectionError, Timeout)):
                     print(f"[Celery] Network error for reminder {reminder_id}: {rexc}; will retry")
-                    raise
+                    raise ConnectionError(str(rexc))
                 # Otherwise mark FAILED
                 reminder.failure_reason = str(rexc)
                 reminder.status = "FAILED"
-                reminder.save(update_fields=["status", "failure_reason"])
                 return
 
         # Email
         if reminder.channel in ["EMAIL", "BOTH"]:
             email = getattr(customer, "email", None)
             if email:
-                from django.template.loader import render_to_string
-                template_name = f"reminders/email_{days_left}.html"
-                try:
-                    html_message = render_to_string(template_name, context)
-                except Exception:
-                    html_message = (
-                        f"Dear {customer.name},\n\n"
-                        f"Your vehicle {vehicle.vehicle_model} ({vehicle.vehicle_number}) is due for service on "
-                        f"{service.next_service_date.strftime('%d %b %Y')}.\n\n"
-                        f"{urgency_text}\n\n"
-                        f"Regards,\n{garage.garage_name}"
-                    )
                 try:
-                    send_email_reminder(
-                        to_email=customer.email,
-                        subject=f"Service Reminder - {garage.garage_name}",
-                        message=html_message,
-                    )
+                    if email_results is None:
+                        send_email_reminder(
+                            to_email=customer.email,
+                            subject=f"Service Reminder - {garage.garage_name}",
+                            message=_render_email_message(context),
+                        )
+                    else:
+                        result = email_results.get(reminder_id)
+                        if result is None:
+                            raise RuntimeError("email was not sent")
+                        if result.error is not None:
+                            raise result.error
                     sent_channels.append("EMAIL")
                 except Exception as exc:
                     reminder.failure_reason = f"Email send failed: {exc}"
                     reminder.status = "FAILED"
-                    reminder.save(update_fields=["status", "failure_reason"])
                     print(f"[Celery] Email send failed for reminder {reminder_id}: {exc}")
                     return
             else:
@@ -165,7 +198,6 @@ def send_service_reminder(self, reminder_id):
         reminder.status = "SENT"
         reminder.sent_at = now()
         reminder.sent_via = ",".join(sent_channels) if sent_channels else None
-        reminder.save()
 
         print(f"[Celery] Reminder {reminder_id} SENT via {reminder.sent_via}")
 
@@ -176,34 +208,252 @@ def send_service_reminder(self, reminder_id):
             raise
         reminder.status = "FAILED"
         reminder.failure_reason = str(exc)
-        reminder.save(update_fields=["status", "failure_reason"])
         print(f"[Celery] Reminder {reminder_id} FAILED: {exc}")
-        return
-
-def create_service_reminders(service_record, channel="BOTH"):
-    if not service_record.next_service_date:
-        return
-
-    today = now().date()
-    for day in REMINDER_DAYS:
-        scheduled_for = service_record.next_service_date - timedelta(days=day)
-        # clamp past dates to today if you want overdue reminders to be handled now
-        if scheduled_for < today:
-            scheduled_for = today
-
-        reminder, created = ServiceReminder.objects.get_or_create(
-            service_record=service_record,
-            reminder_day=day,
-            defaults={
-                "vehicle_id": service_record.vehicle_id,
-                "customer_id": service_record.customer_id,
-                "scheduled_for": scheduled_for,
-                "channel": channel,
-                "status": "PENDING",
-            },
+
+
+RETRY_BACKOFF = 60
+RETRY_BACKOFF_MAX = 600
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(ConnectionError, TimeoutError,),
+    retry_backoff=RETRY_BACKOFF,
+    retry_backoff_max=RETRY_BACKOFF_MAX,
+    retry_kwargs={"max_retries": 3},
+)
+def send_service_reminder(self, reminder_id, claim=None):
+    """
+    Send WhatsApp + Email reminder for a ServiceReminder
+
+    `claim` is the token of the claim this task was queued for (see
+    trigger_due_service_reminders); the reminder is only taken while it
+    still holds that claim, either PROCESSING or released to this task for
+    a retry. The lease is renewed when the task starts.
+    """
+
+    print(f"[Celery] Starting reminder task: {reminder_id}")
+
+    reminder = None
+
+    # 🔒 Lock row to prevent duplicate sending
+    with transaction.atomic():
+        reminder = (
+            ServiceReminder.objects
+            .select_for_update()
+            .get(id=reminder_id)
         )
 
-        # Optional: if created and scheduled_for == today, enqueue immediately
-        # from celery_app.service_reminder import send_service_reminder
-        # if created and scheduled_for == today:
-        #     send_service_reminder.delay(reminder.id)
+        if claim:
+            skip = reminder.claim_token != claim or reminder.status not in ("PENDING", "PROCESSING")
+        else:
+            skip = reminder.status in ("SENT", "PROCESSING", "EXPIRED")
+        if skip:
+            print(f"[Celery] Skipped reminder {reminder_id} (status={reminder.status})")
+            return
+
+        old_status = reminder.status
+        reminder.status = "PROCESSING"
+        reminder.lease_expires_at = lease_expiry()
+        reminder.claim_token = claim = claim or new_claim_token()
+        reminder.save(update_fields=["status", "lease_expires_at", "claim_token"])
+        reminders_transitioned([transition(reminder, old_status)])
+
+    # ⏳ Wait for a shared WhatsApp token; if the wait is too long, release the
+    # claim and reschedule as a fresh task instead of burning a retry
+    if reminder.channel in ["WHATSAPP", "BOTH"]:
+        wait = rate_limiter.throttle("whapi", garage_id=reminder.garage_id)
+        if wait:
+            reminder.status = "PENDING"
+            reminder.lease_expires_at = None
+            reminder.not_before = retry_after(wait)
+            with transaction.atomic():
+                reminder.save(update_fields=["status", "lease_expires_at", "not_before", "updated_at"])
+                reminders_transitioned([transition(reminder, "PROCESSING")])
+            self.apply_async((reminder_id,), {"claim": claim}, countdown=math.ceil(wait))
+            print(f"[Celery] Rate limited reminder {reminder_id}; rescheduled in {wait:.1f}s")
+            return
+
+    reminder.lease_expires_at = None
+    reminder.not_before = None
+    try:
+        _deliver_reminder(reminder)
+    except (ConnectionError, TimeoutError):
+        # Release the claim so the retry does not skip this reminder as PROCESSING;
+        # not_before covers the longest backoff autoretry can pick
+        reminder.status = "PENDING"
+        reminder.not_before = retry_after(get_exponential_backoff_interval(
+            RETRY_BACKOFF, self.request.retries, RETRY_BACKOFF_MAX, full_jitter=False,
+        ))
+        with transaction.atomic():
+            reminder.save(update_fields=["status", "lease_expires_at", "not_before", "failure_reason", "updated_at"])
+            reminders_transitioned([transition(reminder, "PROCESSING")])
+        raise
+
+    with transaction.atomic():
+        reminder.save(update_fields=OUTCOME_FIELDS)
+        reminders_transitioned([transition(reminder, "PROCESSING")])
+
+
+def _send_whatsapp_chunk(reminders):
+    """
+    Send the chunk's WhatsApp messages concurrently over the pooled client.
+
+    Returns (results by reminder id, reminders held back by the rate limiter,
+    seconds until the limiter expects to have tokens again).
+    """
+    from services.whatsapp_service import get_whapi_client
+
+    outgoing, deferred, defer_for = [], [], 0
+    for reminder in reminders:
+        if reminder.channel not in ["WHATSAPP", "BOTH"]:
+            continue
+        try:
+            if _service_date_passed(reminder):
+                continue  # _deliver_reminder expires it
+            context = _build_context(reminder)
+        except Exception:
+            continue  # _deliver_reminder records the failure
+        # Shared token bucket: once the limiter has pushed back, stop sleeping for the rest
+        wait = rate_limiter.throttle(
+            "whapi",
+            garage_id=reminder.garage_id,
+            max_wait=0 if deferred else None,
+        )
+        if wait:
+            deferred.append(reminder)
+            defer_for = max(defer_for, wait)
+            continue
+        outgoing.append((reminder.id, reminder.customer.mobile, _render_whatsapp_message(context)))
+
+    results = {result.key: result for result in get_whapi_client().send_many(outgoing)}
+    return results, deferred, defer_for
+
+
+def _send_email_chunk(reminders, whatsapp_results):
+    """
+    Send the chunk's emails over one reused SMTP connection.
+
+    Only reminders whose WhatsApp step succeeded (or that have none) get an
+    email, matching the single-reminder flow. Returns results by reminder id.
+    """
+    from services.email_service import send_email_reminders_batch
+
+    outgoing = []
+    for reminder in reminders:
+        if reminder.channel not in ["EMAIL", "BOTH"]:
+            continue
+        email = getattr(reminder.customer, "email", None)
+        if not email:
+            continue
+        if reminder.channel == "BOTH":
+            result = whatsapp_results.get(reminder.id)
+            if result is None or result.error is not None:
+                continue
+        try:
+            if _service_date_passed(reminder):
+                continue
+            context = _build_context(reminder)
+        except Exception:
+            continue  # _deliver_reminder records the failure
+        outgoing.append((
+            reminder.id,
+            email,
+            f"Service Reminder - {context['garage'].garage_name}",
+            _render_email_message(context),
+        ))
+
+    return {result.key: result for result in send_email_reminders_batch(outgoing)}
+
+
+# Seconds before a batch reminder that hit a transient error is retried on its own
+BATCH_RETRY_COUNTDOWN = 60
+
+
+@shared_task(bind=True)
+def send_service_reminder_batch(self, reminder_ids, claim=None):
+    """
+    Send a chunk of reminders in one task.
+
+    Claims every sendable reminder of the chunk with a single locking query
+    (which also hydrates service/garage/customer/vehicle), sends them, and
+    writes all outcomes back with one bulk update. Reminders that hit a
+    transient error are released and handed to send_service_reminder, which
+    owns the retry/backoff policy; reminders the rate limiter holds back are
+    released and re-enqueued as a delayed batch.
+
+    `claim` is the token of the dispatcher's SKIP LOCKED claim (or of the
+    batch that deferred these ids); only reminders still holding it are
+    taken, and their lease is renewed. Without one, any reminder not sent,
+    expired or in flight is claimed here.
+    """
+    print(f"[Celery] Starting reminder batch: {len(reminder_ids)} reminders")
+
+    with transaction.atomic():
+        reminders = (
+            ServiceReminder.objects
+            .select_for_update(of=("self",))
+            .select_related("service_record", "customer", "vehicle")
+            .filter(id__in=reminder_ids)
+        )
+        if claim:
+            reminders = reminders.filter(claim_token=claim, status__in=["PENDING", "PROCESSING"])
+        else:
+            reminders = reminders.exclude(status__in=["SENT", "PROCESSING", "EXPIRED"])
+        reminders = list(reminders)
+        if not reminders:
+            print("[Celery] Reminder batch has nothing to send")
+            return {"sent": 0, "failed": 0, "expired": 0, "retried": 0, "deferred": 0}
+
+        claim = claim or new_claim_token()
+        ServiceReminder.objects.filter(
+            id__in=[r.id for r in reminders],
+        ).update(status="PROCESSING", lease_expires_at=lease_expiry(), claim_token=claim, updated_at=now())
+        reminders_transitioned(transition(reminder, reminder.status, "PROCESSING") for reminder in reminders)
+
+    whatsapp_results, deferred, defer_for = _send_whatsapp_chunk(reminders)
+    for reminder in deferred:
+        reminder.status = "PENDING"
+        reminder.not_before = retry_after(defer_for)
+    deferred_ids = {reminder.id for reminder in deferred}
+    to_send = [reminder for reminder in reminders if reminder.id not in deferred_ids]
+    email_results = _send_email_chunk(to_send, whatsapp_results)
+
+    done, retry = [], []
+    for reminder in to_send:
+        reminder.status = "PROCESSING"
+        reminder.not_before = None
+        try:
+            _deliver_reminder(reminder, whatsapp_results=whatsapp_results, email_results=email_results)
+            done.append(reminder)
+        except (ConnectionError, TimeoutError):
+            reminder.status = "PENDING"
+            reminder.not_before = retry_after(BATCH_RETRY_COUNTDOWN)
+            retry.append(reminder)
+
+    touched_at = now()
+    for reminder in done + retry + deferred:
+        reminder.lease_expires_at = None
+        reminder.updated_at = touched_at
+    with transaction.atomic():
+        ServiceReminder.objects.bulk_update(done + retry + deferred, OUTCOME_FIELDS)
+        reminders_transitioned(transition(reminder, "PROCESSING") for reminder in done + retry + deferred)
+
+    for reminder in retry:
+        send_service_reminder.apply_async((reminder.id,), {"claim": claim}, countdown=BATCH_RETRY_COUNTDOWN)
+    if deferred:
+        # Rate limited: the rest of the chunk goes out later as its own batch
+        send_service_reminder_batch.apply_async(
+            (sorted(deferred_ids),), {"claim": claim}, countdown=math.ceil(defer_for),
+        )
+
+    summary = {
+        "sent": sum(1 for r in done if r.status == "SENT"),
+        "failed": sum(1 for r in done if r.status == "FAILED"),
+        "expired": sum(1 for r in done if r.status == "EXPIRED"),
+        "retried": len(retry),
+        "deferred": len(deferred),
+    }
+    print(f"[Celery] Reminder batch finished: {summary}")
+    return summary
+
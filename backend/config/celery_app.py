@@ -1,6 +1,7 @@
 import os
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_init
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
@@ -16,6 +17,8 @@ app.autodiscover_tasks(related_name="schedulers")
 # Configure service reminder schedule via environment variables (use .env or docker-compose)
 SERVICE_REMINDER_HOUR = int(os.getenv("SERVICE_REMINDER_HOUR", 12))
 SERVICE_REMINDER_MINUTE = int(os.getenv("SERVICE_REMINDER_MINUTE", 30))
+# How often expired PROCESSING leases are re-queued
+SERVICE_REMINDER_REAPER_MINUTES = int(os.getenv("SERVICE_REMINDER_REAPER_MINUTES", 10))
 # Allow overriding Celery timezone (e.g. "Asia/Kolkata") - defaults to UTC
 CELERY_TZ = os.getenv("CELERY_TIMEZONE", "UTC")
 
@@ -33,8 +36,21 @@ app.conf.beat_schedule = {
         "task": "celery_app.schedulers.trigger_due_service_reminders",
         "schedule": crontab(hour=SERVICE_REMINDER_HOUR, minute=SERVICE_REMINDER_MINUTE),
     },
+    "reap-expired-reminder-leases": {
+        "task": "celery_app.schedulers.reap_expired_reminder_leases",
+        "schedule": crontab(minute=f"*/{SERVICE_REMINDER_REAPER_MINUTES}"),
+    },
 }
 
+
+
+@worker_process_init.connect
+def preload_reminder_templates(**kwargs):
+    # Compile all reminder templates once per worker process, before the first task
+    from celery_app.reminder_templates import reminder_templates
+    reminder_templates.load()
+
+
 # Expose common aliases so imports like `from config.celery_app import celery_app` work
 celery_app = app
 celery = app
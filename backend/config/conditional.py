@@ -0,0 +1,47 @@
+import hashlib
+
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """
+    Strong ETags and If-None-Match for read-only list views.
+
+    The ETag is derived from the data version(s) returned by
+    get_etag_versions() (see garages.versions), the view and its query
+    params, so a matching If-None-Match is answered with 304 before any
+    queryset is built. Returning None from get_etag_versions() (e.g. cache
+    unavailable, or a forbidden caller) skips the ETag and serves the view
+    as usual. Views using the mixin must define get_etag_versions(request);
+    this is checked when the view class is created.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if not callable(getattr(cls, "get_etag_versions", None)):
+            raise TypeError(f"{cls.__name__} uses ConditionalGetMixin but does not define get_etag_versions()")
+
+    def get_etag(self, request):
+        versions = self.get_etag_versions(request)
+        if versions is None:
+            return None
+        params = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.items()))
+        raw = "|".join([type(self).__name__, *versions, params])
+        return f'"{hashlib.sha1(raw.encode()).hexdigest()}"'
+
+    def get(self, request, *args, **kwargs):
+        etag = self.get_etag(request)
+        if etag and etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = super().get(request, *args, **kwargs)
+            if not etag or response.status_code != status.HTTP_200_OK:
+                return response
+        response["ETag"] = etag
+        # Per-caller data: browsers may keep it, but must revalidate each time
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ["Authorization"])
+        return response
@@ -0,0 +1,215 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from rest_framework.views import APIView
+
+from accounts.permissions import SuperAdminOnly
+from config.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Redis hash shared by all workers: field "<view>\t<method>\t<series>" -> total
+METRICS_KEY = "metrics:http"
+
+UNMATCHED = "<unmatched>"
+
+# Series kept as floats (HINCRBYFLOAT); the rest are integer counts
+FLOAT_SERIES = {"sum", "db_seconds"}
+
+COUNTERS = (
+    ("db_queries", "http_request_db_queries_total", "Database queries run by API requests."),
+    ("db_seconds", "http_request_db_seconds_total", "Time API requests spent in database queries."),
+    ("response_bytes", "http_response_size_bytes_total", "Bytes of API response bodies."),
+)
+LATENCY = ("http_request_duration_seconds", "API request latency.")
+
+
+class _QueryStats:
+    """execute_wrapper counting a request's queries and their time."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - start
+
+
+class MetricsRecorder:
+    """
+    Per-process totals, flushed into METRICS_KEY every
+    METRICS_FLUSH_INTERVAL seconds (one pipelined round trip) by a daemon
+    thread, so requests only touch a dict and never wait on Redis. Every
+    gunicorn worker adds into the same hash, so a scrape sees all of them;
+    a worker's latest requests show up once it flushes. While Redis is
+    unreachable the totals are kept and retried on the next flush.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = defaultdict(float)
+        self._flusher_pid = None
+
+    def record(self, view, method, duration, queries, db_seconds, response_bytes):
+        prefix = f"{view}\t{method}\t"
+        bucket = next((le for le in settings.METRICS_LATENCY_BUCKETS if duration <= le), "+Inf")
+        with self._lock:
+            totals = self._totals
+            totals[f"{prefix}bucket:{bucket}"] += 1
+            totals[f"{prefix}count"] += 1
+            totals[f"{prefix}sum"] += duration
+            totals[f"{prefix}db_queries"] += queries
+            totals[f"{prefix}db_seconds"] += db_seconds
+            totals[f"{prefix}response_bytes"] += response_bytes
+        self._ensure_flusher()
+
+    def _ensure_flusher(self):
+        # Threads do not survive a fork: each worker process starts its own
+        pid = os.getpid()
+        if self._flusher_pid == pid:
+            return
+        with self._lock:
+            if self._flusher_pid == pid:
+                return
+            self._flusher_pid = pid
+            threading.Thread(target=self._flush_periodically, name="metrics-flusher", daemon=True).start()
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(settings.METRICS_FLUSH_INTERVAL)
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            totals, self._totals = self._totals, defaultdict(float)
+        if not totals:
+            return
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            for field, value in totals.items():
+                if field.rsplit("\t", 1)[1] in FLOAT_SERIES:
+                    pipe.hincrbyfloat(METRICS_KEY, field, value)
+                else:
+                    pipe.hincrby(METRICS_KEY, field, int(value))
+            pipe.execute()
+        except Exception as exc:
+            logger.warning("Could not flush request metrics, keeping them for the next flush: %s", exc)
+            with self._lock:
+                for field, value in totals.items():
+                    self._totals[field] += value
+
+
+recorder = MetricsRecorder()
+atexit.register(recorder.flush)
+
+
+class RequestMetricsMiddleware:
+    """
+    Records latency, DB query count and time, and response size per
+    resolved URL name and method. Exported by MetricsView.
+
+    Streaming responses count their Content-Length (if any), and their
+    latency stops when the view returns rather than when the body is sent.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+
+        stats = _QueryStats()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        try:
+            match = request.resolver_match
+            if match is None:
+                view = UNMATCHED
+            else:
+                view = match.view_name if match.url_name else match.route
+            if response.streaming:
+                size = int(response.get("Content-Length") or 0)
+            else:
+                size = len(response.content)
+            recorder.record(view, request.method, duration, stats.count, stats.seconds, size)
+        except Exception as exc:
+            logger.warning("Could not record request metrics: %s", exc)
+        return response
+
+
+def _label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value):
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def render_metrics(totals):
+    """Prometheus text exposition of METRICS_KEY's fields."""
+    series = defaultdict(dict)
+    for field, value in totals.items():
+        if isinstance(field, bytes):
+            field, value = field.decode(), value.decode()
+        view, method, name = field.split("\t")
+        series[(view, method)][name] = float(value)
+
+    name, help_text = LATENCY
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for (view, method), values in sorted(series.items()):
+        labels = f'view="{_label(view)}",method="{_label(method)}"'
+        buckets = sorted(
+            (float(key[len("bucket:"):]), value) for key, value in values.items() if key.startswith("bucket:")
+        )
+        cumulative = 0
+        for le, value in buckets:
+            cumulative += value
+            if le != float("inf"):
+                lines.append(f'{name}_bucket{{{labels},le="{_number(le)}"}} {_number(cumulative)}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {_number(values.get("count", 0))}')
+        lines.append(f"{name}_sum{{{labels}}} {_number(values.get('sum', 0))}")
+        lines.append(f"{name}_count{{{labels}}} {_number(values.get('count', 0))}")
+
+    for key, name, help_text in COUNTERS:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for (view, method), values in sorted(series.items()):
+            labels = f'view="{_label(view)}",method="{_label(method)}"'
+            lines.append(f"{name}{{{labels}}} {_number(values.get(key, 0))}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsView(APIView):
+    """Request metrics of all workers in Prometheus text format (admins only)."""
+    permission_classes = [SuperAdminOnly]
+
+    def get(self, request, *args, **kwargs):
+        recorder.flush()
+        try:
+            totals = get_redis().hgetall(METRICS_KEY)
+        except Exception as exc:
+            return HttpResponse(
+                f"# metrics unavailable: {exc}\n",
+                status=503,
+                content_type="text/plain; version=0.0.4; charset=utf-8",
+            )
+        return HttpResponse(render_metrics(totals), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,142 @@
+import base64
+import json
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+
+class InvalidCursor(ValidationError):
+    default_detail = "Invalid cursor."
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor (keyset) pagination on the view's `ordering`.
+
+    The cursor encodes the ordering values of the last row of a page; the
+    next page is `WHERE (ordering) comes after (cursor)`, so every page costs
+    the same index range scan however deep the client has paged, unlike
+    OFFSET. A previous-page cursor encodes the first row and is read in the
+    reversed ordering. The ordering must end in a unique field (normally
+    "id") and its fields must be non-null. Rows can be model instances or
+    values() dicts.
+
+    Query params: cursor, page_size (<= API_MAX_PAGE_SIZE) and count=true to
+    also return the total (a separate COUNT query, so it is opt-in).
+    The response keeps the {"success", "data"} envelope and adds
+    "next_cursor" / "previous_cursor" / "has_more".
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    count_query_param = "count"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.ordering = tuple(view.ordering)
+        self.fields = [field.lstrip("-") for field in self.ordering]
+        self.page_size = self.get_page_size(request)
+
+        self.count = None
+        if request.query_params.get(self.count_query_param, "").lower() in ("1", "true"):
+            self.count = queryset.count()
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        backwards = False
+        if cursor:
+            backwards, values = self.decode_cursor(cursor)
+            queryset = queryset.filter(self._after(queryset.model, values, backwards))
+        if backwards:
+            queryset = queryset.order_by(*(self._reversed(field) for field in self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        rows = list(queryset[:self.page_size + 1])
+        beyond = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if backwards:
+            rows.reverse()
+            # The page the cursor was taken from follows this one
+            self.has_more, has_previous = True, beyond
+        else:
+            self.has_more, has_previous = beyond, bool(cursor)
+
+        self.next_cursor = self.previous_cursor = None
+        if rows and self.has_more:
+            self.next_cursor = self.encode_cursor(self._position(rows[-1]))
+        if rows and has_previous:
+            self.previous_cursor = self.encode_cursor(self._position(rows[0]), backwards=True)
+        return rows
+
+    def get_paginated_response(self, data):
+        body = {"success": True}
+        if self.count is not None:
+            body["count"] = self.count
+        body.update({
+            "data": data,
+            "next_cursor": self.next_cursor,
+            "previous_cursor": self.previous_cursor,
+            "has_more": self.has_more,
+        })
+        return Response(body)
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, settings.API_PAGE_SIZE))
+        except ValueError:
+            page_size = settings.API_PAGE_SIZE
+        return max(1, min(page_size, settings.API_MAX_PAGE_SIZE))
+
+    def _position(self, row):
+        if isinstance(row, dict):
+            return [row[field] for field in self.fields]
+        return [getattr(row, field) for field in self.fields]
+
+    @staticmethod
+    def _reversed(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    def _after(self, model, values, backwards=False):
+        """
+        Rows strictly after `values` in ordering (before it if `backwards`):
+        (a > x) OR (a = x AND b > y) OR ... with < for descending fields.
+        """
+        condition = Q()
+        equal = {}
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip("-")
+            try:
+                value = model._meta.get_field(name).to_python(value)
+            except DjangoValidationError:
+                raise InvalidCursor()
+            except FieldDoesNotExist:
+                pass
+            lookup = "lt" if field.startswith("-") != backwards else "gt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return condition
+
+    def encode_cursor(self, values, backwards=False):
+        payload = {"before" if backwards else "after": values}
+        raw = json.dumps(payload, cls=DjangoJSONEncoder, separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        """Returns (backwards, values)."""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            payload = json.loads(raw)
+        except (ValueError, TypeError):
+            raise InvalidCursor()
+        if not isinstance(payload, dict) or len(payload) != 1:
+            raise InvalidCursor()
+        (direction, values), = payload.items()
+        if direction not in ("after", "before"):
+            raise InvalidCursor()
+        if not isinstance(values, list) or len(values) != len(self.fields):
+            raise InvalidCursor()
+        return direction == "before", values
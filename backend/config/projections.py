@@ -0,0 +1,24 @@
+class Projection:
+    """
+    Read-only list representation served straight from values() rows.
+
+    `fields` are the output keys, in order. Each is a model field name
+    (attname for foreign keys, e.g. "customer_id") unless `sources` maps it
+    to an expression such as F("customer__name"), which becomes the join.
+    project() narrows a queryset to exactly those columns, so a page is one
+    query returning dicts, with no model instances built; serialize() puts
+    the keys in output order. Values go out as the database returns them,
+    so this fits fields a ModelSerializer would pass through unchanged
+    (not dates or datetimes, which it formats).
+    """
+
+    def __init__(self, *fields, **sources):
+        self.fields = fields
+        self.sources = sources
+
+    def project(self, queryset):
+        columns = [field for field in self.fields if field not in self.sources]
+        return queryset.values(*columns, **self.sources)
+
+    def serialize(self, rows):
+        return [{field: row[field] for field in self.fields} for row in rows]
@@ -0,0 +1,164 @@
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+from config.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Pub/sub channel carrying "<kind>:<id>" invalidations between processes
+CHANNEL = "reference-cache:invalidate"
+
+VEHICLE_TYPES = "vehicle_types"
+GARAGE = "garage"
+
+
+class ReferenceCache:
+    """
+    Process-local cache of small, rarely changing reference rows: all
+    VehicleTypes and per-id Garages. Reads are dictionary hits shared by
+    every thread of the process (gunicorn threads, Celery workers).
+
+    Writers call invalidate_*(); the entry is dropped locally and, after the
+    transaction commits, published on CHANNEL so every other process drops
+    it too. Each process runs a daemon thread subscribed to CHANNEL. While
+    that subscription is down the cache is bypassed (reads go to the
+    database), and it is emptied on (re)subscribe, so a missed message
+    cannot leave a stale entry; REFERENCE_CACHE_TTL bounds entry age on
+    top of that (0 disables the cache).
+
+    Cached instances are shared between threads: treat them as read-only.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # (kind, id) -> (expires_at, value)
+        self._generation = 0
+        self._subscribed = False
+        self._listener_pid = None
+
+    def vehicle_types(self):
+        """All vehicle types as {id: VehicleType}, in id order."""
+        from vehicles.models import VehicleType
+
+        return self._get((VEHICLE_TYPES, None), lambda: {
+            vehicle_type.id: vehicle_type for vehicle_type in VehicleType.objects.order_by("id")
+        })
+
+    def vehicle_type(self, vehicle_type_id):
+        if vehicle_type_id is None:
+            return None
+        return self.vehicle_types().get(vehicle_type_id)
+
+    def garage(self, garage_id):
+        """The Garage with this id, or None."""
+        from garages.models import Garage
+
+        if garage_id is None:
+            return None
+        return self._get((GARAGE, garage_id), lambda: Garage.objects.filter(pk=garage_id).first())
+
+    def invalidate_vehicle_types(self):
+        self._invalidate(VEHICLE_TYPES)
+
+    def invalidate_garage(self, garage_id):
+        self._invalidate(GARAGE, garage_id)
+
+    def _invalidate(self, kind, object_id=None):
+        self._drop(kind, object_id)
+        message = f"{kind}:{object_id if object_id is not None else ''}"
+        transaction.on_commit(lambda: self._publish(message))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def _get(self, key, load):
+        ttl = settings.REFERENCE_CACHE_TTL
+        if ttl <= 0:
+            return load()
+        self._ensure_listener()
+        if not self._subscribed:
+            return load()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            generation = self._generation
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        value = load()
+        with self._lock:
+            # Skip the store if an invalidation arrived while loading
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + ttl, value)
+        return value
+
+    def _drop(self, kind, object_id):
+        with self._lock:
+            if kind == VEHICLE_TYPES:
+                self._entries.pop((VEHICLE_TYPES, None), None)
+            else:
+                self._entries.pop((kind, object_id), None)
+            self._generation += 1
+
+    def _handle(self, message):
+        if isinstance(message, bytes):
+            message = message.decode()
+        kind, _, object_id = message.partition(":")
+        self._drop(kind, int(object_id) if object_id.isdigit() else None)
+
+    def _publish(self, message):
+        try:
+            get_redis().publish(CHANNEL, message)
+        except Exception as exc:
+            logger.warning("Could not publish reference cache invalidation %s: %s", message, exc)
+
+    def _ensure_listener(self):
+        # Threads do not survive a fork: each worker process starts its own
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return
+        with self._lock:
+            if self._listener_pid == pid:
+                return
+            self._listener_pid = pid
+            self._subscribed = False
+            self._entries.clear()
+            threading.Thread(target=self._listen, name="reference-cache-listener", daemon=True).start()
+
+    def _listen(self):
+        warned = False
+        while True:
+            pubsub = None
+            try:
+                pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(CHANNEL)
+                # Anything may have changed while this process was not listening
+                self.clear()
+                self._subscribed = True
+                warned = False
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message["type"] == "message":
+                        self._handle(message["data"])
+            except Exception as exc:
+                self._subscribed = False
+                if not warned:
+                    logger.warning("Reference cache listener disconnected, bypassing cache: %s", exc)
+                    warned = True
+                time.sleep(settings.REFERENCE_CACHE_RETRY_SECONDS)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+
+reference_cache = ReferenceCache()
@@ -48,6 +48,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     "rest_framework",
     "corsheaders",
     'vehicles',
@@ -64,24 +65,60 @@ INSTALLED_APPS = [
 WHAPI_BASE_URL = os.getenv("WHAPI_BASE_URL")
 WHAPI_INSTANCE_ID = os.getenv("WHAPI_INSTANCE_ID")
 WHAPI_API_TOKEN = os.getenv("WHAPI_API_TOKEN")
+# Pooled client: max in-flight requests (and pooled connections) per worker process, timeouts in seconds
+WHAPI_MAX_CONCURRENCY = int(os.getenv("WHAPI_MAX_CONCURRENCY", 8))
+WHAPI_CONNECT_TIMEOUT = float(os.getenv("WHAPI_CONNECT_TIMEOUT", 5))
+WHAPI_READ_TIMEOUT = float(os.getenv("WHAPI_READ_TIMEOUT", 15))
 
 
 AUTH_USER_MODEL = "accounts.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
 }
+# orjson-backed JSON renderer/parser (config.renderers); output parses to the
+# same data as DRF's JSONRenderer. Compare with `python manage.py benchmark_json`
+API_FAST_JSON = os.getenv("API_FAST_JSON", "False") == "True"
+if API_FAST_JSON:
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = (
+        "config.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    )
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"] = (
+        "config.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    )
+
+# List endpoints use keyset pagination (config.pagination.KeysetPagination)
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", 50))
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", 500))
+# Rows fetched per server-side cursor round trip by streaming exports
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 2000))
+# Vehicle / customer search (vehicles.search): results per list, shortest
+# query, trigram word-similarity cut-off, and lifetime of the in-process
+# index used where pg_trgm is unavailable
+SEARCH_RESULT_LIMIT = int(os.getenv("SEARCH_RESULT_LIMIT", 10))
+SEARCH_MAX_RESULT_LIMIT = int(os.getenv("SEARCH_MAX_RESULT_LIMIT", 50))
+SEARCH_MIN_QUERY_LENGTH = int(os.getenv("SEARCH_MIN_QUERY_LENGTH", 3))
+SEARCH_MIN_SIMILARITY = float(os.getenv("SEARCH_MIN_SIMILARITY", 0.4))
+SEARCH_FALLBACK_INDEX_TTL = int(os.getenv("SEARCH_FALLBACK_INDEX_TTL", 300))
+# Seconds a check-in lookup (vehicles.lookup) stays cached; any change to the
+# garage's customers, vehicles or services retires it sooner
+CHECKIN_CACHE_TTL = int(os.getenv("CHECKIN_CACHE_TTL", 600))
 
 from datetime import timedelta
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=1),    # 1 hour
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),    # 7 days
+    # Refresh tokens are blacklisted in Redis (accounts.tokens), not in the token_blacklist tables
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.RefreshTokenSerializer",
 }
 
 
@@ -90,6 +127,7 @@ CORS_ALLOWED_ORIGINS = [o.strip() for o in os.getenv('CORS_ALLOWED_ORIGINS', '')
 
 
 MIDDLEWARE = [
+    "config.metrics.RequestMetricsMiddleware",        # per-view latency / DB metrics (outermost)
     "corsheaders.middleware.CorsMiddleware",          # CORS
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
@@ -197,3 +235,73 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = "UTC"
 
+# Redis used directly by the app (rate limiting, ...); defaults to the broker instance
+REDIS_URL = os.getenv("REDIS_URL", CELERY_BROKER_URL)
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", 2))
+
+# Django cache (garage membership lookups, ...) on the same Redis
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+        "KEY_PREFIX": "garage-app",
+        "OPTIONS": {
+            "socket_connect_timeout": REDIS_SOCKET_TIMEOUT,
+            "socket_timeout": REDIS_SOCKET_TIMEOUT,
+        },
+    }
+}
+# Process-local VehicleType / Garage cache (config.reference_cache), kept in
+# step across processes over Redis pub/sub; TTL 0 disables it
+REFERENCE_CACHE_TTL = int(os.getenv("REFERENCE_CACHE_TTL", 300))
+REFERENCE_CACHE_RETRY_SECONDS = int(os.getenv("REFERENCE_CACHE_RETRY_SECONDS", 5))
+# Request metrics (config.metrics): per-view latency histogram buckets in
+# seconds, and how often each worker's flusher thread adds its totals into Redis
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True") == "True"
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", 10))
+# Seconds a user's resolved garage is cached (also invalidated on membership changes)
+GARAGE_CACHE_TTL = int(os.getenv("GARAGE_CACHE_TTL", 60))
+# Upper bound on a cached reminder dashboard summary; services.reminder_events
+# invalidates a garage's summaries as soon as its reminders change
+REMINDER_SUMMARY_CACHE_TTL = int(os.getenv("REMINDER_SUMMARY_CACHE_TTL", 3600))
+# Authenticated-user cache (accounts.authentication): shared TTL, and the
+# per-process LRU size/TTL - the latter bounds staleness in other processes
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", 300))
+USER_CACHE_LOCAL_TTL = int(os.getenv("USER_CACHE_LOCAL_TTL", 10))
+USER_CACHE_LOCAL_SIZE = int(os.getenv("USER_CACHE_LOCAL_SIZE", 1024))
+
+# Outbound provider rate limits (token buckets shared by all workers through Redis).
+# rate = tokens per second, burst = bucket size. GARAGE_RATE_LIMITS applies one extra
+# bucket per garage; per-garage overrides go under "garages": {garage_id: {...}}.
+PROVIDER_RATE_LIMITS = {
+    "whapi": {
+        "rate": float(os.getenv("WHAPI_RATE_PER_SECOND", 5)),
+        "burst": int(os.getenv("WHAPI_RATE_BURST", 10)),
+    },
+}
+GARAGE_RATE_LIMITS = {
+    "whapi": {
+        "rate": float(os.getenv("WHAPI_GARAGE_RATE_PER_SECOND", 1)),
+        "burst": int(os.getenv("WHAPI_GARAGE_RATE_BURST", 5)),
+        "garages": {},
+    },
+}
+# Longest a reminder task sleeps for a token before rescheduling itself instead
+RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", 2))
+
+# Reminder dispatch: one task per chunk of due reminders instead of one per reminder
+SERVICE_REMINDER_BATCH_DISPATCH = os.getenv("SERVICE_REMINDER_BATCH_DISPATCH", "True") == "True"
+SERVICE_REMINDER_BATCH_SIZE = int(os.getenv("SERVICE_REMINDER_BATCH_SIZE", 100))
+# Overdue reminders are still sent up to this many days late (e.g. a missed
+# beat run); older ones, and any whose service date has passed, are EXPIRED
+SERVICE_REMINDER_MAX_LATENESS_DAYS = int(os.getenv("SERVICE_REMINDER_MAX_LATENESS_DAYS", 1))
+# PROCESSING claims expire after this long and are re-queued by the lease reaper
+SERVICE_REMINDER_LEASE_SECONDS = int(os.getenv("SERVICE_REMINDER_LEASE_SECONDS", 900))
+
+# Bulk import (garages/import/): rows written per batch, the largest upload
+# processed inside the request - bigger files are queued to a Celery worker -
+# and the largest upload accepted at all (queued files are kept on the job row)
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", 500))
+IMPORT_SYNC_MAX_BYTES = int(os.getenv("IMPORT_SYNC_MAX_BYTES", 1024 * 1024))
+IMPORT_MAX_BYTES = int(os.getenv("IMPORT_MAX_BYTES", 10 * 1024 * 1024))
@@ -0,0 +1,385 @@
+import base64
+import json
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from redis.exceptions import ConnectionError as RedisConnectionError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from config import metrics, reference_cache as reference_cache_module
+from config.reference_cache import CHANNEL, reference_cache
+from config.renderers import ORJSONRenderer
+from accounts.serializers import UserSerializer
+from garages.models import Customer, Garage, GarageUser
+from garages.serializers.Customer_serializer import CustomerSerializer
+from services.models import ServiceRecord
+from vehicles.models import Vehicle, VehicleType
+from vehicles.serializers import VehicleSerializer
+
+try:
+    import fakeredis
+except ImportError:  # optional: only the Redis round-trip test needs it
+    fakeredis = None
+
+User = get_user_model()
+
+
+class RenderMetricsTests(SimpleTestCase):
+    """Prometheus text for the totals in METRICS_KEY."""
+
+    def test_histogram_and_counters(self):
+        totals = {
+            b"list-services\tGET\tbucket:0.1": b"2",
+            b"list-services\tGET\tbucket:0.5": b"1",
+            b"list-services\tGET\tbucket:+Inf": b"1",
+            b"list-services\tGET\tcount": b"4",
+            b"list-services\tGET\tsum": b"12.25",
+            b"list-services\tGET\tdb_queries": b"9",
+            b"list-services\tGET\tdb_seconds": b"0.5",
+            b"list-services\tGET\tresponse_bytes": b"2048",
+        }
+
+        lines = metrics.render_metrics(totals).splitlines()
+
+        labels = 'view="list-services",method="GET"'
+        self.assertIn("# TYPE http_request_duration_seconds histogram", lines)
+        self.assertIn(f'http_request_duration_seconds_bucket{{{labels},le="0.1"}} 2', lines)
+        # Buckets are cumulative
+        self.assertIn(f'http_request_duration_seconds_bucket{{{labels},le="0.5"}} 3', lines)
+        self.assertIn(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 4', lines)
+        self.assertIn(f"http_request_duration_seconds_sum{{{labels}}} 12.25", lines)
+        self.assertIn(f"http_request_db_queries_total{{{labels}}} 9", lines)
+        self.assertIn(f"http_request_db_seconds_total{{{labels}}} 0.5", lines)
+        self.assertIn(f"http_response_size_bytes_total{{{labels}}} 2048", lines)
+
+
+@override_settings(METRICS_ENABLED=True)
+class RequestMetricsMiddlewareTests(TestCase):
+    """Requests only update the process totals; Redis is written by flush()."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="owner", password="pass", role="ADMIN")
+        cls.admin = User.objects.create_user(username="root", password="pass", role="SUPER_ADMIN")
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.recorder = metrics.MetricsRecorder()
+        patcher = mock.patch.object(metrics, "recorder", self.recorder)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # No background flusher: the tests flush explicitly
+        patcher = mock.patch.object(self.recorder, "_ensure_flusher")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_request_is_recorded_without_redis(self):
+        self.client.force_authenticate(self.user)
+        with mock.patch.object(metrics, "get_redis") as get_redis:
+            response = self.client.get(reverse("list-services"))
+            self.client.get("/api/does-not-exist/")
+        get_redis.assert_not_called()
+
+        totals = self.recorder._totals
+        self.assertEqual(totals["list-services\tGET\tcount"], 1)
+        self.assertGreater(totals["list-services\tGET\tdb_queries"], 0)
+        self.assertEqual(totals["list-services\tGET\tresponse_bytes"], len(response.content))
+        self.assertEqual(totals[f"{metrics.UNMATCHED}\tGET\tcount"], 1)
+
+    def test_failed_flush_keeps_totals(self):
+        self.recorder.record("list-services", "GET", 0.2, 3, 0.01, 100)
+        redis = mock.Mock()
+        redis.pipeline.return_value.execute.side_effect = RedisConnectionError("down")
+
+        with mock.patch.object(metrics, "get_redis", return_value=redis):
+            self.recorder.flush()
+
+        self.assertEqual(self.recorder._totals["list-services\tGET\tcount"], 1)
+        self.assertEqual(self.recorder._totals["list-services\tGET\tdb_queries"], 3)
+
+    @skipUnless(fakeredis, "fakeredis is not installed")
+    def test_metrics_view_reports_all_workers(self):
+        redis = fakeredis.FakeRedis()
+        other_worker = metrics.MetricsRecorder()
+        other_worker.record("list-services", "GET", 0.3, 4, 0.01, 100)
+        with mock.patch.object(metrics, "get_redis", return_value=redis):
+            other_worker.flush()
+
+            self.client.force_authenticate(self.user)
+            self.client.get(reverse("list-services"))
+            self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+
+            self.client.force_authenticate(self.admin)
+            response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = response.content.decode()
+        # The other worker's request plus this one's (the 403 call)
+        self.assertIn('http_request_duration_seconds_count{view="list-services",method="GET"} 2', body)
+        self.assertIn('http_request_duration_seconds_count{view="metrics",method="GET"} 1', body)
+
+
+class KeysetPaginationTests(TestCase):
+    """Cursor pages of list-services, ordered by (-service_date, id)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="owner", password="pass", role="ADMIN")
+        garage = Garage.objects.create(garage_name="Garage", mobile="9000000000", user=cls.user)
+        GarageUser.objects.create(user=cls.user, garage=garage)
+        customer = Customer.objects.create(garage=garage, name="Rahul Sharma", mobile="9876500001")
+        vehicle = Vehicle.objects.create(
+            vehicle_number="MH05DU6253", vehicle_model="Swift", customer=customer, garage=garage,
+        )
+        # Three records share each service date, so pages split ties
+        today = date.today()
+        records = [
+            ServiceRecord.objects.create(
+                garage=garage, vehicle=vehicle, customer=customer,
+                service_date=today - timedelta(days=i // 3), next_service_date=today + timedelta(days=90),
+            )
+            for i in range(7)
+        ]
+        cls.expected = [
+            record.id for record in sorted(records, key=lambda record: (-record.service_date.toordinal(), record.id))
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def page(self, cursor=None, **params):
+        if cursor:
+            params["cursor"] = cursor
+        response = self.client.get(reverse("list-services"), {"page_size": 3, **params})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        return [row["id"] for row in body["data"]], body
+
+    def test_walk_forward_and_back(self):
+        first, body = self.page(count="true")
+        self.assertEqual(body["count"], 7)
+        self.assertIsNone(body["previous_cursor"])
+        second, body = self.page(body["next_cursor"])
+        third, body = self.page(body["next_cursor"])
+        self.assertFalse(body["has_more"])
+        self.assertIsNone(body["next_cursor"])
+        self.assertEqual(first + second + third, self.expected)
+
+        back, body = self.page(body["previous_cursor"])
+        self.assertEqual(back, second)
+        self.assertTrue(body["has_more"])
+        back, body = self.page(body["previous_cursor"])
+        self.assertEqual(back, first)
+        self.assertIsNone(body["previous_cursor"])
+        forward, _ = self.page(body["next_cursor"])
+        self.assertEqual(forward, second)
+
+    def test_ties_on_the_sort_key_are_not_skipped_or_repeated(self):
+        seen = []
+        cursor = None
+        while True:
+            ids, body = self.page(cursor, page_size=2)
+            seen += ids
+            cursor = body["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(seen, self.expected)
+
+    def test_invalid_cursor_is_rejected(self):
+        def encode(raw):
+            return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+        for cursor in (
+            "not-a-cursor!",
+            encode("[1, 2]"),
+            encode('{"after": ["2024-01-01"]}'),
+            encode('{"after": ["not a date", 1]}'),
+            encode('{"sideways": ["2024-01-01", 1]}'),
+        ):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(reverse("list-services"), {"cursor": cursor})
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.json()["success"])
+
+
+class ORJSONRendererTests(TestCase):
+    """ORJSONRenderer output parses to the same data as JSONRenderer's."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="owner", password="pass", role="ADMIN")
+        garage = Garage.objects.create(garage_name="Garage", mobile="9000000000", user=cls.user)
+        GarageUser.objects.create(user=cls.user, garage=garage)
+        customer = Customer.objects.create(
+            garage=garage, name="Meera Iyer — ✓", mobile="9123400002", address="Line\u2028break",
+        )
+        vehicle = Vehicle.objects.create(
+            vehicle_number="KA01AB1234", vehicle_model="City", customer=customer, garage=garage,
+        )
+        ServiceRecord.objects.create(
+            garage=garage, vehicle=vehicle, customer=customer, notes="Oil change",
+            service_date=date(2026, 1, 1), next_service_date=date(2026, 7, 1),
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertSameParsed(self, data):
+        expected = JSONRenderer().render(data)
+        self.assertEqual(json.loads(ORJSONRenderer().render(data)), json.loads(expected))
+
+    def test_list_envelopes(self):
+        for name in ("list-services", "list-customers"):
+            with self.subTest(name):
+                response = self.client.get(reverse(name), {"count": "true"})
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response.data["data"])
+                self.assertSameParsed(response.data)
+
+    def test_dates_decimals_and_lazy_strings(self):
+        self.assertSameParsed({
+            "success": True,
+            "data": [{
+                "service_date": date(2026, 1, 1),
+                "created_at": datetime(2026, 1, 1, 9, 30, 15, 123456, tzinfo=dt_timezone.utc),
+                "amount": Decimal("1499.50"),
+                "large": Decimal("1E+16"),
+                "status_display": gettext_lazy("Pending"),
+                7: "non-string key",
+            }],
+        })
+
+
+class ReferenceCacheTests(TestCase):
+    """Process-local reference rows, dropped on local writes and on published invalidations."""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(username="owner", password="pass", role="ADMIN")
+        cls.garage = Garage.objects.create(garage_name="Garage", mobile="9000000000", user=user)
+
+    def setUp(self):
+        # As if the listener were subscribed, without starting its thread
+        patcher = mock.patch.object(reference_cache, "_ensure_listener")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(reference_cache, "_subscribed", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.redis = mock.Mock()
+        patcher = mock.patch.object(reference_cache_module, "get_redis", return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        reference_cache.clear()
+        self.addCleanup(reference_cache.clear)
+
+    def test_local_write_drops_and_publishes(self):
+        self.assertEqual(reference_cache.garage(self.garage.id).garage_name, "Garage")
+        with self.assertNumQueries(0):
+            reference_cache.garage(self.garage.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Garage.objects.filter(pk=self.garage.pk).update(garage_name="Renamed")
+            self.garage.refresh_from_db()
+            self.garage.save()
+
+        self.assertEqual(reference_cache.garage(self.garage.id).garage_name, "Renamed")
+        self.redis.publish.assert_called_once_with(CHANNEL, f"garage:{self.garage.id}")
+
+    def test_vehicle_type_change_drops_the_list(self):
+        two_wheeler = VehicleType.objects.create(name="Two Wheeler")
+        self.assertEqual(list(reference_cache.vehicle_types()), [two_wheeler.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            four_wheeler = VehicleType.objects.create(name="Four Wheeler")
+
+        self.assertEqual(reference_cache.vehicle_type(four_wheeler.id), four_wheeler)
+        self.redis.publish.assert_called_once_with(CHANNEL, "vehicle_types:")
+
+    def test_remote_invalidation_drops_entry(self):
+        reference_cache.garage(self.garage.id)
+        Garage.objects.filter(pk=self.garage.pk).update(garage_name="Renamed elsewhere")
+
+        reference_cache._handle(f"garage:{self.garage.id}".encode())
+
+        self.assertEqual(reference_cache.garage(self.garage.id).garage_name, "Renamed elsewhere")
+
+    def test_invalidation_during_load_is_not_overwritten(self):
+        def load():
+            # Another process publishes while this one is still reading
+            reference_cache._handle("garage:1")
+            return "stale"
+
+        self.assertEqual(reference_cache._get(("garage", 1), load), "stale")
+        self.assertEqual(reference_cache._get(("garage", 1), lambda: "fresh"), "fresh")
+        self.assertEqual(reference_cache._get(("garage", 1), lambda: "newer"), "fresh")
+
+    def test_bypassed_while_unsubscribed(self):
+        reference_cache._subscribed = False
+        reference_cache.garage(self.garage.id)
+        with self.assertNumQueries(1):
+            reference_cache.garage(self.garage.id)
+
+
+class ProjectionTests(TestCase):
+    """List endpoints served from Projection rows return what their serializers would."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(username="owner", password="pass", role="ADMIN")
+        cls.admin = User.objects.create_user(username="root", password="pass", role="SUPER_ADMIN")
+        cls.garage = Garage.objects.create(garage_name="Garage", mobile="9000000000", user=cls.owner)
+        GarageUser.objects.create(user=cls.owner, garage=cls.garage)
+        rahul = Customer.objects.create(
+            garage=cls.garage, name="Rahul Sharma", mobile="9876500001", address="Pune — ✓",
+        )
+        Customer.objects.create(garage=cls.garage, name="Meera Iyer", mobile="9123400002")
+        Vehicle.objects.create(
+            vehicle_number="MH05DU6253", vehicle_model="Swift", vehicle_description="Red",
+            vehicle_type=VehicleType.objects.create(name="Four Wheeler"), customer=rahul, garage=cls.garage,
+        )
+        # No type and no owner: the nullable joins
+        Vehicle.objects.create(vehicle_number="KA01AB1234", vehicle_model="Activa", garage=cls.garage)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def assertMatchesSerializer(self, name, serializer_class, queryset, user):
+        self.client.force_authenticate(user)
+        response = self.client.get(reverse(name))
+        self.assertEqual(response.status_code, 200)
+
+        expected = serializer_class(queryset.order_by("-id"), many=True).data
+        self.assertEqual(len(expected), queryset.count())
+        # Same keys in the same order and the same JSON values
+        self.assertEqual(
+            [list(row.items()) for row in response.json()["data"]],
+            [list(row.items()) for row in json.loads(JSONRenderer().render(expected))],
+        )
+
+    def test_customer_list(self):
+        self.assertMatchesSerializer(
+            "list-customers", CustomerSerializer, Customer.objects.filter(garage=self.garage), self.owner,
+        )
+
+    def test_vehicle_list(self):
+        self.assertMatchesSerializer(
+            "vehicle_list", VehicleSerializer, Vehicle.objects.filter(garage=self.garage), self.owner,
+        )
+
+    def test_user_list(self):
+        self.assertMatchesSerializer("user_list", UserSerializer, User.objects.all(), self.admin)
@@ -1,10 +1,13 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from config.metrics import MetricsView
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("vehicles.urls")),
     path("api/", include("garages.urls")),
     path("api/", include("services.urls")),
     path("api/auth/", include("accounts.urls")),
+    path("api/metrics/", MetricsView.as_view(), name="metrics"),
 ]
\ No newline at end of file
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Garage, Customer, GarageUser
+from .models import Garage, Customer, GarageUser, ImportJob
 
 
 @admin.register(Garage)
@@ -22,3 +22,10 @@ class CustomerAdmin(admin.ModelAdmin):
     list_display = ("name", "mobile", "garage", "created_at")
     search_fields = ("name", "mobile")
     list_filter = ("garage",)
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "garage", "file_name", "status", "total_rows", "created_at", "finished_at")
+    list_filter = ("status", "garage")
+    exclude = ("payload",)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class GaragesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'garages'
+
+    def ready(self):
+        # Garage membership and directory cache invalidation
+        from garages import signals  # noqa: F401
@@ -0,0 +1,365 @@
+import csv
+import json
+import logging
+from datetime import date
+
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils.html import strip_tags
+from django.utils.timezone import now
+
+from garages.models import Customer
+from garages.versions import bump_directory_version, bump_services_version
+from services.models import ServiceRecord
+from services.service_reminder import create_service_reminders
+from vehicles.models import Vehicle, VehicleType
+from vehicles.validators import normalize_vehicle_number, vehicle_number_error
+
+logger = logging.getLogger(__name__)
+
+# Columns understood by the importer (CSV header / JSONL keys). Customer columns are
+# required on every row; vehicle and service columns are optional.
+CUSTOMER_FIELDS = ["customer_name", "mobile", "whatsapp_number", "address"]
+VEHICLE_FIELDS = ["vehicle_number", "vehicle_model", "vehicle_type", "vehicle_description"]
+SERVICE_FIELDS = ["service_date", "service_type", "service_interval_months", "next_service_date", "notes"]
+IMPORT_FIELDS = CUSTOMER_FIELDS + VEHICLE_FIELDS + SERVICE_FIELDS
+
+SERVICE_TYPES = {choice for choice, _ in ServiceRecord.SERVICE_TYPE_CHOICES}
+SERVICE_INTERVALS = (3, 6, 12)
+
+
+class ImportFormatError(ValueError):
+    """The upload is not a CSV/JSONL file the importer can read."""
+
+
+def detect_format(file_name, declared=None):
+    file_format = (declared or file_name.rsplit(".", 1)[-1]).lower()
+    if file_format in ("json", "ndjson"):
+        file_format = "jsonl"
+    if file_format not in ("csv", "jsonl"):
+        raise ImportFormatError("Upload a .csv or .jsonl file (or pass format=csv|jsonl).")
+    return file_format
+
+
+def iter_rows(stream, file_format):
+    """
+    Parse a text stream one row at a time.
+    Yields (row_number, row_dict, parse_error); row numbers match the file
+    (line numbers for JSONL, data rows counted from 2 for CSV).
+    """
+    if file_format == "csv":
+        reader = csv.DictReader(stream)
+        if reader.fieldnames is None:
+            return
+        reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+        for row_number, row in enumerate(reader, start=2):
+            yield row_number, row, None
+        return
+
+    for row_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield row_number, None, f"Invalid JSON: {exc}"
+            continue
+        if not isinstance(row, dict):
+            yield row_number, None, "Each line must be a JSON object."
+            continue
+        yield row_number, {str(key).strip().lower(): value for key, value in row.items()}, None
+
+
+def _clean(value):
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def _parse_date(value):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+class GarageImporter:
+    """
+    Imports customers, vehicles and service records into one garage.
+
+    Rows are validated and written in batches of IMPORT_BATCH_SIZE:
+    - field rules are checked in Python (precompiled vehicle-number rules),
+    - vehicle-number uniqueness is one IN-query per batch,
+    - customers are upserted on (garage, mobile) with one INSERT .. ON CONFLICT,
+    - new vehicles and service records are bulk-inserted and their reminders
+      generated in bulk; history whose next service is already past gets none.
+    Invalid rows are skipped and reported; each batch is written atomically.
+    """
+
+    def __init__(self, garage, batch_size=None):
+        self.garage = garage
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        self.stats = {
+            "rows": 0,
+            "imported": 0,
+            "failed": 0,
+            "customers": 0,
+            "vehicles_created": 0,
+            "service_records": 0,
+            "reminders": 0,
+        }
+        self.errors = []
+        # vehicle_number -> owner mobile, for vehicles seen earlier in this file
+        self._vehicle_owners = {}
+        self._vehicle_types = None
+
+    def run(self, rows):
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self._process_batch(batch)
+                batch = []
+        if batch:
+            self._process_batch(batch)
+        return self.report()
+
+    def report(self):
+        return {"stats": self.stats, "errors": sorted(self.errors, key=lambda error: error["row"])}
+
+    def _fail(self, row_number, errors):
+        self.stats["failed"] += 1
+        self.errors.append({"row": row_number, "errors": errors})
+
+    def _vehicle_type_ids(self):
+        if self._vehicle_types is None:
+            self._vehicle_types = {
+                name.lower(): pk for pk, name in VehicleType.objects.values_list("id", "name")
+            }
+        return self._vehicle_types
+
+    def _validate(self, raw):
+        """Field-level checks that need no database access. Returns (row, errors)."""
+        row = {field: _clean(raw.get(field)) for field in IMPORT_FIELDS}
+        row["_columns"] = set(raw)
+        errors = {}
+
+        row["customer_name"] = strip_tags(row["customer_name"])
+        if not row["customer_name"]:
+            errors["customer_name"] = "This field is required."
+        elif len(row["customer_name"]) > 100:
+            errors["customer_name"] = "Ensure this field has no more than 100 characters."
+
+        if not row["mobile"]:
+            errors["mobile"] = "This field is required."
+        elif len(row["mobile"]) > 15:
+            errors["mobile"] = "Ensure this field has no more than 15 characters."
+        if len(row["whatsapp_number"]) > 15:
+            errors["whatsapp_number"] = "Ensure this field has no more than 15 characters."
+
+        if row["vehicle_number"]:
+            row["vehicle_number"] = normalize_vehicle_number(row["vehicle_number"])
+            error = vehicle_number_error(row["vehicle_number"])
+            if error:
+                errors["vehicle_number"] = error
+            elif len(row["vehicle_number"]) > 50:
+                errors["vehicle_number"] = "Ensure this field has no more than 50 characters."
+        row["vehicle_model"] = strip_tags(row["vehicle_model"])
+        row["vehicle_description"] = strip_tags(row["vehicle_description"])
+        if len(row["vehicle_model"]) > 100:
+            errors["vehicle_model"] = "Ensure this field has no more than 100 characters."
+
+        row["vehicle_type_id"] = None
+        if row["vehicle_type"]:
+            row["vehicle_type_id"] = self._vehicle_type_ids().get(row["vehicle_type"].lower())
+            if row["vehicle_type_id"] is None:
+                errors["vehicle_type"] = f"Unknown vehicle type '{row['vehicle_type']}'."
+
+        if row["service_date"]:
+            self._validate_service(row, errors)
+        elif any(row[field] for field in SERVICE_FIELDS):
+            errors["service_date"] = "Service date is required."
+
+        return row, errors
+
+    def _validate_service(self, row, errors):
+        # Same rules as ServiceRecordSerializer.validate
+        if not row["vehicle_number"]:
+            errors["vehicle_number"] = "Vehicle number is required for a service record."
+
+        service_date = _parse_date(row["service_date"])
+        if service_date is None:
+            errors["service_date"] = "Use YYYY-MM-DD."
+            return
+        row["service_date"] = service_date
+
+        row["service_type"] = row["service_type"].upper() or "PERIODIC"
+        if row["service_type"] not in SERVICE_TYPES:
+            errors["service_type"] = f"Must be one of: {', '.join(sorted(SERVICE_TYPES))}."
+
+        interval, next_date = row["service_interval_months"], row["next_service_date"]
+        if not interval and not next_date:
+            errors["service"] = "Provide either service interval OR next service date."
+        elif interval and next_date:
+            errors["service"] = "Provide either service interval OR next service date, not both."
+        elif interval:
+            if not interval.isdigit() or int(interval) not in SERVICE_INTERVALS:
+                errors["service_interval_months"] = "Service interval must be 3, 6, or 12 months."
+            else:
+                row["service_interval_months"] = int(interval)
+                row["next_service_date"] = service_date + relativedelta(months=int(interval))
+        else:
+            next_date = _parse_date(next_date)
+            if next_date is None:
+                errors["next_service_date"] = "Use YYYY-MM-DD."
+            elif next_date <= service_date:
+                errors["next_service_date"] = "Next service date must be after service date."
+            else:
+                row["service_interval_months"] = None
+                row["next_service_date"] = next_date
+
+    def _process_batch(self, batch):
+        valid = []
+        for row_number, raw, parse_error in batch:
+            self.stats["rows"] += 1
+            if parse_error:
+                self._fail(row_number, {"row": parse_error})
+                continue
+            row, errors = self._validate(raw)
+            if errors:
+                self._fail(row_number, errors)
+            else:
+                valid.append((row_number, row))
+
+        # Uniqueness of vehicle numbers: one IN-query for the whole batch
+        numbers = {row["vehicle_number"] for _, row in valid if row["vehicle_number"]}
+        existing = {
+            number: (vehicle_id, garage_id, owner_mobile)
+            for number, vehicle_id, garage_id, owner_mobile in Vehicle.objects.filter(
+                vehicle_number__in=numbers,
+            ).values_list("vehicle_number", "id", "garage_id", "customer__mobile")
+        }
+
+        rows = []
+        for row_number, row in valid:
+            number = row["vehicle_number"]
+            if number:
+                error = None
+                if number in existing:
+                    _, garage_id, owner_mobile = existing[number]
+                    if garage_id != self.garage.id:
+                        error = "Vehicle number is already registered with another garage."
+                    elif owner_mobile and owner_mobile != row["mobile"]:
+                        error = "Vehicle number is already registered to a different customer."
+                elif number in self._vehicle_owners:
+                    if self._vehicle_owners[number] != row["mobile"]:
+                        error = "Vehicle number appears earlier in the file with a different customer."
+                elif not row["vehicle_model"]:
+                    error = "Vehicle model is required for a new vehicle."
+                if error:
+                    self._fail(row_number, {"vehicle_number": error})
+                    continue
+                self._vehicle_owners.setdefault(number, row["mobile"])
+            rows.append(row)
+
+        if rows:
+            with transaction.atomic():
+                self._write(rows, existing)
+        self.stats["imported"] += len(rows)
+
+    def _write(self, rows, existing):
+        # Customers: upsert on (garage, mobile); the last row for a mobile wins
+        customers = {}
+        columns = set()
+        for row in rows:
+            columns |= row["_columns"]
+            customers[row["mobile"]] = Customer(
+                garage=self.garage,
+                name=row["customer_name"],
+                mobile=row["mobile"],
+                address=row["address"],
+                whatsapp_number=row["whatsapp_number"] or None,
+            )
+        # Only overwrite optional fields the file actually has a column for
+        update_fields = ["name"] + [field for field in ("address", "whatsapp_number") if field in columns]
+        Customer.objects.bulk_create(
+            customers.values(),
+            update_conflicts=True,
+            unique_fields=["garage", "mobile"],
+            update_fields=update_fields,
+        )
+        customer_ids = dict(
+            Customer.objects.filter(garage=self.garage, mobile__in=customers).values_list("mobile", "id")
+        )
+        self.stats["customers"] += len(customers)
+
+        # Vehicles: insert the ones not already in the database
+        vehicle_ids = {number: vehicle_id for number, (vehicle_id, _, _) in existing.items()}
+        new_vehicles = {}
+        for row in rows:
+            number = row["vehicle_number"]
+            if number and number not in vehicle_ids and number not in new_vehicles:
+                new_vehicles[number] = Vehicle(
+                    vehicle_number=number,
+                    vehicle_model=row["vehicle_model"],
+                    vehicle_description=row["vehicle_description"],
+                    vehicle_type_id=row["vehicle_type_id"],
+                    customer_id=customer_ids[row["mobile"]],
+                    garage=self.garage,
+                )
+        for vehicle in Vehicle.objects.bulk_create(new_vehicles.values(), batch_size=self.batch_size):
+            vehicle_ids[vehicle.vehicle_number] = vehicle.id
+        self.stats["vehicles_created"] += len(new_vehicles)
+
+        # Service records, then their reminders in one go
+        records = ServiceRecord.objects.bulk_create(
+            [
+                ServiceRecord(
+                    garage=self.garage,
+                    vehicle_id=vehicle_ids[row["vehicle_number"]],
+                    customer_id=customer_ids[row["mobile"]],
+                    service_type=row["service_type"],
+                    service_date=row["service_date"],
+                    service_interval_months=row["service_interval_months"],
+                    next_service_date=row["next_service_date"],
+                    notes=strip_tags(row["notes"]),
+                )
+                for row in rows
+                if row["service_date"]
+            ],
+            batch_size=self.batch_size,
+        )
+        self.stats["service_records"] += len(records)
+        # Imported history: only services still ahead are worth reminding about
+        today = now().date()
+        self.stats["reminders"] += len(create_service_reminders(
+            [record for record in records if record.next_service_date and record.next_service_date >= today]
+        ))
+        # Bulk writes send no post_save; retire cached search/lookup data here
+        bump_directory_version(self.garage.id)
+        bump_services_version(self.garage.id)
+
+
+def run_import(job, stream):
+    """Process an ImportJob from a text stream and store the report on the job."""
+    job.status = "RUNNING"
+    job.save(update_fields=["status"])
+
+    importer = GarageImporter(job.garage)
+    try:
+        importer.run(iter_rows(stream, job.file_format))
+        job.status = "DONE"
+    except Exception as exc:
+        logger.exception("Import %s failed", job.pk)
+        job.status = "FAILED"
+        job.failure_reason = str(exc)
+
+    report = importer.report()
+    job.total_rows = report["stats"]["rows"]
+    job.stats = report["stats"]
+    job.errors = report["errors"]
+    job.payload = ""
+    job.finished_at = now()
+    job.save(update_fields=["status", "failure_reason", "total_rows", "stats", "errors", "payload", "finished_at"])
+    return job
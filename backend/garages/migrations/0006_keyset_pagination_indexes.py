@@ -0,0 +1,21 @@
+# Generated by Django 5.2.9 on 2026-10-17 21:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garages', '0005_importjob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['garage', '-id'], name='garages_cus_garage__767274_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['garage', 'name', 'id'], name='garages_cus_garage__976e4e_idx'),
+        ),
+    ]
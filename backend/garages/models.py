@@ -81,6 +81,63 @@ class Customer(models.Model):
     class Meta:
         unique_together = ("garage", "mobile")
         ordering = ["-created_at"]
+        indexes = [
+            # keyset pagination of CustomerListView / CustomerDropdownView
+            models.Index(fields=["garage", "-id"]),
+            models.Index(fields=["garage", "name", "id"]),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.mobile}"
+
+
+class ImportJob(models.Model):
+    """
+    A bulk customer/vehicle/service-record upload for one garage.
+    Large files are stored here and processed by garages.tasks.run_import_job;
+    the per-row error report is kept on the job.
+    """
+
+    FORMAT_CHOICES = (
+        ("csv", "CSV"),
+        ("jsonl", "JSON Lines"),
+    )
+
+    STATUS_CHOICES = (
+        ("PENDING", "Pending"),
+        ("RUNNING", "Running"),
+        ("DONE", "Done"),
+        ("FAILED", "Failed"),
+    )
+
+    garage = models.ForeignKey(
+        Garage,
+        on_delete=models.CASCADE,
+        related_name="import_jobs",
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name="import_jobs",
+        null=True,
+        blank=True,
+    )
+
+    file_name = models.CharField(max_length=255, blank=True)
+    file_format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    payload = models.TextField(blank=True, help_text="Uploaded file; cleared once processed")
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="PENDING")
+    total_rows = models.PositiveIntegerField(default=0)
+    stats = models.JSONField(default=dict, blank=True)
+    errors = models.JSONField(default=list, blank=True)
+    failure_reason = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"Import {self.pk} - {self.garage.garage_name} ({self.status})"
@@ -0,0 +1,66 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from garages.models import GarageUser
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def membership_cache_key(user_id):
+    return f"garage-membership:{user_id}"
+
+
+def get_user_garage(user):
+    """
+    Return the user's active garage (newest active membership), or None.
+
+    Looked up with one select_related query and cached for GARAGE_CACHE_TTL
+    seconds; garages.signals drops the entry when the user's memberships or
+    their garage change. Cache errors fall back to the database.
+    """
+    if not getattr(user, "is_authenticated", False):
+        return None
+
+    key = membership_cache_key(user.pk)
+    try:
+        garage = cache.get(key, _MISSING)
+    except Exception as exc:
+        logger.warning("Garage cache unavailable, reading membership from DB: %s", exc)
+        garage = _MISSING
+    if garage is not _MISSING:
+        return garage
+
+    membership = (
+        GarageUser.objects
+        .select_related("garage")
+        .filter(user=user, is_active=True)
+        .first()
+    )
+    garage = membership.garage if membership else None
+    try:
+        cache.set(key, garage, settings.GARAGE_CACHE_TTL)
+    except Exception as exc:
+        logger.warning("Garage cache unavailable, not caching membership: %s", exc)
+    return garage
+
+
+def get_request_garage(request):
+    """
+    The caller's garage, resolved once per request and kept on the request,
+    so permission checks and views share one lookup.
+    """
+    http_request = getattr(request, "_request", request)
+    if not hasattr(http_request, "garage"):
+        http_request.garage = get_user_garage(request.user)
+    return http_request.garage
+
+
+def invalidate_user_garage(*user_ids):
+    try:
+        cache.delete_many([membership_cache_key(user_id) for user_id in user_ids])
+    except Exception as exc:
+        logger.warning("Garage cache unavailable, could not invalidate %s: %s", user_ids, exc)
@@ -1,7 +1,12 @@
 from rest_framework import serializers
+from config.projections import Projection
 from garages.models import Garage, Customer
 
 class CustomerSerializer(serializers.ModelSerializer):
     class Meta:
         model = Customer
         fields = ["id", "name", "mobile", "address"]
+
+
+# CustomerSerializer's output as values() rows
+CUSTOMER_LIST_PROJECTION = Projection(*CustomerSerializer.Meta.fields)
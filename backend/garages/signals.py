@@ -0,0 +1,35 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from config.reference_cache import reference_cache
+from garages.models import Customer, Garage, GarageUser
+from garages.resolver import invalidate_user_garage
+from garages.versions import bump_directory_version
+
+
+@receiver(post_save, sender=GarageUser)
+@receiver(post_delete, sender=GarageUser)
+def drop_membership_cache(sender, instance, **kwargs):
+    invalidate_user_garage(instance.user_id)
+
+
+@receiver(post_save, sender=Garage)
+def drop_member_caches(sender, instance, created, **kwargs):
+    reference_cache.invalidate_garage(instance.pk)
+    # Members have this garage instance cached; a new garage has no members yet
+    if created:
+        return
+    user_ids = list(instance.members.values_list("user_id", flat=True))
+    if user_ids:
+        invalidate_user_garage(*user_ids)
+
+
+@receiver(post_save, sender=Customer)
+@receiver(post_delete, sender=Customer)
+def bump_customer_directory(sender, instance, **kwargs):
+    bump_directory_version(instance.garage_id)
+
+
+@receiver(post_delete, sender=Garage)
+def drop_reference_garage(sender, instance, **kwargs):
+    reference_cache.invalidate_garage(instance.pk)
@@ -0,0 +1,23 @@
+import io
+import logging
+
+from celery import shared_task
+
+from garages.importers import run_import
+from garages.models import ImportJob
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def run_import_job(job_id):
+    """Process an uploaded ImportJob in the background."""
+    # Claim the job so a duplicate delivery does not import the file twice
+    if not ImportJob.objects.filter(pk=job_id, status="PENDING").update(status="RUNNING"):
+        logger.info("Import %s not pending; skipping", job_id)
+        return None
+
+    job = ImportJob.objects.select_related("garage").get(pk=job_id)
+    run_import(job, io.StringIO(job.payload))
+    print(f"[Celery] Import {job.pk} finished: {job.status} {job.stats}")
+    return job.stats
@@ -1,3 +1,231 @@
-from django.test import TestCase
+from datetime import date
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import generics
+from rest_framework.test import APIClient
+
+from config.conditional import ConditionalGetMixin
+
+from garages.models import Customer, Garage, GarageUser, ImportJob
+from garages.resolver import get_user_garage
+from garages.tasks import run_import_job
+from services.models import ServiceRecord, ServiceReminder
+from vehicles.models import Vehicle
+
+User = get_user_model()
+
+HEADER = "customer_name,mobile,vehicle_number,vehicle_model,service_date,service_interval_months\n"
+
+
+class GarageImportTests(TestCase):
+    """Bulk CSV import through garages/import/ (sync and queued)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="owner", password="pass", role="ADMIN")
+        cls.garage = Garage.objects.create(garage_name="Garage", mobile="9000000000", user=cls.user)
+        GarageUser.objects.create(user=cls.user, garage=cls.garage)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def upload(self, body, **data):
+        upload = SimpleUploadedFile("import.csv", body.encode(), content_type="text/csv")
+        return self.client.post(reverse("garage-import"), {"file": upload, **data}, format="multipart")
+
+    def test_valid_csv_creates_customers_vehicles_records_and_reminders(self):
+        today = date.today().isoformat()
+        response = self.upload(
+            HEADER
+            + f"Asha,9876500001,MH12AB1234,Swift,{today},6\n"
+            + f"Ravi,9876500002,MH12AB5678,City,{today},3\n"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        stats = response.json()["data"]["stats"]
+        self.assertEqual(stats["imported"], 2)
+        self.assertEqual(stats["failed"], 0)
+        self.assertEqual(stats["reminders"], 6)
+        self.assertEqual(Customer.objects.filter(garage=self.garage).count(), 2)
+        self.assertEqual(Vehicle.objects.filter(garage=self.garage).count(), 2)
+        self.assertEqual(ServiceRecord.objects.filter(garage=self.garage).count(), 2)
+        self.assertEqual(ServiceReminder.objects.filter(garage=self.garage).count(), 6)
+
+    def test_past_services_get_no_reminders(self):
+        response = self.upload(
+            HEADER
+            + "Asha,9876500001,MH12AB1234,Swift,2023-01-10,6\n"
+            + f"Ravi,9876500002,MH12AB5678,City,{date.today().isoformat()},3\n"
+        )
+
+        stats = response.json()["data"]["stats"]
+        self.assertEqual(stats["service_records"], 2)
+        self.assertEqual(stats["reminders"], 3)
+        self.assertFalse(ServiceReminder.objects.filter(vehicle__vehicle_number="MH12AB1234").exists())
+        self.assertEqual(ServiceReminder.objects.filter(vehicle__vehicle_number="MH12AB5678").count(), 3)
+
+    def test_duplicate_vehicle_numbers_are_reported(self):
+        other_user = User.objects.create_user(username="other", password="pass", role="ADMIN")
+        other_garage = Garage.objects.create(garage_name="Other", mobile="9000000001", user=other_user)
+        Vehicle.objects.create(vehicle_number="MH12ZZ0001", vehicle_model="Swift", garage=other_garage)
+
+        response = self.upload(
+            "customer_name,mobile,vehicle_number,vehicle_model\n"
+            "Asha,9876500001,MH12AB1234,Swift\n"
+            "Ravi,9876500002,MH12AB1234,City\n"
+            "Meera,9876500003,MH12ZZ0001,Swift\n"
+        )
+
+        data = response.json()["data"]
+        self.assertEqual(data["stats"]["imported"], 1)
+        self.assertEqual([error["row"] for error in data["errors"]], [3, 4])
+        self.assertIn("earlier in the file", data["errors"][0]["errors"]["vehicle_number"])
+        self.assertIn("another garage", data["errors"][1]["errors"]["vehicle_number"])
+        self.assertEqual(Vehicle.objects.filter(vehicle_number="MH12AB1234").count(), 1)
+
+    def test_invalid_row_is_skipped_and_reported(self):
+        response = self.upload(
+            HEADER
+            + "Asha,9876500001,MH12AB1234,Swift,2024-01-10,6\n"
+            + ",9876500002,MH12AB5678,City,not-a-date,5\n"
+        )
+
+        data = response.json()["data"]
+        self.assertEqual(data["stats"]["imported"], 1)
+        self.assertEqual(data["stats"]["failed"], 1)
+        errors = data["errors"][0]
+        self.assertEqual(errors["row"], 3)
+        self.assertIn("customer_name", errors["errors"])
+        self.assertIn("service_date", errors["errors"])
+        self.assertFalse(Customer.objects.filter(mobile="9876500002").exists())
+
+    def test_async_import_is_queued_and_processed_by_the_task(self):
+        with mock.patch("garages.views.import_views.run_import_job.delay") as delay:
+            response = self.upload(HEADER + "Asha,9876500001,MH12AB1234,Swift,2024-01-10,6\n", **{"async": "true"})
+
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()["data"]["job_id"]
+        delay.assert_called_once_with(job_id)
+        self.assertEqual(ImportJob.objects.get(pk=job_id).status, "PENDING")
+
+        run_import_job(job_id)
+        # A duplicate delivery finds the job claimed and does nothing
+        self.assertIsNone(run_import_job(job_id))
+
+        job = ImportJob.objects.get(pk=job_id)
+        self.assertEqual(job.status, "DONE")
+        self.assertEqual(job.stats["imported"], 1)
+        self.assertEqual(job.payload, "")
+        detail = self.client.get(reverse("garage-import-detail", args=[job_id])).json()["data"]
+        self.assertEqual(detail["status"], "DONE")
+        self.assertEqual(Vehicle.objects.filter(vehicle_number="MH12AB1234").count(), 1)
+
+    @override_settings(IMPORT_MAX_BYTES=64)
+    def test_oversized_upload_is_rejected(self):
+        response = self.upload(HEADER + "Asha,9876500001,MH12AB1234,Swift,2024-01-10,6\n")
+
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(response.json()["success"])
+        self.assertFalse(ImportJob.objects.exists())
+
+
+class CustomerDropdownETagTests(TestCase):
+    """garages/customers/dropdown revalidates with ETag / If-None-Match."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="owner", password="pass", role="ADMIN")
+        cls.garage = Garage.objects.create(garage_name="Garage", mobile="9000000000", user=cls.user)
+        GarageUser.objects.create(user=cls.user, garage=cls.garage)
+        Customer.objects.create(garage=cls.garage, name="Asha", mobile="9876500001")
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse("customer-dropdown")
+
+    def test_unchanged_list_is_not_modified(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 1)
+        etag = response["ETag"]
+        self.assertIn("no-cache", response["Cache-Control"])
+
+        # Answered from the version token alone, before the customer query
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_customer_change_retires_the_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Customer.objects.create(garage=self.garage, name="Ravi", mobile="9876500002")
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 2)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_view_without_versions_is_rejected(self):
+        with self.assertRaises(TypeError):
+            type("UnversionedView", (ConditionalGetMixin, generics.ListAPIView), {})
+
+
+class GarageResolverTests(TestCase):
+    """get_user_garage() caches the membership; garages.signals drops it on change."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="owner", password="pass", role="ADMIN")
+        cls.garage = Garage.objects.create(garage_name="Garage", mobile="9000000000", user=cls.user)
+        cls.membership = GarageUser.objects.create(user=cls.user, garage=cls.garage)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_membership_is_cached(self):
+        self.assertEqual(get_user_garage(self.user), self.garage)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_garage(self.user), self.garage)
+
+    def test_garage_change_reaches_its_members(self):
+        get_user_garage(self.user)
+
+        self.garage.garage_name = "Renamed"
+        self.garage.save()
+
+        self.assertEqual(get_user_garage(self.user).garage_name, "Renamed")
+
+    def test_deactivated_membership_is_dropped(self):
+        get_user_garage(self.user)
+
+        self.membership.is_active = False
+        self.membership.save()
+
+        self.assertIsNone(get_user_garage(self.user))
+
+    def test_new_and_removed_memberships(self):
+        member = User.objects.create_user(username="staff", password="pass", role="ADMIN")
+        self.assertIsNone(get_user_garage(member))
+
+        membership = GarageUser.objects.create(user=member, garage=self.garage)
+        self.assertEqual(get_user_garage(member), self.garage)
+
+        membership.delete()
+        self.assertIsNone(get_user_garage(member))
+
+    def test_cache_outage_reads_the_database(self):
+        with mock.patch("garages.resolver.cache") as broken:
+            broken.get.side_effect = ConnectionError("down")
+            broken.set.side_effect = ConnectionError("down")
+            self.assertEqual(get_user_garage(self.user), self.garage)
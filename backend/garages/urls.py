@@ -1,11 +1,15 @@
 from django.urls import path
 from accounts.views import UserListView
 from garages.views.create_garage_views import CreateGarageView
-from garages.views.create_customer_views import CustomerCreateView, CustomerListView
+from garages.views.create_customer_views import CustomerCreateView, CustomerDropdownView, CustomerListView
+from garages.views.import_views import ImportView, ImportJobDetailView
 
 urlpatterns = [
     path("garages/create/", CreateGarageView.as_view(), name="create-garage"),
     path("garages/customers/create/", CustomerCreateView.as_view(), name="create-customer"),
     path("garages/customers", CustomerListView.as_view(), name="list-customers"),
+    path("garages/customers/dropdown", CustomerDropdownView.as_view(), name="customer-dropdown"),
+    path("garages/import/", ImportView.as_view(), name="garage-import"),
+    path("garages/import/<int:pk>/", ImportJobDetailView.as_view(), name="garage-import-detail"),
     path("users/", UserListView.as_view(), name="user_list"),    
     ]
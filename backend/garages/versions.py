@@ -0,0 +1,82 @@
+import logging
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+# Version names: a garage's customers + vehicles, its service records, every
+# garage's customers + vehicles (super-admin views), and the vehicle types
+ALL_GARAGES = "all"
+VEHICLE_TYPES = "vehicle-types"
+
+
+def directory_version(garage_id):
+    return f"directory:{garage_id if garage_id is not None else ALL_GARAGES}"
+
+
+def services_version(garage_id):
+    return f"services:{garage_id}"
+
+
+def version_key(name):
+    return f"data-version:{name}"
+
+
+def get_versions(*names):
+    """
+    Tokens identifying the current state of some data (see the names above).
+
+    Caches and ETags of that data put the tokens in their key, so
+    bump_versions() retires all of them with one write. Returns None when
+    the cache is unavailable; callers should then skip caching.
+    """
+    keys = [version_key(name) for name in names]
+    try:
+        versions = cache.get_many(keys)
+        missing = {key: _new_version() for key in keys if key not in versions}
+        if missing:
+            # add() so concurrent first readers agree on one token
+            for key, version in missing.items():
+                cache.add(key, version, None)
+            versions.update(cache.get_many(list(missing)))
+        return tuple(versions[key] for key in keys)
+    except Exception as exc:
+        logger.warning("Data versions unavailable for %s: %s", names, exc)
+        return None
+
+
+def get_directory_version(garage_id):
+    versions = get_versions(directory_version(garage_id))
+    return versions[0] if versions else None
+
+
+def bump_versions(*names):
+    """Rotate these versions once the current transaction commits."""
+    names = set(names)
+    if names:
+        transaction.on_commit(lambda: _set_versions(names))
+
+
+def bump_directory_version(*garage_ids):
+    """A garage's customers or vehicles changed."""
+    garage_ids = {garage_id for garage_id in garage_ids if garage_id is not None}
+    if garage_ids:
+        bump_versions(directory_version(None), *(directory_version(garage_id) for garage_id in garage_ids))
+
+
+def bump_services_version(*garage_ids):
+    """A garage's service records changed."""
+    bump_versions(*(services_version(garage_id) for garage_id in garage_ids if garage_id is not None))
+
+
+def _new_version():
+    return uuid.uuid4().hex
+
+
+def _set_versions(names):
+    try:
+        cache.set_many({version_key(name): _new_version() for name in names}, None)
+    except Exception as exc:
+        logger.warning("Could not bump data versions %s: %s", names, exc)
@@ -6,21 +6,19 @@ from rest_framework.response import Response
 
 from django.contrib.auth import get_user_model
 
-from garages.models import Garage, Customer, GarageUser
+from garages.models import Garage, Customer
+from garages.resolver import get_request_garage
 from garages.serializers.Garages_serializers import GarageSerializer
-from garages.serializers.Customer_serializer import CustomerSerializer
+from garages.serializers.Customer_serializer import CUSTOMER_LIST_PROJECTION, CustomerSerializer
 from accounts.permissions import SuperAdminOnly
+from config.conditional import ConditionalGetMixin
+from config.pagination import InvalidCursor, KeysetPagination
+from garages.versions import directory_version, get_versions
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
 
-def get_user_garage(user):
-    """Helper to get user's active garage from GarageUser"""
-    membership = GarageUser.objects.filter(user=user, is_active=True).first()
-    return membership.garage if membership else None
-
-
 class CustomerCreateView(generics.CreateAPIView):
     serializer_class = CustomerSerializer
     permission_classes = [IsAuthenticated]
@@ -28,7 +26,7 @@ class CustomerCreateView(generics.CreateAPIView):
     def create(self, request, *args, **kwargs):
         try:
             user = request.user
-            garage = get_user_garage(user)
+            garage = get_request_garage(request)
 
             if not garage:
                 # Allow super-admins to pass a garage_id
@@ -76,6 +74,8 @@ class CustomerCreateView(generics.CreateAPIView):
 class CustomerListView(generics.ListAPIView):
     serializer_class = CustomerSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    ordering = ("-id",)
 
     def list(self, request, *args, **kwargs):
         try:
@@ -85,7 +85,7 @@ class CustomerListView(generics.ListAPIView):
             if user.is_super_admin():
                 queryset = Customer.objects.all().order_by("-id")
             else:
-                garage = get_user_garage(user)
+                garage = get_request_garage(request)
                 if not garage:
                     return Response(
                         {"success": False, "error": "Only garage members can view customers"},
@@ -93,14 +93,11 @@ class CustomerListView(generics.ListAPIView):
                     )
                 queryset = Customer.objects.filter(garage=garage).order_by("-id")
 
-            serializer = self.get_serializer(queryset, many=True)
-
-            return Response({
-                "success": True,
-                "count": queryset.count(),
-                "data": serializer.data
-            }, status=status.HTTP_200_OK)
+            page = self.paginate_queryset(CUSTOMER_LIST_PROJECTION.project(queryset))
+            return self.get_paginated_response(CUSTOMER_LIST_PROJECTION.serialize(page))
 
+        except InvalidCursor as exc:
+            return Response({"success": False, "error": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as exc:
             logger.exception("Customer list fetch failed")
             return Response(
@@ -109,10 +106,22 @@ class CustomerListView(generics.ListAPIView):
             )
 
 
-class CustomerDropdownView(generics.ListAPIView):
-    """Lightweight endpoint for customer dropdowns - returns only id and name"""
+class CustomerDropdownView(ConditionalGetMixin, generics.ListAPIView):
+    """
+    Lightweight endpoint for customer dropdowns - returns only id and name.
+    ETag follows the garage's customer/vehicle version, so unchanged
+    dropdowns revalidate with a 304.
+    """
     permission_classes = [IsAuthenticated]
 
+    def get_etag_versions(self, request):
+        if request.user.is_super_admin():
+            return get_versions(directory_version(None))
+        garage = get_request_garage(request)
+        if not garage:
+            return None
+        return get_versions(directory_version(garage.id))
+
     def list(self, request, *args, **kwargs):
         try:
             user = request.user
@@ -120,7 +129,7 @@ class CustomerDropdownView(generics.ListAPIView):
             if user.is_super_admin():
                 queryset = Customer.objects.all().order_by("name")
             else:
-                garage = get_user_garage(user)
+                garage = get_request_garage(request)
                 if not garage:
                     return Response(
                         {"success": False, "error": "Only garage members can view customers"},
@@ -128,7 +137,8 @@ class CustomerDropdownView(generics.ListAPIView):
                     )
                 queryset = Customer.objects.filter(garage=garage).order_by("name")
 
-            # Return only id and name for dropdown efficiency
+            # Return only id and name for dropdown efficiency; the dropdown
+            # needs every customer, so this list is not paginated
             data = list(queryset.values("id", "name"))
 
             return Response({
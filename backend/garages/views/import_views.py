@@ -0,0 +1,146 @@
+import io
+import logging
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+
+from accounts.permissions import AdminAccess
+from garages.importers import ImportFormatError, detect_format, run_import
+from garages.models import Garage, ImportJob
+from garages.resolver import get_request_garage
+from garages.tasks import run_import_job
+
+logger = logging.getLogger(__name__)
+
+
+def _job_data(job):
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "file_name": job.file_name,
+        "total_rows": job.total_rows,
+        "stats": job.stats,
+        "errors": job.errors,
+        "failure_reason": job.failure_reason,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+    }
+
+
+class ImportView(APIView):
+    """
+    Bulk import of customers, vehicles and service records from a CSV or
+    JSONL upload (multipart field "file") of at most IMPORT_MAX_BYTES.
+    Small files are imported in the request; files over
+    IMPORT_SYNC_MAX_BYTES, or any file posted with async=true, are queued
+    and can be polled on ImportJobDetailView.
+    """
+    permission_classes = [AdminAccess]
+
+    def post(self, request, *args, **kwargs):
+        user = request.user
+        garage = get_request_garage(request)
+
+        if not garage:
+            if not user.is_super_admin():
+                return Response(
+                    {"success": False, "error": "Only garage members can import data"},
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+            garage_id = request.data.get("garage_id")
+            if not garage_id:
+                return Response(
+                    {"success": False, "error": "Garage is required"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            garage = Garage.objects.filter(pk=garage_id).first()
+            if not garage:
+                return Response(
+                    {"success": False, "error": "Garage not found"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        upload = request.FILES.get("file")
+        if not upload:
+            return Response(
+                {"success": False, "error": "Upload a file in the 'file' field"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if upload.size > settings.IMPORT_MAX_BYTES:
+            return Response(
+                {
+                    "success": False,
+                    "error": f"File is too large (limit {settings.IMPORT_MAX_BYTES} bytes); split it into smaller files",
+                },
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+
+        try:
+            file_format = detect_format(upload.name, request.data.get("format"))
+        except ImportFormatError as exc:
+            return Response({"success": False, "error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        run_async = str(request.data.get("async", "")).lower() in ("1", "true")
+        if upload.size > settings.IMPORT_SYNC_MAX_BYTES:
+            run_async = True
+
+        job = ImportJob(garage=garage, created_by=user, file_name=upload.name[:255], file_format=file_format)
+
+        try:
+            if run_async:
+                # The worker may run on another host, so the file travels with the job
+                job.payload = upload.read().decode("utf-8-sig")
+                job.save()
+                run_import_job.delay(job.id)
+                return Response(
+                    {"success": True, "message": "Import queued", "data": _job_data(job)},
+                    status=status.HTTP_202_ACCEPTED,
+                )
+
+            job.save()
+            run_import(job, io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline=""))
+        except UnicodeDecodeError:
+            return Response(
+                {"success": False, "error": "File must be UTF-8 encoded"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if job.status == "FAILED":
+            return Response(
+                {"success": False, "error": "Import failed", "details": job.failure_reason, "data": _job_data(job)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        return Response(
+            {"success": True, "message": "Import finished", "data": _job_data(job)},
+            status=status.HTTP_200_OK,
+        )
+
+
+class ImportJobDetailView(APIView):
+    """Status and per-row error report of an import job."""
+    permission_classes = [AdminAccess]
+
+    def get(self, request, pk, *args, **kwargs):
+        user = request.user
+        jobs = ImportJob.objects.defer("payload")
+        if not user.is_super_admin():
+            garage = get_request_garage(request)
+            if not garage:
+                return Response(
+                    {"success": False, "error": "Only garage members can view imports"},
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+            jobs = jobs.filter(garage=garage)
+
+        job = jobs.filter(pk=pk).first()
+        if not job:
+            return Response(
+                {"success": False, "error": "Import not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return Response({"success": True, "data": _job_data(job)}, status=status.HTTP_200_OK)
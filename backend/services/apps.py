@@ -4,3 +4,7 @@ from django.apps import AppConfig # type: ignore
 class ServicesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'services'
+
+    def ready(self):
+        # Check-in lookup cache invalidation
+        from services import signals  # noqa: F401
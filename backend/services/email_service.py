@@ -1,12 +1,103 @@
-from django.core.mail import send_mail
+import logging
+import os
+import smtplib
+import threading
+from collections import namedtuple
+
+from django.core.mail import EmailMultiAlternatives, get_connection
 from django.conf import settings
+from django.utils.html import strip_tags
 
+logger = logging.getLogger(__name__)
 
-def send_email_reminder(to_email, subject, message):
-    send_mail(
+# Outcome of one message sent through send_email_reminders_batch
+EmailSendResult = namedtuple("EmailSendResult", ["key", "sent", "error"])
+
+# Errors after which the SMTP session is dropped and re-opened once
+RECONNECT_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, TimeoutError)
+
+_connection = None
+_connection_pid = None
+_connection_lock = threading.Lock()
+
+
+def get_email_connection():
+    """
+    Return the per-process email backend connection.
+
+    The connection is opened on first use and kept open across tasks, so a
+    worker pays the SMTP handshake once instead of once per reminder. It is
+    re-created after a fork (Celery prefork) and re-opened on failure.
+    """
+    global _connection, _connection_pid
+    pid = os.getpid()
+    if _connection is None or _connection_pid != pid:
+        with _connection_lock:
+            if _connection is None or _connection_pid != pid:
+                _connection = get_connection(fail_silently=False)
+                _connection_pid = pid
+    return _connection
+
+
+def build_reminder_email(to_email, subject, html_message, connection=None):
+    """Multipart message: plain-text body plus the HTML version as an alternative."""
+    stripped = strip_tags(html_message)
+    is_html = stripped != html_message
+    if is_html:
+        # keep the text part readable: drop template indentation and empty lines
+        text_message = "\n".join(filter(None, (line.strip() for line in stripped.splitlines())))
+    else:
+        text_message = html_message
+    email = EmailMultiAlternatives(
         subject=subject,
-        message=message,
+        body=text_message,
         from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[to_email],
-        fail_silently=False,
+        to=[to_email],
+        connection=connection,
     )
+    if is_html:
+        email.attach_alternative(html_message, "text/html")
+    return email
+
+
+def _send_with_reconnect(connection, email):
+    try:
+        # open() is a no-op while the session is alive, and keeps send_messages
+        # from closing the connection after sending
+        connection.open()
+        connection.send_messages([email])
+    except RECONNECT_ERRORS as exc:
+        logger.warning("SMTP connection lost (%s); reconnecting", exc)
+        try:
+            connection.close()
+        except Exception:
+            pass
+        connection.open()
+        connection.send_messages([email])
+
+
+def send_email_reminders_batch(messages):
+    """
+    Send many reminder emails over one reused backend connection.
+
+    `messages` is an iterable of (key, to_email, subject, html_message).
+    Returns one EmailSendResult per message, in input order.
+    """
+    results = []
+    connection = None
+    for key, to_email, subject, html_message in messages:
+        if connection is None:
+            connection = get_email_connection()
+        try:
+            _send_with_reconnect(connection, build_reminder_email(to_email, subject, html_message, connection))
+            results.append(EmailSendResult(key, True, None))
+        except Exception as exc:
+            logger.warning("Email to %s failed: %s", to_email, exc)
+            results.append(EmailSendResult(key, False, exc))
+    return results
+
+
+def send_email_reminder(to_email, subject, message):
+    result, = send_email_reminders_batch([(None, to_email, subject, message)])
+    if result.error is not None:
+        raise result.error
@@ -0,0 +1,109 @@
+import json
+import time
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from io import BytesIO
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from config.renderers import ORJSONParser, ORJSONRenderer
+
+STATUSES = ("PENDING", "PROCESSING", "SENT", "FAILED")
+
+
+def service_list_page(rows):
+    """
+    A service list response body (see ServiceRecordSerializer) with nested
+    reminders, plus the raw date/datetime/Decimal values that values()-based
+    views hand to the renderer unformatted.
+    """
+    today = date(2026, 1, 1)
+    created = datetime(2026, 1, 1, 9, 30, 15, 123456, tzinfo=timezone.utc)
+    data = []
+    for i in range(rows):
+        service_date = today - timedelta(days=i % 365)
+        reminders = [
+            {
+                "id": i * 4 + n,
+                "reminder_day": day,
+                "reminder_day_display": f"{day} days before",
+                "scheduled_for": (service_date + timedelta(days=180 - day)).isoformat(),
+                "channel": "WHATSAPP",
+                "channel_display": "WhatsApp",
+                "status": STATUSES[(i + n) % 4],
+                "status_display": STATUSES[(i + n) % 4].title(),
+                "sent_at": (created + timedelta(minutes=n)).isoformat().replace("+00:00", "Z"),
+                "sent_via": "WHATSAPP",
+            }
+            for n, day in enumerate((7, 3, 1, 0))
+        ]
+        data.append({
+            "id": i,
+            "vehicle_number": f"MH05DU{i:04d}",
+            "vehicle_model": "Swift Dzire",
+            "customer_name": f"Customer {i} Deshmukh",
+            "service_type": "General service",
+            "service_date": service_date.isoformat(),
+            "service_interval_months": 6,
+            "next_service_date": (service_date + timedelta(days=180)).isoformat(),
+            "notes": "Oil change, brake pads — checked ✓",
+            "reminder_status": "PENDING",
+            "reminders": reminders,
+            "reminder_summary": {"total": 4, "pending": 1, "processing": 1, "sent": 1, "failed": 1,
+                                 "next_scheduled": reminders[0]["scheduled_for"]},
+            "created_at": created + timedelta(seconds=i),
+            "last_service_date": service_date,
+            "amount": Decimal("1499.50"),
+        })
+    return {"success": True, "count": rows, "data": data, "next_cursor": "eyJwIjpbMV19", "has_more": True}
+
+
+def best_of(fn, iterations, repeat=5):
+    """Best mean seconds per call over `repeat` runs of `iterations` calls."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        elapsed = (time.perf_counter() - start) / iterations
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+class Command(BaseCommand):
+    help = "Compare DRF's JSONRenderer/JSONParser with the orjson ones on a service list page."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=500, help="Service records in the page (default 500).")
+        parser.add_argument("--iterations", type=int, default=50, help="Renders per timing run (default 50).")
+
+    def handle(self, *args, **options):
+        rows, iterations = options["rows"], options["iterations"]
+        if rows < 1 or iterations < 1:
+            raise CommandError("--rows and --iterations must be positive.")
+
+        payload = service_list_page(rows)
+        context = {"encoding": "utf-8"}
+        stdlib, fast = JSONRenderer(), ORJSONRenderer()
+        body = stdlib.render(payload)
+        # Compared parsed: the two may spell the same float differently
+        if json.loads(fast.render(payload)) != json.loads(body):
+            raise CommandError("ORJSONRenderer output differs from JSONRenderer.")
+        if ORJSONParser().parse(BytesIO(body), parser_context=context) != JSONParser().parse(
+            BytesIO(body), parser_context=context
+        ):
+            raise CommandError("ORJSONParser result differs from JSONParser.")
+
+        results = [
+            ("render", best_of(lambda: stdlib.render(payload), iterations),
+             best_of(lambda: fast.render(payload), iterations)),
+            ("parse", best_of(lambda: JSONParser().parse(BytesIO(body), parser_context=context), iterations),
+             best_of(lambda: ORJSONParser().parse(BytesIO(body), parser_context=context), iterations)),
+        ]
+        self.stdout.write(f"{rows} rows, {len(body) / 1024:.0f} KiB; outputs equivalent")
+        for name, slow, quick in results:
+            self.stdout.write(
+                f"{name:<7} json {slow * 1000:8.2f} ms   orjson {quick * 1000:8.2f} ms   {slow / quick:5.1f}x"
+            )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from services.reminder_stats import rebuild_reminder_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the daily reminder statistics rollup from service_reminders."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--garage",
+            type=int,
+            action="append",
+            dest="garage_ids",
+            help="Only rebuild this garage (repeatable). Defaults to all garages.",
+        )
+
+    def handle(self, *args, **options):
+        rows = rebuild_reminder_stats(options["garage_ids"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt reminder stats: {rows} rollup rows."))
@@ -5,11 +5,19 @@ from celery_app.schedulers import trigger_due_service_reminders
 class Command(BaseCommand):
     help = "Run the service reminders scheduler once (for testing)."
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Reminders per batch task (defaults to SERVICE_REMINDER_BATCH_SIZE).",
+        )
+
     def handle(self, *args, **options):
         self.stdout.write("[Management] Running trigger_due_service_reminders()...")
         try:
             # Call the scheduler function synchronously so you can test without celery-beat
-            trigger_due_service_reminders()
+            trigger_due_service_reminders(batch_size=options["batch_size"])
             self.stdout.write(self.style.SUCCESS("Scheduler executed successfully."))
         except Exception as exc:
             self.stderr.write(self.style.ERROR(f"Scheduler execution failed: {exc}"))
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.9 on 2026-10-17 21:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garages', '0004_customer_whatsapp_number'),
+        ('services', '0003_servicereminder_sent_via'),
+        ('vehicles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='servicereminder',
+            name='lease_expires_at',
+            field=models.DateTimeField(blank=True, help_text='PROCESSING claim expiry; expired claims are re-queued by the reaper', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='servicereminder',
+            index=models.Index(fields=['status', 'lease_expires_at'], name='service_rem_status_e690c0_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.9 on 2026-10-17 21:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garages', '0006_keyset_pagination_indexes'),
+        ('services', '0004_servicereminder_lease_expires_at_and_more'),
+        ('vehicles', '0002_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='servicerecord',
+            index=models.Index(fields=['garage', '-service_date', 'id'], name='services_se_garage__4aa602_idx'),
+        ),
+    ]
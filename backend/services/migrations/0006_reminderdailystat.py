@@ -0,0 +1,58 @@
+# Generated by Django 5.2.9 on 2026-10-17 21:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F
+
+
+def populate_reminder_stats(apps, schema_editor):
+    ServiceReminder = apps.get_model("services", "ServiceReminder")
+    ReminderDailyStat = apps.get_model("services", "ReminderDailyStat")
+    rows = (
+        ServiceReminder.objects
+        .values("scheduled_for", "channel", "reminder_day", "status", stat_garage_id=F("service_record__garage_id"))
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    ReminderDailyStat.objects.bulk_create(
+        [
+            ReminderDailyStat(
+                garage_id=row["stat_garage_id"],
+                date=row["scheduled_for"],
+                channel=row["channel"],
+                reminder_day=row["reminder_day"],
+                status=row["status"],
+                count=row["count"],
+            )
+            for row in rows.iterator(chunk_size=1000)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garages', '0006_keyset_pagination_indexes'),
+        ('services', '0005_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(help_text="Reminders' scheduled_for date")),
+                ('channel', models.CharField(choices=[('WHATSAPP', 'WhatsApp'), ('EMAIL', 'Email'), ('BOTH', 'WhatsApp + Email')], max_length=20)),
+                ('reminder_day', models.PositiveSmallIntegerField(choices=[(7, '7 Days Before'), (3, '3 Days Before'), (1, '1 Day Before')])),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('PROCESSING', 'Processing'), ('SENT', 'Sent'), ('FAILED', 'Failed')], max_length=15)),
+                ('count', models.IntegerField(default=0)),
+                ('garage', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminder_stats', to='garages.garage')),
+            ],
+            options={
+                'db_table': 'reminder_daily_stats',
+                'constraints': [models.UniqueConstraint(fields=('garage', 'date', 'channel', 'reminder_day', 'status'), name='reminder_daily_stat_key')],
+            },
+        ),
+        migrations.RunPython(populate_reminder_stats, migrations.RunPython.noop),
+    ]
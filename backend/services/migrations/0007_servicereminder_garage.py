@@ -0,0 +1,20 @@
+# Generated by Django 5.2.9 on 2026-10-17 21:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garages', '0006_keyset_pagination_indexes'),
+        ('services', '0006_reminderdailystat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='servicereminder',
+            name='garage',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='service_reminders', to='garages.garage'),
+        ),
+    ]
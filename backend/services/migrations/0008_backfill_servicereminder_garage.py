@@ -0,0 +1,38 @@
+from django.db import migrations, transaction
+from django.db.models import OuterRef, Subquery
+
+# Reminders updated per transaction; the migration is not atomic, so each
+# batch commits and releases its row locks before the next one
+BATCH_SIZE = 10000
+
+
+def backfill_reminder_garage(apps, schema_editor):
+    ServiceRecord = apps.get_model("services", "ServiceRecord")
+    ServiceReminder = apps.get_model("services", "ServiceReminder")
+    garage_of_record = ServiceRecord.objects.filter(pk=OuterRef("service_record_id")).values("garage_id")[:1]
+
+    last_id = 0
+    while True:
+        ids = list(
+            ServiceReminder.objects
+            .filter(garage__isnull=True, id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:BATCH_SIZE]
+        )
+        if not ids:
+            break
+        with transaction.atomic():
+            ServiceReminder.objects.filter(id__in=ids).update(garage_id=Subquery(garage_of_record))
+        last_id = ids[-1]
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('services', '0007_servicereminder_garage'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_reminder_garage, migrations.RunPython.noop),
+    ]
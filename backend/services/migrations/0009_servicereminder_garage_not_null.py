@@ -0,0 +1,25 @@
+# Generated by Django 5.2.9 on 2026-10-17 21:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garages', '0006_keyset_pagination_indexes'),
+        ('services', '0008_backfill_servicereminder_garage'),
+        ('vehicles', '0002_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='servicereminder',
+            name='garage',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='service_reminders', to='garages.garage'),
+        ),
+        migrations.AddIndex(
+            model_name='servicereminder',
+            index=models.Index(fields=['garage', 'scheduled_for', 'status'], name='service_rem_garage__2a14e2_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.9 on 2026-10-17 21:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garages', '0006_keyset_pagination_indexes'),
+        ('services', '0009_servicereminder_garage_not_null'),
+        ('vehicles', '0003_trigram_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='servicerecord',
+            index=models.Index(fields=['vehicle', '-service_date', '-id'], name='services_se_vehicle_c9852f_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-17 21:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0010_servicerecord_vehicle_latest_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='servicereminder',
+            name='not_before',
+            field=models.DateTimeField(blank=True, help_text='Released for a delayed retry / rate-limit deferral; the dispatcher skips it until then', null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-17 22:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0011_servicereminder_not_before'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='reminderdailystat',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('PROCESSING', 'Processing'), ('SENT', 'Sent'), ('FAILED', 'Failed'), ('EXPIRED', 'Expired')], max_length=15),
+        ),
+        migrations.AlterField(
+            model_name='servicereminder',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('PROCESSING', 'Processing'), ('SENT', 'Sent'), ('FAILED', 'Failed'), ('EXPIRED', 'Expired')], default='PENDING', max_length=15),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-17 22:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0012_servicereminder_expired_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='servicereminder',
+            name='claim_token',
+            field=models.CharField(blank=True, help_text='Identifies the current claim; a task only takes the reminder while it still holds it', max_length=32, null=True),
+        ),
+    ]
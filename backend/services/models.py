@@ -2,6 +2,7 @@ from datetime import timedelta, timezone
 from django.db import models # type: ignore
 from garages.models import Garage, Customer
 from vehicles.models import Vehicle
+from services.reminder_events import reminders_transitioned, transition
 
 class ServiceRecord(models.Model):
 
@@ -50,6 +51,14 @@ class ServiceRecord(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # keyset pagination of ServiceListView
+            models.Index(fields=["garage", "-service_date", "id"]),
+            # a vehicle's latest service (check-in lookup)
+            models.Index(fields=["vehicle", "-service_date", "-id"]),
+        ]
+
     def save(self, *args, **kwargs):
         """
         Priority:
@@ -83,6 +92,7 @@ class ServiceReminder(models.Model):
         ("PROCESSING", "Processing"),
         ("SENT", "Sent"),
         ("FAILED", "Failed"),
+        ("EXPIRED", "Expired"),
     )
 
     service_record = models.ForeignKey(
@@ -91,6 +101,13 @@ class ServiceReminder(models.Model):
         related_name="reminders",
     )
 
+    # Copy of service_record.garage, so garage-scoped queries need no join
+    garage = models.ForeignKey(
+        Garage,
+        on_delete=models.CASCADE,
+        related_name="service_reminders",
+    )
+
     vehicle = models.ForeignKey(
         Vehicle,
         on_delete=models.CASCADE,
@@ -148,6 +165,25 @@ class ServiceReminder(models.Model):
         help_text="Channels that actually succeeded (e.g., 'WHATSAPP', 'EMAIL', 'WHATSAPP,EMAIL')",
     )
 
+    lease_expires_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="PROCESSING claim expiry; expired claims are re-queued by the reaper",
+    )
+
+    claim_token = models.CharField(
+        max_length=32,
+        null=True,
+        blank=True,
+        help_text="Identifies the current claim; a task only takes the reminder while it still holds it",
+    )
+
+    not_before = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Released for a delayed retry / rate-limit deferral; the dispatcher skips it until then",
+    )
+
     created_at = models.DateTimeField(
         auto_now_add=True,
     )
@@ -161,18 +197,74 @@ class ServiceReminder(models.Model):
         unique_together = ("service_record", "reminder_day")
         indexes = [
             models.Index(fields=["scheduled_for", "status"]),
+            models.Index(fields=["status", "lease_expires_at"]),
+            # Garage-scoped dashboards (upcoming reminders, summary rebuilds)
+            models.Index(fields=["garage", "scheduled_for", "status"]),
         ]
 
     def mark_sent(self, provider_message_id=None):
+        old_status = self.status
         self.status = "SENT"
         self.sent_at = timezone.now()
         self.provider_message_id = provider_message_id
         self.save(update_fields=["status", "sent_at", "provider_message_id"])
+        reminders_transitioned([transition(self, old_status)])
 
     def mark_failed(self, reason: str):
+        old_status = self.status
         self.status = "FAILED"
         self.failure_reason = reason
         self.save(update_fields=["status", "failure_reason"])
+        reminders_transitioned([transition(self, old_status)])
 
     def __str__(self):
         return f"ServiceReminder(service={self.service_record_id}, day={self.reminder_day})"
+
+
+class ReminderDailyStat(models.Model):
+    """
+    Reminder counts per garage, scheduled date, channel, reminder day and
+    status. Kept in step with service_reminders by
+    services.reminder_events.reminders_transitioned(), so dashboards sum a
+    few rollup rows instead of scanning reminders; rebuilt from scratch with
+    `manage.py rebuild_reminder_stats`.
+    """
+
+    garage = models.ForeignKey(
+        Garage,
+        on_delete=models.CASCADE,
+        related_name="reminder_stats",
+    )
+
+    date = models.DateField(
+        help_text="Reminders' scheduled_for date",
+    )
+
+    channel = models.CharField(
+        max_length=20,
+        choices=ServiceReminder.CHANNEL_CHOICES,
+    )
+
+    reminder_day = models.PositiveSmallIntegerField(
+        choices=ServiceReminder.REMINDER_DAY_CHOICES,
+    )
+
+    status = models.CharField(
+        max_length=15,
+        choices=ServiceReminder.STATUS_CHOICES,
+    )
+
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "reminder_daily_stats"
+        constraints = [
+            # Upsert target; also the (garage, date range) index for summaries
+            models.UniqueConstraint(
+                fields=["garage", "date", "channel", "reminder_day", "status"],
+                name="reminder_daily_stat_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"ReminderDailyStat(garage={self.garage_id}, {self.date}, {self.channel}, {self.status}={self.count})"
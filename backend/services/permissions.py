@@ -1,5 +1,5 @@
 from rest_framework.permissions import BasePermission
-from garages.models import GarageUser
+from garages.resolver import get_request_garage
 
 
 class IsGarageMember(BasePermission):
@@ -9,4 +9,5 @@ class IsGarageMember(BasePermission):
         user = request.user
         if not getattr(user, "is_authenticated", False):
             return False
-        return GarageUser.objects.filter(user=user, is_active=True).exists()
\ No newline at end of file
+        # Resolved once and kept on the request for the view to reuse
+        return get_request_garage(request) is not None
@@ -0,0 +1,118 @@
+import logging
+import time
+
+from django.conf import settings
+from redis.exceptions import RedisError
+
+from config.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+# Atomically refills every bucket in KEYS and takes one token from each of them,
+# or takes nothing and returns how long until all of them have a token again.
+# ARGV holds (rate, burst) pairs, one per key. Uses the Redis clock so all
+# workers agree on time. Returns the wait in seconds as a string ("0" = granted).
+TOKEN_BUCKET_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local wait = 0
+local tokens = {}
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i - 1])
+    local burst = tonumber(ARGV[2 * i])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local available = tonumber(state[1]) or burst
+    local ts = tonumber(state[2]) or now
+    available = math.min(burst, available + math.max(0, now - ts) * rate)
+    tokens[i] = available
+    if available < 1 then
+        wait = math.max(wait, (1 - available) / rate)
+    end
+end
+if wait > 0 then
+    return tostring(wait)
+end
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i - 1])
+    local burst = tonumber(ARGV[2 * i])
+    redis.call('HSET', key, 'tokens', tokens[i] - 1, 'ts', now)
+    redis.call('PEXPIRE', key, math.ceil(burst / rate * 1000) + 1000)
+end
+return '0'
+"""
+
+
+class RateLimiter:
+    """
+    Redis token-bucket limiter shared by every worker process.
+
+    Each call checks the provider bucket (PROVIDER_RATE_LIMITS) and, when a
+    garage is given, that garage's bucket (GARAGE_RATE_LIMITS); a token is
+    only taken when both have one. If Redis is unreachable the limiter fails
+    open so reminders are not blocked by a cache outage.
+    """
+
+    key_prefix = "ratelimit"
+
+    def __init__(self, client=None):
+        self._client = client
+        self._script = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_redis()
+        return self._client
+
+    def _buckets(self, provider, garage_id=None):
+        buckets = []
+        provider_limit = settings.PROVIDER_RATE_LIMITS.get(provider)
+        if provider_limit:
+            buckets.append((f"{self.key_prefix}:{provider}", provider_limit))
+
+        garage_limits = settings.GARAGE_RATE_LIMITS.get(provider)
+        if garage_limits and garage_id is not None:
+            limit = garage_limits.get("garages", {}).get(garage_id, garage_limits)
+            buckets.append((f"{self.key_prefix}:{provider}:garage:{garage_id}", limit))
+        return buckets
+
+    def acquire(self, provider, garage_id=None):
+        """Try to take a token. Returns 0.0 if granted, else seconds until one is expected."""
+        buckets = self._buckets(provider, garage_id)
+        if not buckets:
+            return 0.0
+
+        keys, args = [], []
+        for key, limit in buckets:
+            keys.append(key)
+            args.extend([limit["rate"], limit["burst"]])
+
+        try:
+            if self._script is None:
+                self._script = self.client.register_script(TOKEN_BUCKET_LUA)
+            return float(self._script(keys=keys, args=args))
+        except RedisError as exc:
+            logger.warning("Rate limiter unavailable for %s, allowing call: %s", provider, exc)
+            return 0.0
+
+    def throttle(self, provider, garage_id=None, max_wait=None):
+        """
+        Take a token, sleeping while the expected wait fits within `max_wait`.
+        Returns 0.0 once a token is taken, otherwise the remaining wait so the
+        caller can reschedule instead of blocking a worker slot.
+        """
+        if max_wait is None:
+            max_wait = settings.RATE_LIMIT_MAX_WAIT
+
+        deadline = time.monotonic() + max_wait
+        while True:
+            wait = self.acquire(provider, garage_id)
+            if wait <= 0:
+                return 0.0
+            if time.monotonic() + wait > deadline:
+                return wait
+            time.sleep(wait)
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,149 @@
+import logging
+import uuid
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+# services.models.ReminderDailyStat; written with raw SQL so this module does
+# not import the models (they call into it)
+STATS_TABLE = "reminder_daily_stats"
+STATS_KEY_COLUMNS = ("garage_id", "date", "channel", "reminder_day", "status")
+# Rows per upsert statement
+STATS_UPSERT_BATCH_SIZE = 500
+
+
+def summary_version_key(garage_id):
+    return f"reminder-summary-version:{garage_id}"
+
+
+def summary_cache_key(garage_id, version, start_date=None, end_date=None):
+    return f"reminder-summary:{garage_id}:{version}:{start_date or ''}:{end_date or ''}"
+
+
+def get_cached_summary(garage_id, start_date, end_date, build):
+    """
+    The garage's reminder summary for a date range, from the cache if fresh.
+
+    Every cached summary of a garage is keyed by the garage's current
+    version token, so reminders_changed() invalidates all of its date ranges
+    with a single write; superseded entries simply age out after
+    REMINDER_SUMMARY_CACHE_TTL. `build()` computes the summary on a miss.
+    Cache errors fall back to computing it.
+    """
+    try:
+        version = cache.get_or_set(summary_version_key(garage_id), _new_version, None)
+        key = summary_cache_key(garage_id, version, start_date, end_date)
+        summary = cache.get(key)
+    except Exception as exc:
+        logger.warning("Reminder summary cache unavailable, computing from DB: %s", exc)
+        return build()
+    if summary is not None:
+        return summary
+
+    summary = build()
+    try:
+        cache.set(key, summary, settings.REMINDER_SUMMARY_CACHE_TTL)
+    except Exception as exc:
+        logger.warning("Reminder summary cache unavailable, not caching: %s", exc)
+    return summary
+
+
+def transition(reminder, old_status, new_status=None):
+    """
+    One reminder's status change, for reminders_transitioned(). `old_status`
+    is None for a newly created reminder; `new_status` defaults to the
+    reminder's current status.
+    """
+    return (
+        reminder.garage_id,
+        reminder.scheduled_for,
+        reminder.channel,
+        reminder.reminder_day,
+        old_status,
+        new_status or reminder.status,
+    )
+
+
+def reminders_transitioned(transitions):
+    """
+    Record reminder creations / status changes (see transition()).
+
+    The daily rollup (ReminderDailyStat) is adjusted in the caller's
+    transaction, so it commits or rolls back together with the reminders,
+    and the affected garages' cached summaries are invalidated.
+    """
+    deltas = Counter()
+    for garage_id, day, channel, reminder_day, old_status, new_status in transitions:
+        if old_status == new_status:
+            continue
+        if old_status:
+            deltas[(garage_id, day, channel, reminder_day, old_status)] -= 1
+        deltas[(garage_id, day, channel, reminder_day, new_status)] += 1
+
+    apply_stat_deltas(deltas)
+    reminders_changed(key[0] for key in deltas)
+
+
+def reminders_deleted(counts):
+    """
+    Take deleted reminders out of the rollup, in the deleting transaction,
+    and invalidate the affected garages' cached summaries. `counts` maps
+    (garage_id, date, channel, reminder_day, status) to reminders deleted.
+    """
+    apply_stat_deltas({key: -count for key, count in counts.items()})
+    reminders_changed(key[0] for key in counts)
+
+
+def apply_stat_deltas(deltas):
+    """
+    Add {(garage_id, date, channel, reminder_day, status): delta} to the
+    rollup with INSERT ... ON CONFLICT DO UPDATE. Keys are written in sorted
+    order so concurrent writers lock shared rows in the same order.
+    """
+    rows = [key + (delta,) for key, delta in sorted(deltas.items()) if delta]
+    if not rows:
+        return
+
+    columns = ", ".join(STATS_KEY_COLUMNS + ("count",))
+    placeholders = "(" + ", ".join(["%s"] * (len(STATS_KEY_COLUMNS) + 1)) + ")"
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), STATS_UPSERT_BATCH_SIZE):
+            chunk = rows[start:start + STATS_UPSERT_BATCH_SIZE]
+            cursor.execute(
+                f"INSERT INTO {STATS_TABLE} ({columns}) "
+                f"VALUES {', '.join([placeholders] * len(chunk))} "
+                f"ON CONFLICT ({', '.join(STATS_KEY_COLUMNS)}) "
+                f"DO UPDATE SET count = {STATS_TABLE}.count + EXCLUDED.count",
+                [value for row in chunk for value in row],
+            )
+
+
+def reminders_changed(garage_ids):
+    """
+    Record that reminders of these garages were created or changed status.
+
+    Rotates each garage's summary version once the current transaction
+    commits (immediately outside one), so a dashboard cannot re-cache the
+    pre-commit numbers in between.
+    """
+    garage_ids = {garage_id for garage_id in garage_ids if garage_id is not None}
+    if garage_ids:
+        transaction.on_commit(lambda: _bump_versions(garage_ids))
+
+
+def _new_version():
+    return uuid.uuid4().hex
+
+
+def _bump_versions(garage_ids):
+    try:
+        cache.set_many(
+            {summary_version_key(garage_id): _new_version() for garage_id in garage_ids},
+            None,
+        )
+    except Exception as exc:
+        logger.warning("Reminder summary cache unavailable, could not invalidate %s: %s", garage_ids, exc)
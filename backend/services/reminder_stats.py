@@ -0,0 +1,92 @@
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+
+from garages.models import Garage
+from services.models import ReminderDailyStat, ServiceReminder
+from services.reminder_events import reminders_changed
+
+STATUSES = [status for status, _ in ServiceReminder.STATUS_CHOICES]
+
+# Rollup rows per INSERT statement when rebuilding
+REBUILD_BATCH_SIZE = 1000
+
+
+def summarize_reminders(garage_id, start_date=None, end_date=None):
+    """
+    Reminder totals, per-channel and per-reminder-day counts for a garage,
+    optionally limited to a scheduled_for range.
+
+    One grouped query over the daily rollup (at most a few dozen rows per
+    day in range) instead of scanning the garage's reminders.
+    """
+    stats = ReminderDailyStat.objects.filter(garage_id=garage_id)
+    if start_date:
+        stats = stats.filter(date__gte=start_date)
+    if end_date:
+        stats = stats.filter(date__lte=end_date)
+
+    totals = {"total": 0, **{status.lower(): 0 for status in STATUSES}}
+    by_channel, by_day = {}, {}
+    for row in stats.values("channel", "reminder_day", "status").annotate(count=Sum("count")).order_by():
+        count = row["count"]
+        totals["total"] += count
+        totals[row["status"].lower()] += count
+        by_channel[row["channel"]] = by_channel.get(row["channel"], 0) + count
+        by_day[row["reminder_day"]] = by_day.get(row["reminder_day"], 0) + count
+
+    return {
+        "totals": totals,
+        "by_channel": [
+            {"channel": channel, "count": count} for channel, count in sorted(by_channel.items()) if count
+        ],
+        "by_reminder_day": [
+            {"reminder_day": day, "count": count} for day, count in sorted(by_day.items()) if count
+        ],
+    }
+
+
+def rebuild_reminder_stats(garage_ids=None):
+    """
+    Recompute the rollup from service_reminders (all garages, or the given
+    ones) in one transaction. Returns the number of rollup rows written.
+
+    On PostgreSQL the rollup table is locked against writes first: a status
+    change that commits before the lock is in the recount, one still in
+    flight waits and applies its delta on top of the rebuilt counts.
+    """
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(f"LOCK TABLE {ReminderDailyStat._meta.db_table} IN EXCLUSIVE MODE")
+
+        stats = ReminderDailyStat.objects.all()
+        reminders = ServiceReminder.objects.all()
+        if garage_ids is not None:
+            stats = stats.filter(garage_id__in=garage_ids)
+            reminders = reminders.filter(garage_id__in=garage_ids)
+        stats.delete()
+
+        rows = (
+            reminders
+            .values("garage_id", "scheduled_for", "channel", "reminder_day", "status")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        created = ReminderDailyStat.objects.bulk_create(
+            [
+                ReminderDailyStat(
+                    garage_id=row["garage_id"],
+                    date=row["scheduled_for"],
+                    channel=row["channel"],
+                    reminder_day=row["reminder_day"],
+                    status=row["status"],
+                    count=row["count"],
+                )
+                for row in rows.iterator(chunk_size=REBUILD_BATCH_SIZE)
+            ],
+            batch_size=REBUILD_BATCH_SIZE,
+        )
+        if garage_ids is None:
+            garage_ids = Garage.objects.values_list("id", flat=True)
+        reminders_changed(garage_ids)
+    return len(created)
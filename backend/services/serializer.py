@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from datetime import date
+from django.db import transaction
 from dateutil.relativedelta import relativedelta
 
 from services.models import ServiceRecord, ServiceReminder
@@ -37,7 +38,7 @@ class UpcomingReminderSerializer(serializers.ModelSerializer):
     channel_display = serializers.CharField(source="get_channel_display", read_only=True)
     customer_name = serializers.CharField(source="customer.name", read_only=True)
     vehicle_number = serializers.CharField(source="vehicle.registration_number", read_only=True)
-    service_id = serializers.IntegerField(source="service_record.id", read_only=True)
+    service_id = serializers.IntegerField(source="service_record_id", read_only=True)
 
     class Meta:
         model = ServiceReminder
@@ -113,20 +114,33 @@ class ServiceRecordSerializer(serializers.ModelSerializer):
         """
         Returns a summary of reminder statuses for quick frontend display.
         Example: {"total": 3, "sent": 1, "pending": 2, "failed": 0}
+
+        Computed in one pass over obj.reminders.all(), so it is served from
+        the prefetch cache when the queryset prefetches "reminders".
         """
-        reminders = obj.reminders.all()
+        counts = {"PENDING": 0, "PROCESSING": 0, "SENT": 0, "FAILED": 0, "EXPIRED": 0}
+        next_reminder = None
+        total = 0
+        for reminder in obj.reminders.all():
+            total += 1
+            counts[reminder.status] = counts.get(reminder.status, 0) + 1
+            if reminder.status == "PENDING" and (
+                next_reminder is None or reminder.scheduled_for < next_reminder.scheduled_for
+            ):
+                next_reminder = reminder
+
         return {
-            "total": reminders.count(),
-            "pending": reminders.filter(status="PENDING").count(),
-            "processing": reminders.filter(status="PROCESSING").count(),
-            "sent": reminders.filter(status="SENT").count(),
-            "failed": reminders.filter(status="FAILED").count(),
-            "next_scheduled": self._get_next_scheduled(reminders),
+            "total": total,
+            "pending": counts["PENDING"],
+            "processing": counts["PROCESSING"],
+            "sent": counts["SENT"],
+            "failed": counts["FAILED"],
+            "expired": counts["EXPIRED"],
+            "next_scheduled": self._get_next_scheduled(next_reminder),
         }
 
-    def _get_next_scheduled(self, reminders):
-        """Get the next pending reminder date."""
-        next_reminder = reminders.filter(status="PENDING").order_by("scheduled_for").first()
+    def _get_next_scheduled(self, next_reminder):
+        """Date of the next pending reminder."""
         if next_reminder:
             return {
                 "date": next_reminder.scheduled_for,
@@ -206,13 +220,11 @@ class ServiceRecordSerializer(serializers.ModelSerializer):
                 service_date + relativedelta(months=interval)
             )
 
-        service = super().create(validated_data)
-
-        # Create reminders (non-blocking)
-        try:
+        # Record and reminders are saved together; a reminder failure is raised
+        # (and rolls the record back) instead of leaving a record with no reminders
+        with transaction.atomic():
+            service = super().create(validated_data)
             create_service_reminders(service)
-        except Exception:
-            pass
 
         return service
 
@@ -225,11 +237,8 @@ class ServiceRecordSerializer(serializers.ModelSerializer):
                 service_date + relativedelta(months=interval)
             )
 
-        service = super().update(instance, validated_data)
-
-        try:
+        with transaction.atomic():
+            service = super().update(instance, validated_data)
             create_service_reminders(service)
-        except Exception:
-            pass
 
         return service
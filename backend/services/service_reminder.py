@@ -1,29 +1,70 @@
 from datetime import timedelta
-from django.utils.timezone import now
-from services.models import ServiceReminder
+from django.db import transaction
+from services.models import ServiceRecord, ServiceReminder
+from services.reminder_events import reminders_transitioned, transition
 
 REMINDER_DAYS = [7, 3, 1]
 
+# Rows per INSERT statement when generating reminders for many records
+BULK_CREATE_BATCH_SIZE = 1000
 
-def create_service_reminders(service_record, channel="BOTH"):
+
+def create_service_reminders(service_records, channel="BOTH"):
     """
-    Create 7, 3, 1 day reminders for a service record.
+    Create 7, 3, 1 day reminders for one service record or many.
     Past reminders are allowed (scheduler will catch up).
+
+    The records are locked (FOR UPDATE, in pk order) so concurrent callers
+    for the same records take turns; existing (service_record, reminder_day)
+    pairs are then looked up in one query and the missing reminders written
+    with a single bulk insert, so this costs the same few queries for one
+    record as for a bulk import. Conflicts with other writers are ignored
+    by the insert; the rows that were actually inserted are read back, and
+    only those are counted into the daily rollup (in the same transaction)
+    and returned.
     """
-    if not service_record.next_service_date:
-        return
-
-    for day in REMINDER_DAYS:
-        scheduled_for = service_record.next_service_date - timedelta(days=day)
-
-        ServiceReminder.objects.get_or_create(
-            service_record=service_record,
-            reminder_day=day,
-            defaults={
-                "vehicle_id": service_record.vehicle_id,
-                "customer_id": service_record.customer_id,
-                "scheduled_for": scheduled_for,
-                "channel": channel,
-                "status": "PENDING",
-            },
+    if isinstance(service_records, ServiceRecord):
+        service_records = [service_records]
+    service_records = [record for record in service_records if record.next_service_date]
+    if not service_records:
+        return []
+    record_ids = sorted(record.pk for record in service_records)
+
+    with transaction.atomic():
+        list(ServiceRecord.objects.select_for_update().filter(pk__in=record_ids).order_by("pk").values_list("pk"))
+        existing = set(
+            ServiceReminder.objects
+            .filter(service_record__in=record_ids)
+            .values_list("service_record_id", "reminder_day")
+        )
+
+        reminders = [
+            ServiceReminder(
+                service_record=record,
+                garage_id=record.garage_id,
+                vehicle_id=record.vehicle_id,
+                customer_id=record.customer_id,
+                reminder_day=day,
+                scheduled_for=record.next_service_date - timedelta(days=day),
+                channel=channel,
+                status="PENDING",
+            )
+            for record in service_records
+            for day in REMINDER_DAYS
+            if (record.pk, day) not in existing
+        ]
+        if not reminders:
+            return []
+
+        ServiceReminder.objects.bulk_create(
+            reminders,
+            batch_size=BULK_CREATE_BATCH_SIZE,
+            ignore_conflicts=True,
         )
+        created = [
+            reminder
+            for reminder in ServiceReminder.objects.filter(service_record__in=record_ids).order_by("id")
+            if (reminder.service_record_id, reminder.reminder_day) not in existing
+        ]
+        reminders_transitioned(transition(reminder, None) for reminder in created)
+    return created
@@ -0,0 +1,64 @@
+from django.db.models import Count, Q, QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from garages.models import Customer
+from garages.versions import bump_services_version
+from services.models import ServiceRecord, ServiceReminder
+from services.reminder_events import reminders_deleted
+from vehicles.models import Vehicle
+
+# Where the reminders a delete() takes with it hang off the model it was
+# called on. Deleting a garage (or its owner) is not listed: the garage's
+# rollup rows are deleted with it.
+DELETED_REMINDER_PATHS = {
+    ServiceReminder: ("pk",),
+    ServiceRecord: ("service_record",),
+    Vehicle: ("vehicle", "service_record__vehicle"),
+    Customer: ("customer", "service_record__customer"),
+}
+
+
+@receiver(post_save, sender=ServiceRecord)
+@receiver(post_delete, sender=ServiceRecord)
+def bump_service_directory(sender, instance, **kwargs):
+    # Check-in lookups cache each vehicle's latest service
+    bump_services_version(instance.garage_id)
+
+
+@receiver(pre_delete, sender=ServiceReminder)
+@receiver(pre_delete, sender=ServiceRecord)
+@receiver(pre_delete, sender=Vehicle)
+@receiver(pre_delete, sender=Customer)
+def drop_reminder_stats(sender, instance, origin=None, **kwargs):
+    """
+    Take the reminders a delete() removes out of the rollup and cached
+    summaries: once per delete() call (`origin`), with one grouped query,
+    before anything is deleted.
+    """
+    if origin is None or getattr(origin, "_reminder_stats_dropped", False):
+        return
+    origin._reminder_stats_dropped = True
+
+    if isinstance(origin, QuerySet):
+        model, targets = origin.model, origin
+    else:
+        model, targets = type(origin), [origin.pk]
+    paths = DELETED_REMINDER_PATHS.get(model)
+    if paths is None:
+        return
+
+    match = Q()
+    for path in paths:
+        match |= Q(**{f"{path}__in": targets})
+    rows = (
+        ServiceReminder.objects
+        .filter(match)
+        .values("garage_id", "scheduled_for", "channel", "reminder_day", "status")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    reminders_deleted({
+        (row["garage_id"], row["scheduled_for"], row["channel"], row["reminder_day"], row["status"]): row["count"]
+        for row in rows
+    })
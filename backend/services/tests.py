@@ -1,4 +1,488 @@
-from django.test import TestCase
+import json
+from datetime import date, timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.timezone import now
+from redis.exceptions import ConnectionError as RedisConnectionError
+from requests import ConnectionError as RequestsConnectionError
+from requests import HTTPError
+from rest_framework.test import APIClient
 
+from celery_app import service_reminder
+from celery_app.schedulers import claim_due_reminders, reap_expired_reminder_leases, trigger_due_service_reminders
+from garages.models import Customer, Garage, GarageUser
+from services.models import ReminderDailyStat, ServiceRecord, ServiceReminder
+from services.rate_limiter import RateLimiter
+from services.reminder_stats import rebuild_reminder_stats, summarize_reminders
+from services.serializer import ServiceRecordSerializer
+from services.service_reminder import create_service_reminders
+from services.whatsapp_service import WhatsAppSendResult
+from vehicles.models import Vehicle
+
+try:
+    import fakeredis
+except ImportError:  # optional: only the token-bucket tests need it
+    fakeredis = None
+
+User = get_user_model()
+
+
+def json_round_trip(data):
+    """`data` as an API response would carry it (dates as ISO strings)."""
+    return json.loads(json.dumps(data, default=str))
+
+
+class ServiceListQueryCountTests(TestCase):
+    """reminder_summary must come from the prefetched reminders, not extra queries per record."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="owner", password="pass", role="ADMIN")
+        cls.garage = Garage.objects.create(garage_name="Garage", mobile="9000000000", user=cls.user)
+        GarageUser.objects.create(user=cls.user, garage=cls.garage)
+
+    def setUp(self):
+        cache.clear()
+
+    def create_records(self, count):
+        records = []
+        start = ServiceRecord.objects.count()
+        for i in range(start, start + count):
+            customer = Customer.objects.create(garage=self.garage, name=f"Customer {i}", mobile=f"98{i:08d}")
+            vehicle = Vehicle.objects.create(
+                vehicle_number=f"MH12AB{i:04d}",
+                vehicle_model="Swift",
+                customer=customer,
+                garage=self.garage,
+            )
+            records.append(ServiceRecord.objects.create(
+                garage=self.garage,
+                vehicle=vehicle,
+                customer=customer,
+                service_date=date.today(),
+                next_service_date=date.today() + timedelta(days=5),
+            ))
+        create_service_reminders(records)
+        return records
+
+    def test_serializer_uses_prefetched_reminders(self):
+        self.create_records(5)
+        queryset = ServiceRecord.objects.select_related(
+            "vehicle", "customer", "garage"
+        ).prefetch_related("reminders")
+
+        # One query for the records, one for all their reminders
+        with self.assertNumQueries(2):
+            data = ServiceRecordSerializer(queryset, many=True).data
+
+        summary = data[0]["reminder_summary"]
+        self.assertEqual(summary["total"], 3)
+        self.assertEqual(summary["pending"], 3)
+        self.assertEqual(summary["next_scheduled"]["days_before"], 7)
+
+    def test_list_query_count_does_not_grow_with_records(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        url = reverse("list-services")
+
+        self.create_records(2)
+        client.get(url)  # warm the garage membership cache
+        with CaptureQueriesContext(connection) as few:
+            client.get(url)
+
+        self.create_records(8)
+        with CaptureQueriesContext(connection) as many:
+            response = client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["data"]), 10)
+        self.assertEqual(len(few), len(many))
+
+
+class ReminderBatchTestCase(TestCase):
+    """Garage with customers whose 7-days-before reminder is due today."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="owner", password="pass", role="ADMIN")
+        cls.garage = Garage.objects.create(garage_name="Garage", mobile="9000000000", user=cls.user)
+        GarageUser.objects.create(user=cls.user, garage=cls.garage)
+
+    def setUp(self):
+        cache.clear()
+
+    def create_due_reminders(self, count, next_service_date=None):
+        records = []
+        for i in range(count):
+            customer = Customer.objects.create(garage=self.garage, name=f"Customer {i}", mobile=f"98{i:08d}")
+            vehicle = Vehicle.objects.create(
+                vehicle_number=f"MH12AB{i:04d}",
+                vehicle_model="Swift",
+                customer=customer,
+                garage=self.garage,
+            )
+            records.append(ServiceRecord.objects.create(
+                garage=self.garage,
+                vehicle=vehicle,
+                customer=customer,
+                service_date=date.today(),
+                next_service_date=next_service_date or date.today() + timedelta(days=7),
+            ))
+        create_service_reminders(records)
+        return list(
+            ServiceReminder.objects
+            .filter(service_record__in=records, scheduled_for__lte=date.today())
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+
+    def whapi(self, outcomes):
+        """Patch the WhatsApp client so send_many returns `outcomes` (reminder id -> response or exception)."""
+        def send_many(messages):
+            return [
+                WhatsAppSendResult(key, None, outcomes[key]) if isinstance(outcomes[key], Exception)
+                else WhatsAppSendResult(key, outcomes[key], None)
+                for key, _, _ in messages
+            ]
+        client = mock.Mock()
+        client.send_many.side_effect = send_many
+        return mock.patch("services.whatsapp_service.get_whapi_client", return_value=client)
+
+
+class ReminderBatchOutcomeTests(ReminderBatchTestCase):
+    """send_service_reminder_batch records each reminder's outcome in one pass."""
+
+    def test_mixed_outcomes(self):
+        sent, rejected, unreachable = self.create_due_reminders(3)
+        outcomes = {
+            sent: {"message": {"id": "wamid-1"}},
+            rejected: HTTPError("400 Bad Request", response=mock.Mock(status_code=400)),
+            unreachable: RequestsConnectionError("connection reset"),
+        }
+
+        with self.whapi(outcomes), \
+                mock.patch.object(service_reminder.rate_limiter, "throttle", return_value=0.0), \
+                mock.patch.object(service_reminder.send_service_reminder, "apply_async") as retry:
+            summary = service_reminder.send_service_reminder_batch([sent, rejected, unreachable])
+
+        self.assertEqual(summary, {"sent": 1, "failed": 1, "expired": 0, "retried": 1, "deferred": 0})
+
+        reminder = ServiceReminder.objects.get(pk=sent)
+        self.assertEqual(reminder.status, "SENT")
+        self.assertEqual(reminder.sent_via, "WHATSAPP")
+        self.assertEqual(reminder.provider_message_id, "wamid-1")
+        self.assertIsNone(reminder.lease_expires_at)
+
+        reminder = ServiceReminder.objects.get(pk=rejected)
+        self.assertEqual(reminder.status, "FAILED")
+        self.assertIn("HTTP 400", reminder.failure_reason)
+
+        # Transient errors are released to the single-reminder task with a not_before
+        reminder = ServiceReminder.objects.get(pk=unreachable)
+        self.assertEqual(reminder.status, "PENDING")
+        self.assertIsNotNone(reminder.not_before)
+        claim = ServiceReminder.objects.get(pk=unreachable).claim_token
+        retry.assert_called_once_with(
+            (unreachable,), {"claim": claim}, countdown=service_reminder.BATCH_RETRY_COUNTDOWN,
+        )
+
+    def test_payment_required_is_not_retried(self):
+        reminder_id, = self.create_due_reminders(1)
+        outcomes = {reminder_id: HTTPError("402 Payment Required", response=mock.Mock(status_code=402))}
+
+        with self.whapi(outcomes), \
+                mock.patch.object(service_reminder.rate_limiter, "throttle", return_value=0.0), \
+                mock.patch.object(service_reminder.send_service_reminder, "apply_async") as retry:
+            summary = service_reminder.send_service_reminder_batch([reminder_id])
+
+        self.assertEqual(summary["failed"], 1)
+        self.assertEqual(ServiceReminder.objects.get(pk=reminder_id).status, "FAILED")
+        retry.assert_not_called()
+
+    @override_settings(SERVICE_REMINDER_BATCH_DISPATCH=True)
+    def test_sweep_does_not_reclaim_released_reminders(self):
+        reminder_id, = self.create_due_reminders(1)
+        outcomes = {reminder_id: RequestsConnectionError("connection reset")}
+
+        def run_batch(reminder_ids, claim=None):
+            service_reminder.send_service_reminder_batch(reminder_ids, claim=claim)
+
+        with self.whapi(outcomes), \
+                mock.patch.object(service_reminder.rate_limiter, "throttle", return_value=0.0), \
+                mock.patch.object(service_reminder.send_service_reminder, "apply_async"), \
+                mock.patch("celery_app.schedulers.send_service_reminder_batch.delay", side_effect=run_batch) as delay:
+            trigger_due_service_reminders()
+
+        # The released reminder waits for its retry task instead of looping back into the sweep
+        delay.assert_called_once_with([reminder_id], claim=mock.ANY)
+        self.assertEqual(ServiceReminder.objects.get(pk=reminder_id).status, "PENDING")
+
+
+@override_settings(
+    PROVIDER_RATE_LIMITS={"whapi": {"rate": 1, "burst": 2}},
+    GARAGE_RATE_LIMITS={"whapi": {"rate": 1, "burst": 1}},
+)
+class RateLimiterTests(TestCase):
+    """Shared token buckets for the WhatsApp provider and each garage."""
+
+    @skipUnless(fakeredis, "fakeredis is not installed")
+    def test_burst_then_wait(self):
+        limiter = RateLimiter(client=fakeredis.FakeRedis())
+
+        self.assertEqual(limiter.acquire("whapi"), 0.0)
+        self.assertEqual(limiter.acquire("whapi"), 0.0)
+        wait = limiter.acquire("whapi")
+        self.assertGreater(wait, 0)
+        self.assertLessEqual(wait, 1)
+
+    @skipUnless(fakeredis, "fakeredis is not installed")
+    def test_garage_bucket_limits_each_garage(self):
+        limiter = RateLimiter(client=fakeredis.FakeRedis())
+
+        self.assertEqual(limiter.acquire("whapi", garage_id=1), 0.0)
+        self.assertGreater(limiter.acquire("whapi", garage_id=1), 0)
+        # Garage 1 was refused without taking a provider token, so garage 2 still gets one
+        self.assertEqual(limiter.acquire("whapi", garage_id=2), 0.0)
+        self.assertGreater(limiter.acquire("whapi", garage_id=3), 0)
+
+    def test_fails_open_without_redis(self):
+        client = mock.Mock()
+        client.register_script.return_value.side_effect = RedisConnectionError("down")
+
+        self.assertEqual(RateLimiter(client=client).acquire("whapi", garage_id=1), 0.0)
+
+
+class ReminderBatchDeferralTests(ReminderBatchTestCase):
+    """Reminders the rate limiter holds back are released and re-enqueued as a delayed batch."""
+
+    def test_rate_limited_reminders_are_deferred(self):
+        first, second, third = self.create_due_reminders(3)
+        outcomes = {first: {"message": {"id": "wamid-1"}}}
+
+        with self.whapi(outcomes), \
+                mock.patch.object(service_reminder.rate_limiter, "throttle", side_effect=[0.0, 2.5, 2.5]) as throttle, \
+                mock.patch.object(service_reminder.send_service_reminder_batch, "apply_async") as later:
+            summary = service_reminder.send_service_reminder_batch([first, second, third])
+
+        self.assertEqual(summary, {"sent": 1, "failed": 0, "expired": 0, "retried": 0, "deferred": 2})
+        # Once the limiter has pushed back, the rest of the chunk does not wait for it
+        self.assertEqual(throttle.call_args_list[2].kwargs["max_wait"], 0)
+        claim = ServiceReminder.objects.get(pk=second).claim_token
+        later.assert_called_once_with(([second, third],), {"claim": claim}, countdown=3)
+
+        self.assertEqual(ServiceReminder.objects.get(pk=first).status, "SENT")
+        for reminder in ServiceReminder.objects.filter(pk__in=[second, third]):
+            self.assertEqual(reminder.status, "PENDING")
+            self.assertIsNone(reminder.lease_expires_at)
+            self.assertIsNotNone(reminder.not_before)
+
+
+class ReminderLeaseReaperTests(ReminderBatchTestCase):
+    """reap_expired_reminder_leases re-queues claims whose worker died."""
+
+    def test_expired_lease_is_reaped_once(self):
+        expired, live = self.create_due_reminders(2)
+        ServiceReminder.objects.filter(pk=expired).update(
+            status="PROCESSING", lease_expires_at=now() - timedelta(minutes=1),
+        )
+        ServiceReminder.objects.filter(pk=live).update(
+            status="PROCESSING", lease_expires_at=now() + timedelta(minutes=10),
+        )
+
+        with mock.patch("celery_app.schedulers.trigger_due_service_reminders.delay") as trigger:
+            self.assertEqual(reap_expired_reminder_leases(), 1)
+            self.assertEqual(reap_expired_reminder_leases(), 0)
+
+        trigger.assert_called_once_with()
+        reminder = ServiceReminder.objects.get(pk=expired)
+        self.assertEqual(reminder.status, "PENDING")
+        self.assertIsNone(reminder.lease_expires_at)
+        self.assertEqual(ServiceReminder.objects.get(pk=live).status, "PROCESSING")
+
+    def test_task_queued_for_a_reaped_claim_does_nothing(self):
+        reminder_id, = self.create_due_reminders(1)
+        stale_claim, _ = claim_due_reminders(date.today(), 10)
+        # The batch task sat in the queue past its lease
+        ServiceReminder.objects.filter(pk=reminder_id).update(lease_expires_at=now() - timedelta(seconds=1))
+        with mock.patch("celery_app.schedulers.trigger_due_service_reminders.delay"):
+            reap_expired_reminder_leases()
+        claim, claimed_ids = claim_due_reminders(date.today(), 10)
+        self.assertEqual(claimed_ids, [reminder_id])
+
+        outcomes = {reminder_id: {"message": {"id": "wamid-1"}}}
+        with self.whapi(outcomes) as get_client, \
+                mock.patch.object(service_reminder.rate_limiter, "throttle", return_value=0.0):
+            service_reminder.send_service_reminder(reminder_id, claim=stale_claim)
+            stale = service_reminder.send_service_reminder_batch([reminder_id], claim=stale_claim)
+            self.assertEqual(ServiceReminder.objects.get(pk=reminder_id).status, "PROCESSING")
+            current = service_reminder.send_service_reminder_batch([reminder_id], claim=claim)
+
+        self.assertEqual(stale["sent"], 0)
+        self.assertEqual(current["sent"], 1)
+        get_client.return_value.send_many.assert_called_once()
+        self.assertEqual(ServiceReminder.objects.get(pk=reminder_id).status, "SENT")
+
+    def test_claimed_task_does_not_take_failed_reminders(self):
+        reminder_id, = self.create_due_reminders(1)
+        claim, _ = claim_due_reminders(date.today(), 10)
+        ServiceReminder.objects.filter(pk=reminder_id).update(status="FAILED")
+
+        with self.whapi({}) as get_client:
+            summary = service_reminder.send_service_reminder_batch([reminder_id], claim=claim)
+
+        self.assertEqual(summary["sent"] + summary["failed"], 0)
+        get_client.assert_not_called()
+        self.assertEqual(ServiceReminder.objects.get(pk=reminder_id).status, "FAILED")
+
+
+class ReminderDeletionStatsTests(ReminderBatchTestCase):
+    """Deleting reminders, directly or by cascade, takes them out of the rollup exactly once."""
+
+    def assertRollupMatchesReminders(self):
+        self.assertEqual(
+            summarize_reminders(self.garage.id)["totals"]["total"],
+            ServiceReminder.objects.filter(garage=self.garage).count(),
+        )
+
+    def test_deleting_a_vehicle_or_customer(self):
+        self.create_due_reminders(3)
+        first, second, third = ServiceRecord.objects.order_by("id")
+
+        first.vehicle.delete()
+        self.assertRollupMatchesReminders()
+        second.customer.delete()
+        self.assertRollupMatchesReminders()
+        ServiceReminder.objects.filter(service_record=third).delete()
+        self.assertRollupMatchesReminders()
+        self.assertEqual(summarize_reminders(self.garage.id)["totals"]["total"], 0)
+
+    def test_deleting_a_garage_with_reminders(self):
+        self.create_due_reminders(2)
+
+        self.garage.delete()
+
+        self.assertFalse(ServiceReminder.objects.exists())
+        self.assertFalse(ReminderDailyStat.objects.exists())
+
+    def test_deleting_the_garage_owner(self):
+        self.create_due_reminders(2)
+
+        self.user.delete()
+
+        self.assertFalse(ReminderDailyStat.objects.exists())
+
+
+@override_settings(SERVICE_REMINDER_BATCH_DISPATCH=True, SERVICE_REMINDER_MAX_LATENESS_DAYS=1)
+class StaleReminderTests(ReminderBatchTestCase):
+    """Overdue reminders are caught up for a short window only, and never after the service date."""
+
+    def sweep(self):
+        with mock.patch("celery_app.schedulers.send_service_reminder_batch.delay") as delay:
+            trigger_due_service_reminders()
+        return [reminder_id for call in delay.call_args_list for reminder_id in call.args[0]]
+
+    def test_old_reminders_are_expired_not_sent(self):
+        old = self.create_due_reminders(1, next_service_date=date(2023, 3, 1))
+
+        self.assertEqual(self.sweep(), [])
+        self.assertEqual(len(old), 3)
+        self.assertEqual(ServiceReminder.objects.filter(pk__in=old, status="EXPIRED").count(), 3)
+        self.assertEqual(summarize_reminders(self.garage.id)["totals"]["expired"], 3)
+
+    def test_reminder_missed_yesterday_is_caught_up(self):
+        # The 7-day reminder was due yesterday
+        late, = self.create_due_reminders(1, next_service_date=date.today() + timedelta(days=6))
+
+        self.assertEqual(self.sweep(), [late])
+
+    @override_settings(SERVICE_REMINDER_MAX_LATENESS_DAYS=30)
+    def test_reminder_after_the_service_date_is_expired(self):
+        past_due = self.create_due_reminders(1, next_service_date=date.today() - timedelta(days=1))
+
+        self.assertEqual(self.sweep(), [])
+        self.assertEqual(ServiceReminder.objects.filter(pk__in=past_due, status="EXPIRED").count(), 3)
+
+    def test_claimed_reminder_is_not_sent_once_the_service_date_passes(self):
+        reminder_id, = self.create_due_reminders(1)
+        ServiceRecord.objects.update(next_service_date=date.today() - timedelta(days=1))
+
+        with self.whapi({}) as get_client, \
+                mock.patch.object(service_reminder.rate_limiter, "throttle", return_value=0.0):
+            summary = service_reminder.send_service_reminder_batch([reminder_id])
+
+        self.assertEqual(summary["expired"], 1)
+        self.assertEqual(get_client.return_value.send_many.call_args.args[0], [])
+        self.assertEqual(ServiceReminder.objects.get(pk=reminder_id).status, "EXPIRED")
+
+
+class ReminderRollupTests(ReminderBatchTestCase):
+    """The daily rollup and the cached summary follow reminders through their life."""
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def summary(self, **params):
+        response = self.client.get(reverse("reminders-summary"), params)
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        del body["success"]
+        return body
+
+    def rollup_rows(self):
+        return set(
+            ReminderDailyStat.objects
+            .filter(garage=self.garage, count__gt=0)
+            .values_list("date", "channel", "reminder_day", "status", "count")
+        )
+
+    def assertSummaryIsCurrent(self):
+        totals = {"total": 0}
+        for status in ("PENDING", "PROCESSING", "SENT", "FAILED", "EXPIRED"):
+            count = ServiceReminder.objects.filter(garage=self.garage, status=status).count()
+            totals[status.lower()] = count
+            totals["total"] += count
+        expected = summarize_reminders(self.garage.id)
+        self.assertEqual(expected["totals"], totals)
+        self.assertEqual(self.summary(), json_round_trip(expected))
+
+    def test_rollup_follows_create_transition_delete_and_rebuild(self):
+        sent, failed, _ = self.create_due_reminders(3)
+        self.assertSummaryIsCurrent()
+        today = date.today().isoformat()
+        self.assertEqual(self.summary(start_date=today, end_date=today)["totals"]["total"], 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ServiceReminder.objects.get(pk=failed).mark_failed("bounced")
+            with self.whapi({sent: {"message": {"id": "wamid-1"}}}), \
+                    mock.patch.object(service_reminder.rate_limiter, "throttle", return_value=0.0):
+                service_reminder.send_service_reminder_batch([sent])
+        self.assertSummaryIsCurrent()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ServiceRecord.objects.filter(reminders__pk=sent).delete()
+        self.assertSummaryIsCurrent()
+        self.assertEqual(summarize_reminders(self.garage.id)["totals"]["total"], 6)
+
+        rows = self.rollup_rows()
+        with self.captureOnCommitCallbacks(execute=True):
+            rebuild_reminder_stats([self.garage.id])
+        self.assertEqual(self.rollup_rows(), rows)
+        self.assertSummaryIsCurrent()
+
+    def test_rebuild_repairs_a_drifted_rollup(self):
+        self.create_due_reminders(2)
+        rows = self.rollup_rows()
+        ReminderDailyStat.objects.filter(garage=self.garage).update(count=42)
+
+        rebuild_reminder_stats()
+
+        self.assertEqual(self.rollup_rows(), rows)
+        self.assertEqual(summarize_reminders(self.garage.id)["totals"]["total"], 6)
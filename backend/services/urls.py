@@ -2,11 +2,13 @@ from django.urls import path # pyright: ignore[reportMissingModuleSource]
 
 from .views.services_views import ServiceCreateView, ServiceListView, SchedulerTriggerView  # noqa: F401
 from .views.reminders import RemindersSummaryView, UpcomingRemindersView
+from .views.export import ServiceExportView
 
 urlpatterns = [
     # Add your service endpoints here
     path("services/create/", ServiceCreateView.as_view(), name="create-service"),
     path("services/list", ServiceListView.as_view(), name="list-services"),
+    path("services/export/", ServiceExportView.as_view(), name="export-services"),
     # Admin/test endpoint to enqueue the reminder scheduler
     path("services/trigger-reminders/", SchedulerTriggerView.as_view(), name="trigger-reminders"),
 
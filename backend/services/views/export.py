@@ -0,0 +1,106 @@
+import json
+import logging
+from datetime import date
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.http import StreamingHttpResponse
+from django.utils.timezone import now
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from garages.models import Garage
+from garages.resolver import get_request_garage
+from services.models import ServiceRecord
+
+logger = logging.getLogger(__name__)
+
+# Flat projection of one exported service record (one NDJSON line)
+EXPORT_FIELDS = [
+    "id",
+    "service_date",
+    "service_type",
+    "service_interval_months",
+    "next_service_date",
+    "reminder_status",
+    "notes",
+    "created_at",
+    "customer_id",
+    "vehicle_id",
+]
+EXPORT_RELATED_FIELDS = {
+    "customer_name": F("customer__name"),
+    "customer_mobile": F("customer__mobile"),
+    "vehicle_number": F("vehicle__vehicle_number"),
+    "vehicle_model": F("vehicle__vehicle_model"),
+}
+
+
+def iter_ndjson(queryset, chunk_size):
+    """Encode rows one by one; only `chunk_size` rows are held in memory at a time."""
+    encoder = DjangoJSONEncoder(separators=(",", ":"))
+    for row in queryset.iterator(chunk_size=chunk_size):
+        yield encoder.encode(row) + "\n"
+
+
+class ServiceExportView(APIView):
+    """
+    Streams a garage's service history as NDJSON (one service record per line).
+
+    Rows are read through a server-side cursor in chunks of EXPORT_CHUNK_SIZE
+    and written to the response as they are encoded, so worker memory stays
+    flat however many records the garage has. Optional start_date / end_date
+    (YYYY-MM-DD) filter on service_date; super admins pass garage_id.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        user = request.user
+        if user.is_super_admin():
+            garage = Garage.objects.filter(pk=request.query_params.get("garage_id") or None).first()
+            if not garage:
+                return Response(
+                    {"success": False, "error": "Garage is required"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        else:
+            garage = get_request_garage(request)
+            if not garage:
+                return Response(
+                    {"success": False, "error": "Access denied. You are not associated with any garage."},
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+
+        filters = {}
+        for param, lookup in (("start_date", "service_date__gte"), ("end_date", "service_date__lte")):
+            value = request.query_params.get(param)
+            if not value:
+                continue
+            try:
+                filters[lookup] = date.fromisoformat(value)
+            except ValueError:
+                return Response(
+                    {"success": False, "error": f"{param} must be YYYY-MM-DD"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        queryset = (
+            ServiceRecord.objects
+            .filter(garage=garage, **filters)
+            # Same order as ServiceListView, so rows stream straight off the
+            # (garage, -service_date, id) index without a sort
+            .order_by("-service_date", "id")
+            .values(*EXPORT_FIELDS, **EXPORT_RELATED_FIELDS)
+        )
+
+        logger.info("Streaming service export for garage %s (%s)", garage.id, filters)
+        response = StreamingHttpResponse(
+            iter_ndjson(queryset, settings.EXPORT_CHUNK_SIZE),
+            content_type="application/x-ndjson",
+        )
+        filename = f"services-{garage.id}-{now():%Y%m%d}.jsonl"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
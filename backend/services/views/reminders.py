@@ -1,7 +1,6 @@
 import logging
 from datetime import date, timedelta
 
-from django.db.models import Count, Q
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -9,53 +8,48 @@ from rest_framework.views import APIView
 
 from services.serializer import UpcomingReminderSerializer
 from services.models import ServiceReminder
-from garages.models import GarageUser
+from services.reminder_events import get_cached_summary
+from services.reminder_stats import summarize_reminders
+from garages.resolver import get_request_garage
 from services.permissions import IsGarageMember
 
 logger = logging.getLogger(__name__)
 
 
-def get_user_garage(user):
-    membership = GarageUser.objects.filter(user=user, is_active=True).first()
-    return membership.garage if membership else None
-
-
 class RemindersSummaryView(APIView):
+    """
+    Reminder counts for the caller's garage, optionally limited to a
+    scheduled_for range (start_date / end_date). Summed from the daily
+    rollup and served from the cache until the garage's reminders change
+    (see services.reminder_events).
+    """
     permission_classes = [IsAuthenticated, IsGarageMember]
 
     def get(self, request, *args, **kwargs):
         user = request.user
-        garage = get_user_garage(user)
+        garage = get_request_garage(request)
         if not garage:
             return Response({"success": False, "error": "Access denied. You are not associated with any garage."}, status=status.HTTP_403_FORBIDDEN)
 
-        # Optional date filters
-        start_date = request.query_params.get("start_date")
-        end_date = request.query_params.get("end_date")
-
-        qs = ServiceReminder.objects.filter(service_record__garage=garage)
-        if start_date:
-            qs = qs.filter(scheduled_for__gte=start_date)
-        if end_date:
-            qs = qs.filter(scheduled_for__lte=end_date)
-
-        totals = qs.aggregate(
-            total=Count("id"),
-            pending=Count("id", filter=Q(status="PENDING")),
-            processing=Count("id", filter=Q(status="PROCESSING")),
-            sent=Count("id", filter=Q(status="SENT")),
-            failed=Count("id", filter=Q(status="FAILED")),
+        # Optional date filters (parsed, so equal ranges share a cache entry)
+        try:
+            start_date, end_date = (
+                date.fromisoformat(value) if value else None
+                for value in (request.query_params.get("start_date"), request.query_params.get("end_date"))
+            )
+        except ValueError:
+            return Response(
+                {"success": False, "error": "start_date and end_date must be YYYY-MM-DD"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        summary = get_cached_summary(
+            garage.id,
+            start_date,
+            end_date,
+            lambda: summarize_reminders(garage.id, start_date, end_date),
         )
-
-        by_channel = qs.values("channel").annotate(count=Count("id"))
-        by_day = qs.values("reminder_day").annotate(count=Count("id"))
-
-        return Response({
-            "success": True,
-            "totals": totals,
-            "by_channel": list(by_channel),
-            "by_reminder_day": list(by_day),
-        })
+        return Response({"success": True, **summary})
 
 
 class UpcomingRemindersView(generics.ListAPIView):
@@ -64,7 +58,7 @@ class UpcomingRemindersView(generics.ListAPIView):
 
     def get_queryset(self):
         user = self.request.user
-        garage = get_user_garage(user)
+        garage = get_request_garage(self.request)
         if not garage:
             return ServiceReminder.objects.none()
 
@@ -73,9 +67,9 @@ class UpcomingRemindersView(generics.ListAPIView):
         end_date = today + timedelta(days=days)
 
         qs = ServiceReminder.objects.select_related(
-            "service_record", "vehicle", "customer"
+            "vehicle", "customer"
         ).filter(
-            service_record__garage=garage,
+            garage=garage,
             scheduled_for__gte=today,
             scheduled_for__lte=end_date,
         ).order_by("scheduled_for")
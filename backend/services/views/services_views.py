@@ -3,26 +3,21 @@ from rest_framework import generics, status # type: ignore
 from rest_framework.permissions import IsAuthenticated # type: ignore
 from rest_framework.response import Response # type: ignore
 from ..serializer import ServiceRecordSerializer
+from config.pagination import InvalidCursor, KeysetPagination
 from services.models import ServiceRecord
-from garages.models import GarageUser, Garage, Garage
+from garages.models import Garage
+from garages.resolver import get_request_garage
 
 logger = logging.getLogger(__name__)
 
 
-
-def get_user_garage(user):
-    """Helper to get user's active garage from GarageUser"""
-    membership = GarageUser.objects.filter(user=user, is_active=True).first()
-    return membership.garage if membership else None
-
-
 class ServiceCreateView(generics.CreateAPIView):
     serializer_class = ServiceRecordSerializer
     permission_classes = [IsAuthenticated]
 
     def create(self, request, *args, **kwargs):
         user = request.user
-        garage = get_user_garage(user)
+        garage = get_request_garage(request)
 
         if not user.is_super_admin() and not garage:
             return Response(
@@ -66,6 +61,8 @@ class ServiceListView(generics.ListAPIView):
     """List all service records for the user's garage (or all for super admin)."""
     serializer_class = ServiceRecordSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    ordering = ("-service_date", "id")
 
     def get_queryset(self):
         user = self.request.user
@@ -75,7 +72,7 @@ class ServiceListView(generics.ListAPIView):
         
         if user.is_super_admin():
             return base_qs
-        garage = get_user_garage(user)
+        garage = get_request_garage(self.request)
         if garage:
             return base_qs.filter(garage=garage)
         return ServiceRecord.objects.none()
@@ -86,21 +83,19 @@ class ServiceListView(generics.ListAPIView):
 
             # Check access for non-super-admin users
             if not user.is_super_admin():
-                garage = get_user_garage(user)
+                garage = get_request_garage(request)
                 if not garage:
                     return Response(
                         {"success": False, "error": "Access denied. You are not associated with any garage."},
                         status=status.HTTP_403_FORBIDDEN,
                     )
 
-            queryset = self.get_queryset()
-            serializer = self.get_serializer(queryset, many=True)
-            return Response({
-                "success": True,
-                "count": queryset.count(),
-                "data": serializer.data
-            }, status=status.HTTP_200_OK)
+            page = self.paginate_queryset(self.get_queryset())
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
 
+        except InvalidCursor as exc:
+            return Response({"success": False, "error": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as exc:
             logger.exception("Service list fetch failed")
             return Response(
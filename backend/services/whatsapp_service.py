@@ -1,36 +1,128 @@
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
 from django.conf import settings
 
 
-def send_whatsapp_reminder(phone_number: str, message: str):
-    """
-    Send WhatsApp message using Whapi.Cloud
-    """
+# Outcome of one message sent through WhapiClient.send_many:
+# `response` is the decoded JSON body on success, `error` the raised exception otherwise.
+WhatsAppSendResult = namedtuple("WhatsAppSendResult", ["key", "response", "error"])
+
+
+def normalize_whatsapp_number(phone_number):
     # Clean the phone number: remove spaces, dashes, and '+'
     clean_number = "".join(filter(str.isdigit, str(phone_number)))
 
     # If it's a 10-digit number, prepend 91 (India)
     if len(clean_number) == 10:
         clean_number = f"91{clean_number}"
+    return clean_number
+
+
+class WhapiClient:
+    """
+    Whapi.Cloud client backed by a pooled keep-alive session.
+
+    One instance is shared per process (see get_whapi_client), so repeated
+    sends reuse TCP/TLS connections instead of paying a handshake each time.
+    """
+
+    def __init__(self, base_url=None, token=None, instance_id=None,
+                 max_concurrency=None, timeout=None):
+        self.base_url = base_url or settings.WHAPI_BASE_URL
+        self.instance_id = instance_id or (
+            settings.WHINSTANCE_ID if hasattr(settings, 'WHINSTANCE_ID') else settings.WHAPI_INSTANCE_ID
+        )
+        self.max_concurrency = max_concurrency or settings.WHAPI_MAX_CONCURRENCY
+        self.timeout = timeout or (settings.WHAPI_CONNECT_TIMEOUT, settings.WHAPI_READ_TIMEOUT)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {token or settings.WHAPI_API_TOKEN}",
+            "Content-Type": "application/json",
+        })
+
+    def send_text(self, phone_number: str, message: str, timeout=None):
+        """Send one text message; raises requests exceptions on failure."""
+        clean_number = normalize_whatsapp_number(phone_number)
+
+        payload = {
+            "to": clean_number,                # Now includes country code, e.g. 917588722435
+            "body": message,
+            "instance_id": self.instance_id,
+        }
+
+        print(f"--- [Whapi] Attempting to send message to: {clean_number} ---")
+        response = self.session.post(
+            f"{self.base_url}/messages/text",
+            json=payload,
+            timeout=timeout or self.timeout,
+        )
+
+        print(f"--- [Whapi] Response Status: {response.status_code} ---")
+        print(f"--- [Whapi] Response Body: {response.text} ---")
 
-    url = f"{settings.WHAPI_BASE_URL}/messages/text"
-
-    headers = {
-        "Authorization": f"Bearer {settings.WHAPI_API_TOKEN}",
-        "Content-Type": "application/json",
-    }
-
-    payload = {
-        "to": clean_number,                # Now includes country code, e.g. 917588722435
-        "body": message,
-        "instance_id": settings.WHINSTANCE_ID if hasattr(settings, 'WHINSTANCE_ID') else settings.WHAPI_INSTANCE_ID,
-    }
-
-    print(f"--- [Whapi] Attempting to send message to: {clean_number} ---")
-    response = requests.post(url, json=payload, headers=headers, timeout=15)
-    
-    print(f"--- [Whapi] Response Status: {response.status_code} ---")
-    print(f"--- [Whapi] Response Body: {response.text} ---")
-    
-    response.raise_for_status()
-    return response.json()
+        response.raise_for_status()
+        return response.json()
+
+    def send_many(self, messages, timeout=None):
+        """
+        Send many messages concurrently over the shared connection pool.
+
+        `messages` is an iterable of (key, phone_number, message) tuples.
+        Returns one WhatsAppSendResult per message, in input order; errors
+        are collected per message instead of aborting the whole batch.
+        """
+        messages = list(messages)
+        if not messages:
+            return []
+
+        def _send(item):
+            key, phone_number, message = item
+            try:
+                return WhatsAppSendResult(key, self.send_text(phone_number, message, timeout=timeout), None)
+            except Exception as exc:
+                return WhatsAppSendResult(key, None, exc)
+
+        workers = min(self.max_concurrency, len(messages))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="whapi") as executor:
+            return list(executor.map(_send, messages))
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+def get_whapi_client():
+    """
+    Return the per-process WhapiClient.
+
+    Celery's prefork pool forks after import, so the client is created lazily
+    and re-created when the pid changes - sockets are never shared across processes.
+    """
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is None or _client_pid != pid:
+        with _client_lock:
+            if _client is None or _client_pid != pid:
+                _client = WhapiClient()
+                _client_pid = pid
+    return _client
+
+
+def send_whatsapp_reminder(phone_number: str, message: str):
+    """
+    Send WhatsApp message using Whapi.Cloud
+    """
+    return get_whapi_client().send_text(phone_number, message)
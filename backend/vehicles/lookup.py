@@ -0,0 +1,130 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import JSONObject
+
+from garages.models import Customer
+from garages.versions import directory_version, get_versions, services_version
+from services.models import ServiceRecord
+from vehicles.models import Vehicle
+from vehicles.validators import compact_vehicle_number, mobile_candidates
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def latest_service(vehicle_ref):
+    """Subquery: the vehicle's most recent service record as one JSON object."""
+    return Subquery(
+        ServiceRecord.objects
+        .filter(vehicle_id=vehicle_ref)
+        .order_by("-service_date", "-id")
+        .values(data=JSONObject(
+            id="id",
+            service_date="service_date",
+            service_type="service_type",
+            next_service_date="next_service_date",
+            reminder_status="reminder_status",
+        ))[:1]
+    )
+
+
+def lookup_by_plate(garage_id, vehicle_number):
+    """The garage's vehicle with this (stored-form) number, with owner and latest service."""
+    rows = (
+        Vehicle.objects
+        .filter(garage_id=garage_id, vehicle_number=vehicle_number)
+        .values(
+            vehicle_id=F("id"),
+            vehicle_vehicle_number=F("vehicle_number"),
+            vehicle_vehicle_model=F("vehicle_model"),
+            vehicle_vehicle_type_id=F("vehicle_type_id"),
+            owner_id=F("customer__id"),
+            owner_name=F("customer__name"),
+            owner_mobile=F("customer__mobile"),
+            owner_whatsapp_number=F("customer__whatsapp_number"),
+            latest_service=latest_service(OuterRef("id")),
+        )
+    )
+    return [_match(row) for row in rows]
+
+
+def lookup_by_mobile(garage_id, mobiles):
+    """
+    The garage's customer with one of these mobiles, one match per vehicle
+    (or a single vehicle-less match), each with its latest service.
+    """
+    rows = (
+        Customer.objects
+        .filter(garage_id=garage_id, mobile__in=mobiles)
+        .order_by("id", "vehicles__id")
+        .values(
+            vehicle_id=F("vehicles__id"),
+            vehicle_vehicle_number=F("vehicles__vehicle_number"),
+            vehicle_vehicle_model=F("vehicles__vehicle_model"),
+            vehicle_vehicle_type_id=F("vehicles__vehicle_type_id"),
+            owner_id=F("id"),
+            owner_name=F("name"),
+            owner_mobile=F("mobile"),
+            owner_whatsapp_number=F("whatsapp_number"),
+            latest_service=latest_service(OuterRef("vehicles__id")),
+        )
+    )
+    return [_match(row) for row in rows]
+
+
+def _match(row):
+    def section(prefix):
+        if row[f"{prefix}_id"] is None:
+            return None
+        return {key[len(prefix) + 1:]: value for key, value in row.items() if key.startswith(prefix + "_")}
+
+    return {
+        "vehicle": section("vehicle"),
+        "customer": section("owner"),
+        "latest_service": row["latest_service"],
+    }
+
+
+def checkin_lookup(garage_id, plate=None, mobile=None):
+    """
+    Walk-in lookup by plate or mobile: exact match on the normalized input
+    through the unique vehicle_number / (garage, mobile) indexes, in one
+    query. Results (including "not found") are cached for CHECKIN_CACHE_TTL
+    under the garage's directory and services versions, so any customer,
+    vehicle or service change in the garage retires them.
+
+    Returns (normalized query, matches).
+    """
+    if plate:
+        kind, key = "plate", compact_vehicle_number(plate)
+        fetch, args = lookup_by_plate, (garage_id, key)
+    else:
+        mobiles = mobile_candidates(mobile or "")
+        kind, key = "mobile", mobiles[-1] if mobiles else ""
+        fetch, args = lookup_by_mobile, (garage_id, mobiles)
+    if not key:
+        return key, []
+
+    versions = get_versions(directory_version(garage_id), services_version(garage_id))
+    if versions is None:
+        return key, fetch(*args)
+
+    cache_key = f"checkin:{garage_id}:{':'.join(versions)}:{kind}:{key}"
+    try:
+        matches = cache.get(cache_key, _MISSING)
+    except Exception as exc:
+        logger.warning("Check-in cache unavailable, reading from DB: %s", exc)
+        return key, fetch(*args)
+    if matches is not _MISSING:
+        return key, matches
+
+    matches = fetch(*args)
+    try:
+        cache.set(cache_key, matches, settings.CHECKIN_CACHE_TTL)
+    except Exception as exc:
+        logger.warning("Check-in cache unavailable, not caching: %s", exc)
+    return key, matches
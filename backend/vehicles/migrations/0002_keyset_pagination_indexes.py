@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-17 21:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garages', '0006_keyset_pagination_indexes'),
+        ('vehicles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['garage', '-id'], name='vehicles_ve_garage__69411c_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+from django.db import migrations
+
+# GIN trigram indexes for vehicles.search; (table, column) pairs
+TRIGRAM_INDEXES = [
+    ("vehicles_vehicle", "vehicle_number"),
+    ("garages_customer", "name"),
+    ("garages_customer", "mobile"),
+]
+
+
+def index_name(table, column):
+    return f"{table}_{column}_trgm"
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # PostgreSQL only, and only where the server ships pg_trgm; elsewhere
+    # vehicles.search falls back to its in-process index
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for table, column in TRIGRAM_INDEXES:
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS "{index_name(table, column)}" '
+                f'ON "{table}" USING gin ("{column}" gin_trgm_ops)'
+            )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        for table, column in TRIGRAM_INDEXES:
+            cursor.execute(f'DROP INDEX IF EXISTS "{index_name(table, column)}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('garages', '0006_keyset_pagination_indexes'),
+        ('vehicles', '0002_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
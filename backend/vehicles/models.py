@@ -72,6 +72,12 @@ class Vehicle(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # keyset pagination of VehicleListView
+            models.Index(fields=["garage", "-id"]),
+        ]
+
     def __str__(self):
         return f"{self.vehicle_number} - {self.vehicle_model}"
 
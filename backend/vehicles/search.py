@@ -0,0 +1,220 @@
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+
+from garages.models import Customer
+from garages.versions import get_directory_version
+from vehicles.models import Vehicle
+from vehicles.validators import NON_DIGIT_RE, compact_vehicle_number
+
+logger = logging.getLogger(__name__)
+
+WORD_RE = re.compile(r"[^\W_]+")
+
+VEHICLE_FIELDS = ("id", "vehicle_number", "vehicle_model", "customer_id")
+VEHICLE_RELATED_FIELDS = {"customer_name": F("customer__name")}
+CUSTOMER_FIELDS = ("id", "name", "mobile")
+
+
+def trigrams(text):
+    """
+    pg_trgm-style trigrams: lowercase words, each padded with two spaces in
+    front and one behind, so prefixes weigh more than arbitrary substrings.
+    """
+    grams = set()
+    for word in WORD_RE.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def search_terms(query):
+    """
+    The query as typed (names), as a compact plate, and as mobile digits.
+    Queries with letters are names or plates, so get no mobile term.
+    """
+    query = query.strip()
+    plate = compact_vehicle_number(query)
+    digits = "" if NON_DIGIT_RE.search(plate) else NON_DIGIT_RE.sub("", query)
+    return query, plate, digits
+
+
+def search_garage(garage_id, query, limit):
+    """
+    Ranked vehicles and customers of a garage matching `query`.
+
+    Vehicles match on vehicle_number, customers on name or mobile; partial
+    and misspelled input is matched by trigram word similarity of at least
+    SEARCH_MIN_SIMILARITY. Returns {"vehicles": [...], "customers": [...]},
+    each best match first with at most `limit` rows and a "score".
+    """
+    if _use_trigram_indexes():
+        return _search_postgres(garage_id, query, limit)
+    return _search_fallback(garage_id, query, limit)
+
+
+# PostgreSQL: pg_trgm operators served by GIN trigram indexes
+
+_trigram_available = None
+
+
+def _use_trigram_indexes():
+    """pg_trgm is installed by vehicles migration 0003 where the server ships it."""
+    global _trigram_available
+    if connection.vendor != "postgresql":
+        return False
+    if _trigram_available is None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            _trigram_available = cursor.fetchone() is not None
+        if not _trigram_available:
+            logger.warning("pg_trgm is not installed; searching with the in-process index")
+    return _trigram_available
+
+
+def _search_postgres(garage_id, query, limit):
+    from django.contrib.postgres.search import TrigramWordSimilarity
+
+    name, plate, digits = search_terms(query)
+    with transaction.atomic():
+        # `%>` (the *__trigram_word_similar lookups) is what the GIN indexes
+        # serve; its cut-off is this setting, scoped to the transaction
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+                [str(settings.SEARCH_MIN_SIMILARITY)],
+            )
+
+        vehicles = []
+        if plate:
+            vehicles = list(
+                Vehicle.objects
+                .filter(garage_id=garage_id, vehicle_number__trigram_word_similar=plate)
+                .annotate(score=TrigramWordSimilarity(plate, "vehicle_number"))
+                .order_by("-score", "id")
+                .values(*VEHICLE_FIELDS, "score", **VEHICLE_RELATED_FIELDS)[:limit]
+            )
+
+        match = Q(name__trigram_word_similar=name)
+        score = TrigramWordSimilarity(name, "name")
+        if len(digits) >= settings.SEARCH_MIN_QUERY_LENGTH:
+            match |= Q(mobile__trigram_word_similar=digits)
+            score = Greatest(score, TrigramWordSimilarity(digits, "mobile"))
+        customers = list(
+            Customer.objects
+            .filter(match, garage_id=garage_id)
+            .annotate(score=score)
+            .order_by("-score", "id")
+            .values(*CUSTOMER_FIELDS, "score")[:limit]
+        )
+
+    return {"vehicles": vehicles, "customers": customers}
+
+
+# Fallback: in-process n-gram index (SQLite, servers without pg_trgm)
+
+class NgramIndex:
+    """
+    Inverted trigram index over short text fields of some documents.
+
+    score(query, field) = shared trigrams / query trigrams, which like
+    pg_trgm's word_similarity rewards the query appearing inside a longer
+    value. A document scores its best field.
+    """
+
+    def __init__(self, documents):
+        # documents: iterable of (document, [field text, ...])
+        self.documents = []
+        self.postings = defaultdict(list)
+        for position, (document, texts) in enumerate(documents):
+            self.documents.append(document)
+            for field, text in enumerate(texts):
+                for gram in trigrams(text or ""):
+                    self.postings[gram].append((position, field))
+
+    def search(self, queries, limit, min_score):
+        """Best `limit` documents for per-field queries (one per field, or None)."""
+        best = {}
+        for field, query in enumerate(queries):
+            grams = trigrams(query) if query else set()
+            if not grams:
+                continue
+            shared = defaultdict(int)
+            for gram in grams:
+                for position, posting_field in self.postings.get(gram, ()):
+                    if posting_field == field:
+                        shared[position] += 1
+            for position, count in shared.items():
+                score = count / len(grams)
+                if score >= min_score and score > best.get(position, 0):
+                    best[position] = score
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1], self.documents[item[0]]["id"]))
+        return [{**self.documents[position], "score": score} for position, score in ranked[:limit]]
+
+
+class _GarageIndexCache:
+    """A few recently searched garages' indexes, keyed by directory version."""
+
+    def __init__(self, size):
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, garage_id, version):
+        with self._lock:
+            entry = self._entries.get(garage_id)
+            if entry is None:
+                return None
+            entry_version, expires_at, indexes = entry
+            if entry_version != version or expires_at < time.monotonic():
+                del self._entries[garage_id]
+                return None
+            self._entries.move_to_end(garage_id)
+            return indexes
+
+    def set(self, garage_id, version, indexes):
+        with self._lock:
+            self._entries[garage_id] = (version, time.monotonic() + settings.SEARCH_FALLBACK_INDEX_TTL, indexes)
+            self._entries.move_to_end(garage_id)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+
+_index_cache = _GarageIndexCache(size=32)
+
+
+def _garage_indexes(garage_id):
+    version = get_directory_version(garage_id)
+    indexes = _index_cache.get(garage_id, version) if version else None
+    if indexes is not None:
+        return indexes
+
+    vehicles = Vehicle.objects.filter(garage_id=garage_id).values(*VEHICLE_FIELDS, **VEHICLE_RELATED_FIELDS)
+    customers = Customer.objects.filter(garage_id=garage_id).values(*CUSTOMER_FIELDS)
+    indexes = (
+        NgramIndex((row, [row["vehicle_number"]]) for row in vehicles.iterator()),
+        NgramIndex((row, [row["name"], row["mobile"]]) for row in customers.iterator()),
+    )
+    if version:
+        _index_cache.set(garage_id, version, indexes)
+    return indexes
+
+
+def _search_fallback(garage_id, query, limit):
+    name, plate, digits = search_terms(query)
+    vehicle_index, customer_index = _garage_indexes(garage_id)
+    min_score = settings.SEARCH_MIN_SIMILARITY
+    if len(digits) < settings.SEARCH_MIN_QUERY_LENGTH:
+        digits = None
+    return {
+        "vehicles": vehicle_index.search([plate], limit, min_score),
+        "customers": customer_index.search([name, digits], limit, min_score),
+    }
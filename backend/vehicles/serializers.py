@@ -3,7 +3,10 @@ from .models import Vehicle, VehicleType
 from garages.models import Customer
 from django.utils.html import strip_tags
 from django.contrib.auth import get_user_model
-import re
+from .validators import vehicle_number_error
+from config.projections import Projection
+from config.reference_cache import reference_cache
+from django.db.models import F
 
 User = get_user_model()
 
@@ -23,8 +26,9 @@ class VehicleSerializer(serializers.ModelSerializer):
         source="customer",
         required=True,
     )
-    customer_name = serializers.CharField(source="customer.name", read_only=True)
-    vehicle_type_name = serializers.CharField(source="vehicle_type.name", read_only=True)
+    # null (not omitted) for a vehicle without a customer, as in VEHICLE_LIST_PROJECTION
+    customer_name = serializers.CharField(source="customer.name", read_only=True, allow_null=True)
+    vehicle_type_name = serializers.SerializerMethodField()
 
     class Meta:
         model = Vehicle
@@ -39,6 +43,11 @@ class VehicleSerializer(serializers.ModelSerializer):
             "customer_name",
         ]
 
+    def get_vehicle_type_name(self, obj):
+        # Served from the process-local reference cache instead of a join/query per row
+        vehicle_type = reference_cache.vehicle_type(obj.vehicle_type_id)
+        return vehicle_type.name if vehicle_type else None
+
     def validate(self, attrs):
         customer = attrs.get("customer")
         request = self.context.get("request")
@@ -55,15 +64,9 @@ class VehicleSerializer(serializers.ModelSerializer):
         # Always convert to uppercase
         value = value.upper()
         # Must be alphanumeric and contain a digit group (1-4 digits) anywhere
-        if not re.match(r'^[A-Z0-9]+$', value):
-            raise serializers.ValidationError(
-                "Vehicle number must be uppercase alphanumeric (A-Z, 0-9) only."
-            )
-        digit_groups = re.findall(r'\d+', value)
-        if not digit_groups or not any(1 <= len(d) <= 4 for d in digit_groups):
-            raise serializers.ValidationError(
-                "Vehicle number must contain at least one group of 1 to 4 digits (e.g., MH05DU6253, MH5DU6, etc.)."
-            )
+        error = vehicle_number_error(value)
+        if error:
+            raise serializers.ValidationError(error)
         if self.instance is None and Vehicle.objects.filter(vehicle_number=value).exists():
             raise serializers.ValidationError("Vehicle number must be unique.")
         if self.instance is not None and Vehicle.objects.filter(vehicle_number=value).exclude(pk=self.instance.pk).exists():
@@ -87,6 +90,23 @@ class VehicleSerializer(serializers.ModelSerializer):
         if 'vehicle_description' in validated_data:
             validated_data['vehicle_description'] = strip_tags(validated_data['vehicle_description'])
         return super().update(instance, validated_data)
+
+
+# VehicleSerializer's list output, read with one joined values() query
+VEHICLE_LIST_PROJECTION = Projection(
+    "id",
+    "vehicle_number",
+    "vehicle_type",
+    "vehicle_type_name",
+    "vehicle_model",
+    "vehicle_description",
+    "customer_id",
+    "customer_name",
+    vehicle_type_name=F("vehicle_type__name"),
+    customer_name=F("customer__name"),
+)
+
+
 #user serializer
 class UserSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=False)
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from config.reference_cache import reference_cache
+from garages.versions import VEHICLE_TYPES, bump_directory_version, bump_versions
+from vehicles.models import Vehicle, VehicleType
+
+
+@receiver(post_save, sender=Vehicle)
+@receiver(post_delete, sender=Vehicle)
+def bump_vehicle_directory(sender, instance, **kwargs):
+    bump_directory_version(instance.garage_id)
+
+
+@receiver(post_save, sender=VehicleType)
+@receiver(post_delete, sender=VehicleType)
+def bump_vehicle_types(sender, instance, **kwargs):
+    bump_versions(VEHICLE_TYPES)
+    reference_cache.invalidate_vehicle_types()
@@ -1,3 +1,181 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from garages.models import Customer, Garage, GarageUser
+from services.models import ServiceRecord
+from vehicles.models import Vehicle
+from vehicles.search import NgramIndex, search_garage, search_terms
+
+User = get_user_model()
+
+
+class GarageDirectoryTestCase(TestCase):
+    """Two garages, each with a couple of customers and vehicles."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="owner", password="pass", role="ADMIN")
+        cls.garage = Garage.objects.create(garage_name="Garage", mobile="9000000000", user=cls.user)
+        GarageUser.objects.create(user=cls.user, garage=cls.garage)
+        cls.rahul = Customer.objects.create(garage=cls.garage, name="Rahul Sharma", mobile="9876500001")
+        cls.meera = Customer.objects.create(garage=cls.garage, name="Meera Iyer", mobile="9123400002")
+        cls.swift = Vehicle.objects.create(
+            vehicle_number="MH05DU6253", vehicle_model="Swift", customer=cls.rahul, garage=cls.garage,
+        )
+        cls.city = Vehicle.objects.create(
+            vehicle_number="KA01AB1234", vehicle_model="City", customer=cls.meera, garage=cls.garage,
+        )
+
+        other_user = User.objects.create_user(username="other", password="pass", role="ADMIN")
+        cls.other_garage = Garage.objects.create(garage_name="Other", mobile="9000000001", user=other_user)
+        other = Customer.objects.create(garage=cls.other_garage, name="Rahul Verma", mobile="9876500001")
+        Vehicle.objects.create(
+            vehicle_number="MH05DU6254", vehicle_model="Swift", customer=other, garage=cls.other_garage,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+
+class NgramIndexTests(SimpleTestCase):
+    """The in-process trigram index used when pg_trgm is unavailable."""
+
+    def test_scores_shared_trigrams_of_the_query(self):
+        index = NgramIndex([
+            ({"id": 1}, ["Rahul Sharma"]),
+            ({"id": 2}, ["Meera Iyer"]),
+        ])
+
+        exact, = index.search(["rahul"], limit=5, min_score=0.4)
+        self.assertEqual(exact, {"id": 1, "score": 1.0})
+        misspelled, = index.search(["rahl"], limit=5, min_score=0.4)
+        self.assertEqual(misspelled["id"], 1)
+        self.assertLess(misspelled["score"], 1.0)
+        self.assertEqual(index.search(["zzz"], limit=5, min_score=0.4), [])
+
+    def test_document_scores_its_best_field(self):
+        index = NgramIndex([
+            ({"id": 1}, ["Rahul Sharma", "9876500001"]),
+            ({"id": 2}, ["Meera Iyer", "9123400002"]),
+        ])
+
+        results = index.search(["meera", "9876500001"], limit=5, min_score=0.4)
+        self.assertEqual([row["id"] for row in results], [1, 2])
+        self.assertEqual(index.search(["meera", "9876500001"], limit=1, min_score=0.4)[0]["id"], 1)
+
+    def test_search_terms(self):
+        self.assertEqual(search_terms(" mh-05 du 6253 "), ("mh-05 du 6253", "MH05DU6253", ""))
+        self.assertEqual(search_terms("+91 98765"), ("+91 98765", "9198765", "9198765"))
+
+
+class VehicleSearchTests(GarageDirectoryTestCase):
+    """vehicles/search/ ranks the garage's own vehicles and customers."""
+
+    def search(self, q, **params):
+        response = self.client.get(reverse("vehicle_search"), {"q": q, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()["data"]
+
+    def test_plate_typed_with_separators(self):
+        data = self.search("mh-05 du 6253")
+        self.assertEqual([row["id"] for row in data["vehicles"]], [self.swift.id])
+        self.assertEqual(data["vehicles"][0]["customer_name"], "Rahul Sharma")
+
+    def test_partial_and_misspelled_names(self):
+        self.assertEqual([row["id"] for row in self.search("rahl")["customers"]], [self.rahul.id])
+        self.assertEqual([row["id"] for row in self.search("meera iy")["customers"]], [self.meera.id])
+
+    def test_mobile_digits(self):
+        self.assertEqual([row["id"] for row in self.search("98765 00001")["customers"]], [self.rahul.id])
+
+    def test_short_query_is_rejected(self):
+        response = self.client.get(reverse("vehicle_search"), {"q": "ab"})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()["success"])
+
+    def test_fallback_index_sees_directory_changes(self):
+        with mock.patch("vehicles.search._use_trigram_indexes", return_value=False):
+            self.assertEqual(search_garage(self.garage.id, "GJ01", 5)["vehicles"], [])
+
+            with self.captureOnCommitCallbacks(execute=True):
+                vehicle = Vehicle.objects.create(
+                    vehicle_number="GJ01XY0001", vehicle_model="Alto", customer=self.meera, garage=self.garage,
+                )
+            results = search_garage(self.garage.id, "GJ01XY0001", 5)
+
+        self.assertEqual([row["id"] for row in results["vehicles"]], [vehicle.id])
+
+
+class CheckInLookupTests(GarageDirectoryTestCase):
+    """vehicles/lookup/ finds a walk-in's vehicle or customer from typed input."""
+
+    def lookup(self, **params):
+        response = self.client.get(reverse("vehicle_checkin_lookup"), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()["data"]
+
+    def test_plate_lookup_includes_owner_and_latest_service(self):
+        ServiceRecord.objects.create(
+            garage=self.garage, vehicle=self.swift, customer=self.rahul,
+            service_date=date.today() - timedelta(days=200), next_service_date=date.today() - timedelta(days=20),
+        )
+        latest = ServiceRecord.objects.create(
+            garage=self.garage, vehicle=self.swift, customer=self.rahul,
+            service_date=date.today() - timedelta(days=10), next_service_date=date.today() + timedelta(days=170),
+        )
+
+        data = self.lookup(plate="mh-05 du 6253")
+
+        self.assertEqual(data["query"], "MH05DU6253")
+        self.assertTrue(data["found"])
+        match, = data["matches"]
+        self.assertEqual(match["vehicle"]["id"], self.swift.id)
+        self.assertEqual(match["customer"]["id"], self.rahul.id)
+        self.assertEqual(match["latest_service"]["id"], latest.id)
+
+    def test_mobile_lookup_strips_country_code(self):
+        data = self.lookup(mobile="+91 98765 00001")
+
+        self.assertEqual(data["query"], "9876500001")
+        match, = data["matches"]
+        # Only this garage's customer with that mobile
+        self.assertEqual(match["customer"]["id"], self.rahul.id)
+        self.assertEqual(match["vehicle"]["vehicle_number"], "MH05DU6253")
+        self.assertIsNone(match["latest_service"])
+
+    def test_customer_without_vehicle(self):
+        Customer.objects.create(garage=self.garage, name="No Car", mobile="9000000009")
+
+        match, = self.lookup(mobile="9000000009")["matches"]
+        self.assertIsNone(match["vehicle"])
+        self.assertEqual(match["customer"]["name"], "No Car")
+
+    def test_other_garage_vehicle_is_not_found(self):
+        data = self.lookup(plate="MH05DU6254")
+        self.assertFalse(data["found"])
+        self.assertEqual(data["matches"], [])
+
+    def test_cached_result_is_retired_by_a_new_service(self):
+        self.assertIsNone(self.lookup(plate="KA01AB1234")["matches"][0]["latest_service"])
+        with self.assertNumQueries(0):
+            self.lookup(plate="KA01AB1234")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            record = ServiceRecord.objects.create(
+                garage=self.garage, vehicle=self.city, customer=self.meera,
+                service_date=date.today(), next_service_date=date.today() + timedelta(days=90),
+            )
+        self.assertEqual(self.lookup(plate="KA01AB1234")["matches"][0]["latest_service"]["id"], record.id)
+
+    def test_plate_or_mobile_is_required(self):
+        response = self.client.get(reverse("vehicle_checkin_lookup"))
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()["success"])
@@ -1,7 +1,7 @@
 from django.urls import path, include
 
 from rest_framework.authtoken.views import obtain_auth_token  
-from .vehicle_views import VehicleCreateView, VehicleDeleteView, VehicleListView, VehicleUpdateView, VehicleTypeListView, VehicleDetailView
+from .vehicle_views import VehicleCreateView, VehicleDeleteView, VehicleListView, VehicleUpdateView, VehicleTypeListView, VehicleDetailView, VehicleSearchView, CheckInLookupView
 
 
 # all routes are here 
@@ -20,6 +20,8 @@ urlpatterns = [
     # API for vehicle routes
     path("vehicles/", VehicleListView.as_view(), name="vehicle_list"),                
     path("vehicles/create/", VehicleCreateView.as_view(), name="vehicle_create"),     
+    path("vehicles/search/", VehicleSearchView.as_view(), name="vehicle_search"),
+    path("vehicles/lookup/", CheckInLookupView.as_view(), name="vehicle_checkin_lookup"),
     path("vehicles/<int:pk>/", VehicleDetailView.as_view(), name="vehicle_detail"),
     path("vehicles/<int:pk>/update/", VehicleUpdateView.as_view(), name="vehicle_update"), 
     path("vehicles/<int:pk>/delete/", VehicleDeleteView.as_view(), name="vehicle_delete"),
@@ -0,0 +1,52 @@
+import re
+
+# Compiled once at import; shared by VehicleSerializer and the bulk importer
+VEHICLE_NUMBER_RE = re.compile(r"^[A-Z0-9]+$")
+DIGIT_GROUP_RE = re.compile(r"\d+")
+NON_ALNUM_RE = re.compile(r"[^A-Z0-9]")
+NON_DIGIT_RE = re.compile(r"\D")
+
+VEHICLE_NUMBER_CHARSET_ERROR = "Vehicle number must be uppercase alphanumeric (A-Z, 0-9) only."
+VEHICLE_NUMBER_DIGITS_ERROR = (
+    "Vehicle number must contain at least one group of 1 to 4 digits (e.g., MH05DU6253, MH5DU6, etc.)."
+)
+
+
+def normalize_vehicle_number(value):
+    """Vehicle numbers are stored uppercase."""
+    return value.strip().upper()
+
+
+def compact_vehicle_number(value):
+    """
+    A typed plate ("mh-05 du 6253") in stored form: uppercase with the
+    separators dropped. Stored numbers are plain A-Z0-9 (see
+    vehicle_number_error), so this maps user input onto them for lookups.
+    """
+    return NON_ALNUM_RE.sub("", normalize_vehicle_number(value))
+
+
+def mobile_candidates(value):
+    """
+    Stored forms a typed mobile may have: its digits, plus the bare
+    10-digit number when it carries a +91 / 0 prefix.
+    """
+    digits = NON_DIGIT_RE.sub("", value)
+    candidates = [digits] if digits else []
+    if len(digits) == 12 and digits.startswith("91"):
+        candidates.append(digits[2:])
+    elif len(digits) == 11 and digits.startswith("0"):
+        candidates.append(digits[1:])
+    return candidates
+
+
+def vehicle_number_error(value):
+    """
+    Check a normalized vehicle number against the format rules.
+    Returns the error message, or None if the number is valid.
+    """
+    if not VEHICLE_NUMBER_RE.match(value):
+        return VEHICLE_NUMBER_CHARSET_ERROR
+    if not any(1 <= len(group) <= 4 for group in DIGIT_GROUP_RE.findall(value)):
+        return VEHICLE_NUMBER_DIGITS_ERROR
+    return None
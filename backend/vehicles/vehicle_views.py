@@ -4,21 +4,30 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from .models import Vehicle, VehicleType
-from .serializers import VehicleSerializer, VehicleTypeSerializer
-from garages.models import GarageUser, Garage
-
-
-def get_user_garage(user):
-    """Helper to get user's active garage from GarageUser"""
-    membership = GarageUser.objects.filter(user=user, is_active=True).first()
-    return membership.garage if membership else None
-
-
-class VehicleTypeListView(generics.ListAPIView):
+from .serializers import VEHICLE_LIST_PROJECTION, VehicleSerializer, VehicleTypeSerializer
+from garages.models import Garage
+from garages.resolver import get_request_garage
+from config.conditional import ConditionalGetMixin
+from config.reference_cache import reference_cache
+from config.pagination import InvalidCursor, KeysetPagination
+from garages.versions import VEHICLE_TYPES, get_versions
+from django.conf import settings
+from rest_framework.views import APIView
+from .lookup import checkin_lookup
+from .search import search_garage
+
+
+class VehicleTypeListView(ConditionalGetMixin, generics.ListAPIView):
     queryset = VehicleType.objects.all()
     serializer_class = VehicleTypeSerializer
     permission_classes = [AdminAccess]
 
+    def get_etag_versions(self, request):
+        return get_versions(VEHICLE_TYPES)
+
+    def get_queryset(self):
+        return list(reference_cache.vehicle_types().values())
+
 
 class VehicleCreateView(generics.CreateAPIView):
     queryset = Vehicle.objects.all()
@@ -28,7 +37,7 @@ class VehicleCreateView(generics.CreateAPIView):
     def create(self, request, *args, **kwargs):
         try:
             user = request.user
-            garage = get_user_garage(user)
+            garage = get_request_garage(request)
 
             # Non-super admin must have a garage
             if not user.is_super_admin() and not garage:
@@ -93,18 +102,120 @@ class VehicleCreateView(generics.CreateAPIView):
 class VehicleListView(generics.ListAPIView):
     serializer_class = VehicleSerializer
     permission_classes = [AdminAccess]
+    pagination_class = KeysetPagination
+    ordering = ("-id",)
 
     def get_queryset(self):
         user = self.request.user
 
         if user.is_super_admin():
-            return Vehicle.objects.all().order_by("-id")
+            queryset = Vehicle.objects.all()
+        else:
+            garage = get_request_garage(self.request)
+            queryset = Vehicle.objects.filter(garage=garage) if garage else Vehicle.objects.none()
+        return VEHICLE_LIST_PROJECTION.project(queryset.order_by("-id"))
 
-        garage = get_user_garage(user)
-        if garage:
-            return Vehicle.objects.filter(garage=garage).order_by("-id")
+    def list(self, request, *args, **kwargs):
+        try:
+            page = self.paginate_queryset(self.get_queryset())
+        except InvalidCursor:
+            return Response({"success": False, "error": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
+        return self.get_paginated_response(VEHICLE_LIST_PROJECTION.serialize(page))
+
+
+class VehicleSearchView(APIView):
+    """
+    Garage-scoped fuzzy search: ?q= matches vehicle numbers, customer names
+    and mobiles, tolerating partial and misspelled input. Returns ranked
+    "vehicles" and "customers" (at most ?limit= each). Super admins pass
+    garage_id.
+    """
+    permission_classes = [AdminAccess]
 
-        return Vehicle.objects.none()
+    def get(self, request, *args, **kwargs):
+        user = request.user
+        if user.is_super_admin():
+            garage = Garage.objects.filter(pk=request.query_params.get("garage_id") or None).first()
+            if not garage:
+                return Response(
+                    {"success": False, "error": "Garage is required"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        else:
+            garage = get_request_garage(request)
+            if not garage:
+                return Response(
+                    {"success": False, "error": "Only garage members can search"},
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+
+        query = request.query_params.get("q", "").strip()
+        if len(query) < settings.SEARCH_MIN_QUERY_LENGTH:
+            return Response(
+                {"success": False, "error": f"Search needs at least {settings.SEARCH_MIN_QUERY_LENGTH} characters"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = int(request.query_params.get("limit", settings.SEARCH_RESULT_LIMIT))
+        except ValueError:
+            limit = settings.SEARCH_RESULT_LIMIT
+        limit = max(1, min(limit, settings.SEARCH_MAX_RESULT_LIMIT))
+
+        try:
+            results = search_garage(garage.id, query, limit)
+        except Exception as exc:
+            return Response(
+                {"success": False, "error": "Search failed", "details": str(exc)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+        return Response({"success": True, "data": results}, status=status.HTTP_200_OK)
+
+
+class CheckInLookupView(APIView):
+    """
+    Walk-in check: does this vehicle (?plate=) or customer (?mobile=)
+    already exist in the garage? Input is normalized like stored values
+    (uppercase plate without separators, mobile digits). Returns the vehicle,
+    its owner and its latest service. Super admins pass garage_id.
+    """
+    permission_classes = [AdminAccess]
+
+    def get(self, request, *args, **kwargs):
+        user = request.user
+        if user.is_super_admin():
+            garage = Garage.objects.filter(pk=request.query_params.get("garage_id") or None).first()
+            if not garage:
+                return Response(
+                    {"success": False, "error": "Garage is required"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        else:
+            garage = get_request_garage(request)
+            if not garage:
+                return Response(
+                    {"success": False, "error": "Only garage members can look up vehicles"},
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+
+        plate = request.query_params.get("plate", "").strip()
+        mobile = request.query_params.get("mobile", "").strip()
+        if not plate and not mobile:
+            return Response(
+                {"success": False, "error": "Pass a plate or a mobile number"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            query, matches = checkin_lookup(garage.id, plate=plate, mobile=mobile)
+        except Exception as exc:
+            return Response(
+                {"success": False, "error": "Lookup failed", "details": str(exc)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+        return Response(
+            {"success": True, "data": {"query": query, "found": bool(matches), "matches": matches}},
+            status=status.HTTP_200_OK,
+        )
 
 
 class VehicleDetailView(generics.RetrieveAPIView):
@@ -115,7 +226,7 @@ class VehicleDetailView(generics.RetrieveAPIView):
         user = self.request.user
         if user.is_super_admin():
             return Vehicle.objects.all()
-        garage = get_user_garage(user)
+        garage = get_request_garage(self.request)
         if garage:
             return Vehicle.objects.filter(garage=garage)
         return Vehicle.objects.none()
@@ -124,8 +235,9 @@ class VehicleDetailView(generics.RetrieveAPIView):
         try:
             instance = self.get_object()
             data = self.get_serializer(instance).data
-            if instance.vehicle_type:
-                data["vehicle_type"] = VehicleTypeSerializer(instance.vehicle_type).data
+            vehicle_type = reference_cache.vehicle_type(instance.vehicle_type_id)
+            if vehicle_type:
+                data["vehicle_type"] = VehicleTypeSerializer(vehicle_type).data
             return Response({"success": True, "data": data}, status=status.HTTP_200_OK)
         except Exception as exc:
             return Response(
@@ -142,7 +254,7 @@ class VehicleUpdateView(generics.RetrieveUpdateAPIView):
         user = self.request.user
         if user.is_super_admin():
             return Vehicle.objects.all()
-        garage = get_user_garage(user)
+        garage = get_request_garage(self.request)
         if garage:
             return Vehicle.objects.filter(garage=garage)
         return Vehicle.objects.none()
@@ -151,8 +263,9 @@ class VehicleUpdateView(generics.RetrieveUpdateAPIView):
         try:
             instance = self.get_object()
             data = self.get_serializer(instance).data
-            if instance.vehicle_type:
-                data["vehicle_type"] = VehicleTypeSerializer(instance.vehicle_type).data
+            vehicle_type = reference_cache.vehicle_type(instance.vehicle_type_id)
+            if vehicle_type:
+                data["vehicle_type"] = VehicleTypeSerializer(vehicle_type).data
             return Response({"success": True, "data": data}, status=status.HTTP_200_OK)
         except Exception as exc:
             return Response(